@@ -0,0 +1,35 @@
+"""
+Celery tasks for Studio.
+"""
+import logging
+
+from celery import task
+
+from opaque_keys.edx.keys import UsageKey
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.video_module.transcripts_utils import (
+    generate_speed_variants,
+    TranscriptException,
+    TranscriptsGenerationException,
+)
+
+log = logging.getLogger(__name__)
+
+
+@task()  # pylint: disable=not-callable
+def generate_transcript_speed_variants(usage_key_string):
+    """
+    Generate the sjson of every translation of the video for each of its speeds, so that learners'
+    requests don't have to convert them.
+    """
+    usage_key = UsageKey.from_string(usage_key_string)
+    store = modulestore()
+    with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, usage_key.course_key):
+        video = store.get_item(usage_key)
+        for lang in video.transcripts:
+            try:
+                generate_speed_variants(video, lang)
+            except (TranscriptException, TranscriptsGenerationException, UnicodeDecodeError) as ex:
+                # the learners' requests fall back to converting the srt
+                log.warning(u"Can't generate the %s transcripts of %s: %s", lang, usage_key_string, ex.message)
@@ -88,7 +88,8 @@ class TestCourseListing(ModuleStoreTestCase):
 
     def test_errored_course_global_staff(self):
         """
-        Test the course list for global staff when get_course returns an ErrorDescriptor
+        Test the course list for global staff when get_course returns an ErrorDescriptor: the listing
+        only reads course summaries; so, it still lists the course
         """
         GlobalStaff().add_users(self.user)
 
@@ -100,15 +101,16 @@ class TestCourseListing(ModuleStoreTestCase):
 
             # get courses through iterating all courses
             courses_list, __ = _accessible_courses_list(self.request)
-            self.assertEqual(courses_list, [])
+            self.assertEqual([course.id for course in courses_list], [course_key])
 
             # get courses by reversing group name formats
             courses_list_by_groups, __ = _accessible_courses_list_from_groups(self.request)
-            self.assertEqual(courses_list_by_groups, [])
+            self.assertEqual([course.id for course in courses_list_by_groups], [course_key])
 
     def test_errored_course_regular_access(self):
         """
-        Test the course list for regular staff when get_course returns an ErrorDescriptor
+        Test the course list for regular staff when get_course returns an ErrorDescriptor: the listing
+        only reads course summaries; so, it still lists the course
         """
         GlobalStaff().remove_users(self.user)
         CourseStaffRole(SlashSeparatedCourseKey('Non', 'Existent', 'Course')).add_users(self.user)
@@ -121,13 +123,27 @@ class TestCourseListing(ModuleStoreTestCase):
 
             # get courses through iterating all courses
             courses_list, __ = _accessible_courses_list(self.request)
-            self.assertEqual(courses_list, [])
+            self.assertEqual([course.id for course in courses_list], [course_key])
 
             # get courses by reversing group name formats
             courses_list_by_groups, __ = _accessible_courses_list_from_groups(self.request)
-            self.assertEqual(courses_list_by_groups, [])
             self.assertEqual(courses_list, courses_list_by_groups)
 
+    def test_course_listing_does_not_load_courses(self):
+        """
+        Test that listing the courses only reads summaries and never instantiates a course descriptor
+        """
+        GlobalStaff().add_users(self.user)
+        course_key = SlashSeparatedCourseKey('Org1', 'Course1', 'Run1')
+        self._create_course_with_access_groups(course_key, self.user)
+
+        with patch('xmodule.modulestore.mongo.base.CachingDescriptorSystem', Mock(side_effect=Exception)):
+            courses_list, __ = _accessible_courses_list(self.request)
+            courses_list_by_groups, __ = _accessible_courses_list_from_groups(self.request)
+
+        self.assertEqual([course.id for course in courses_list], [course_key])
+        self.assertEqual(courses_list, courses_list_by_groups)
+
     def test_get_course_list_with_invalid_course_location(self):
         """
         Test getting courses with invalid course location (course deleted from modulestore).
@@ -283,8 +299,9 @@ class TestCourseListing(ModuleStoreTestCase):
             }},
         )
 
+        # the errored course is still listed as listing only reads the course summaries
         courses_list, __ = _accessible_courses_list_from_groups(self.request)
-        self.assertEqual(len(courses_list), 1, courses_list)
+        self.assertEqual(len(courses_list), 2, courses_list)
 
     @ddt.data(OrgStaffRole('AwesomeOrg'), OrgInstructorRole('AwesomeOrg'))
     def test_course_listing_org_permissions(self, role):
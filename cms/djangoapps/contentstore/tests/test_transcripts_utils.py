@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 """ Tests for transcripts_utils. """
+import codecs
+import random
 import unittest
 from uuid import uuid4
 import copy
+import json
 import textwrap
 from mock import patch, Mock
+from pysrt import SubRipFile
 
 from pymongo import MongoClient
 
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test.utils import override_settings
 from django.conf import settings
 from django.utils import translation
@@ -75,6 +80,64 @@ class TestGenerateSubs(unittest.TestCase):
         )
 
 
+class TestTranscriptCues(unittest.TestCase):
+    """Tests for the streaming `TranscriptCues` parser and its speed variants."""
+    srt = (
+        u"1\r\n00:00:10,500 --> 00:00:13,000\r\nElephant's Dream\r\n\r\n"
+        u"2\n00:00:15,000 --> 00:00:18,000 X1:40 X2:600\nAt the left\nwe can see...\n\n"
+        u"not a cue\n\n"
+        u"3\r01:02:03.004 --> 01:02:05,999\r\u0423\u0440\u0430!\r"
+    )
+
+    def test_parse(self):
+        cues = transcripts_utils.TranscriptCues.from_srt(self.srt)
+        srt_subs = SubRipFile.from_string(self.srt)
+        self.assertEqual(len(cues), 3)
+        self.assertEqual(list(cues.start), [sub.start.ordinal for sub in srt_subs])
+        self.assertEqual(list(cues.end), [sub.end.ordinal for sub in srt_subs])
+        self.assertEqual(cues.text, [sub.text.replace('\n', ' ') for sub in srt_subs])
+        self.assertEqual(cues.text[1], u'At the left we can see...')
+
+    def test_parse_lines(self):
+        cues = transcripts_utils.TranscriptCues.from_srt(iter(self.srt.splitlines(True)))
+        self.assertEqual(cues.to_sjson_subs(), transcripts_utils.TranscriptCues.from_srt(self.srt).to_sjson_subs())
+
+    def test_parse_upload(self):
+        # read in chunks of every size, so that the line breaks (and the UTF-8 sequences) are split across chunks
+        crlf_srt = (
+            u"1\r\n00:00:10,500 --> 00:00:13,000\r\nElephant's Dream\r\nin two lines\r\n\r\n"
+            u"2\r\n00:00:15,000 --> 00:00:18,000\r\n\u0423\u0440\u0430!\r\n"
+        )
+        for srt in (crlf_srt, crlf_srt.replace(u'\r\n', u'\r')):
+            expected = [
+                (sub.start.ordinal, sub.end.ordinal, sub.text.replace('\n', ' ')) for sub in SubRipFile.from_string(srt)
+            ]
+            self.assertEqual(expected[0][2], u"Elephant's Dream in two lines")
+            self.assertEqual(len(expected), 2)
+            data = srt.encode('utf8')
+            for chunk_size in xrange(1, len(data) + 1):
+                upload = SimpleUploadedFile('subs.srt', data)
+                cues = transcripts_utils.TranscriptCues.from_srt(codecs.iterdecode(upload.chunks(chunk_size), 'utf8'))
+                self.assertEqual(zip(cues.start, cues.end, cues.text), expected, 'chunk size {}'.format(chunk_size))
+
+    def test_speed_variants(self):
+        rand = random.Random(0)
+        # include timestamps whose scaled values are halves
+        start = [0, 1, 3, 5, 7, 25] + [rand.randint(0, 10 ** 7) for __ in xrange(1000)]
+        subs = {'start': start, 'end': [timestamp + 1 for timestamp in start], 'text': [u'text'] * len(start)}
+        cues = transcripts_utils.TranscriptCues(
+            transcripts_utils.array('l', subs['start']), transcripts_utils.array('l', subs['end']), subs['text']
+        )
+        for speed in (0.5, 0.75, 1.0, 1.25, 1.5, 2.0):
+            expected = {
+                'start': [int(round(timestamp * speed)) for timestamp in subs['start']],
+                'end': [int(round(timestamp * speed)) for timestamp in subs['end']],
+                'text': subs['text'],
+            }
+            self.assertEqual(cues.at_speed(speed).to_sjson_subs(), expected)
+            self.assertEqual(transcripts_utils.generate_subs(speed, 1, subs), expected)
+
+
 @override_settings(CONTENTSTORE=TEST_DATA_CONTENTSTORE)
 class TestSaveSubsToStore(ModuleStoreTestCase):
     """Tests for `save_subs_to_store` function."""
@@ -534,6 +597,57 @@ class TestTranscript(unittest.TestCase):
             transcripts_utils.Transcript.convert(self.srt_transcript, 'srt', 'sjson')
 
 
+@override_settings(CONTENTSTORE=TEST_DATA_CONTENTSTORE)
+class TestGetConvertedTranscript(ModuleStoreTestCase):
+    """
+    Tests for `get_converted_transcript` function.
+    """
+    def setUp(self):
+        self.course = CourseFactory.create(org='MITx', number='999', display_name='Test course')
+        self.filename = u'{}.srt'.format(uuid4().hex)
+        self.save_srt(textwrap.dedent("""\
+            0
+            00:00:10,500 --> 00:00:13,000
+            Elephant&#39;s Dream
+            """))
+
+    def save_srt(self, srt):
+        """
+        Upload the srt transcript
+        """
+        transcripts_utils.save_to_store(srt, self.filename, 'application/x-subrip', self.course.location)
+
+    def test_srt_to_sjson_speeds(self):
+        sjson = transcripts_utils.get_converted_transcript(self.course.location, self.filename, 'srt', 'sjson')
+        self.assertEqual(
+            json.loads(sjson), {'start': [10500], 'end': [13000], 'text': [u"Elephant&#39;s Dream"]}
+        )
+        sjson = transcripts_utils.get_converted_transcript(self.course.location, self.filename, 'srt', 'sjson', 1.5)
+        self.assertEqual(json.loads(sjson)['start'], [15750])
+
+    def test_cached_until_content_changes(self):
+        convert = 'xmodule.video_module.transcripts_utils.Transcript.convert'
+        with patch(convert, wraps=transcripts_utils.Transcript.convert) as mock_convert:
+            first = transcripts_utils.get_converted_transcript(self.course.location, self.filename, 'srt', 'txt')
+            second = transcripts_utils.get_converted_transcript(self.course.location, self.filename, 'srt', 'txt')
+            self.assertEqual(first, u"Elephant's Dream")
+            self.assertEqual(second, first)
+            self.assertEqual(mock_convert.call_count, 1)
+
+            self.save_srt(textwrap.dedent("""\
+                0
+                00:00:10,500 --> 00:00:13,000
+                At the left we can see...
+                """))
+            third = transcripts_utils.get_converted_transcript(self.course.location, self.filename, 'srt', 'txt')
+            self.assertEqual(third, u"At the left we can see...")
+            self.assertEqual(mock_convert.call_count, 2)
+
+    def test_not_found(self):
+        with self.assertRaises(NotFoundError):
+            transcripts_utils.get_converted_transcript(self.course.location, u'missing.srt', 'srt', 'txt')
+
+
 class TestSubsFilename(unittest.TestCase):
     """
     Tests for subs_filename funtion.
@@ -18,7 +18,6 @@ from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpRespon
 from util.json_request import JsonResponse
 from edxmako.shortcuts import render_to_response
 
-from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.content import StaticContent
 from xmodule.tabs import PDFTextbookTabs
@@ -170,15 +169,12 @@ def _xmodule_json(xmodule, course_id):
 
 def _accessible_courses_list(request):
     """
-    List all courses available to the logged in user by iterating through all the courses
+    List the summaries of all courses available to the logged in user by iterating through all the courses
     """
     def course_filter(course):
         """
         Filter out unusable and inaccessible courses
         """
-        if isinstance(course, ErrorDescriptor):
-            return False
-
         # pylint: disable=fixme
         # TODO remove this condition when templates purged from db
         if course.location.course == 'templates':
@@ -186,7 +182,7 @@ def _accessible_courses_list(request):
 
         return has_course_access(request.user, course.id)
 
-    courses = filter(course_filter, modulestore().get_courses())
+    courses = filter(course_filter, modulestore().get_course_summaries())
     unsucceeded_course_actions = [
         course for course in
         CourseRerunState.objects.find_all(
@@ -199,7 +195,7 @@ def _accessible_courses_list(request):
 
 def _accessible_courses_list_from_groups(request):
     """
-    List all courses available to the logged in user by reversing access group names
+    List the summaries of all courses available to the logged in user by reversing access group names
     """
     courses_list = {}
     unsucceeded_course_actions = []
@@ -223,13 +219,9 @@ def _accessible_courses_list_from_groups(request):
                 )
             )
             # check for the course itself
-            try:
-                course = modulestore().get_course(course_key)
-            except ItemNotFoundError:
-                # If a user has access to a course that doesn't exist, don't do anything with that course
-                pass
-            if course is not None and not isinstance(course, ErrorDescriptor):
-                # ignore deleted or errored courses
+            course = modulestore().get_course_summary(course_key)
+            if course is not None:
+                # ignore deleted courses
                 courses_list[course_key] = course
 
     return courses_list.values(), unsucceeded_course_actions
@@ -272,7 +264,7 @@ def course_listing(request):
     courses = [
         format_course_for_view(c)
         for c in courses
-        if not isinstance(c, ErrorDescriptor) and (c.id not in unsucceeded_action_course_keys)
+        if c.id not in unsucceeded_action_course_keys
     ]
 
     return render_to_response('index.html', {
@@ -8,7 +8,6 @@ import re
 import shutil
 import tarfile
 from path import path
-from tempfile import mkdtemp
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
@@ -26,7 +25,7 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.xml_importer import import_from_xml
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_tarball
 
 from .access import has_course_access
 
@@ -317,14 +316,12 @@ def export_handler(request, course_key_string):
     if 'application/x-tgz' in requested_format:
         name = course_module.url_name
         export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-        root_dir = path(mkdtemp())
 
         try:
-            export_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
             logging.debug(u'tar file being generated at {0}'.format(export_file.name))
-            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-                tar_file.add(root_dir / name, arcname=name)
+            export_to_tarball(modulestore(), contentstore(), course_module.id, name, export_file)
+            export_file.flush()
+            export_file.seek(0)
         except SerializationError as exc:
             log.exception(u'There was an error exporting course %s', course_module.id)
             unit = None
@@ -362,8 +359,6 @@ def export_handler(request, course_key_string):
                 'course_home_url': reverse_course_url("course_handler", course_key),
                 'export_url': export_url
             })
-        finally:
-            shutil.rmtree(root_dir / name)
 
         wrapper = FileWrapper(export_file)
         response = HttpResponse(wrapper, content_type='application/x-tgz')
@@ -32,6 +32,7 @@ from util.json_request import expect_json, JsonResponse
 
 from .access import has_course_access
 from .helpers import xblock_has_own_studio_page
+from contentstore.tasks import generate_transcript_speed_variants
 from contentstore.utils import compute_publish_state
 from contentstore.views.preview import get_preview_fragment
 from edxmako.shortcuts import render_to_string
@@ -351,6 +352,11 @@ def _save_item(user, usage_key, data=None, children=None, metadata=None, nullout
     # commit to datastore
     store.update_item(existing_item, user.id)
 
+    # videos check their transcripts when they're saved (see VideoDescriptor.editor_saved), but the speed
+    # variants of the transcripts are generated in the background
+    if usage_key.category == 'video' and existing_item.transcripts and own_metadata(existing_item) != old_metadata:
+        generate_transcript_speed_variants.delay(unicode(usage_key))
+
     # for static tabs, their containing course also records their display name
     if usage_key.category == 'static_tab':
         course = store.get_course(usage_key.course_key)
@@ -5,6 +5,7 @@ Actions manager for transcripts ajax calls.
 Module do not support rollback (pressing "Cancel" button in Studio)
 All user changes are saved immediately.
 """
+import codecs
 import copy
 import os
 import logging
@@ -100,7 +101,8 @@ def upload_transcripts(request):
     except ValueError:
         return error_response(response, 'Invalid video_list JSON.')
 
-    source_subs_filedata = request.FILES['transcript-file'].read().decode('utf8')
+    # decoded and parsed as it is read, a chunk at a time
+    source_subs_filedata = codecs.iterdecode(request.FILES['transcript-file'].chunks(), 'utf8')
     source_subs_filename = request.FILES['transcript-file'].name
 
     if '.' not in source_subs_filename:
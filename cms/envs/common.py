@@ -42,6 +42,9 @@ from dealer.git import git
 ############################ FEATURE CONFIGURATION #############################
 
 FEATURES = {
+    # Compile all the mako templates at startup, rather than on their first render
+    'PRECOMPILE_MAKO_TEMPLATES': False,
+
     'USE_DJANGO_PIPELINE': True,
 
     'GITHUB_PUSH': False,
@@ -106,6 +109,10 @@ FEATURES = {
 
     # Toggles Group Configuration editing functionality
     'ENABLE_GROUP_CONFIGURATIONS': os.environ.get('FEATURE_GROUP_CONFIGURATIONS'),
+
+    # Record the modulestore and contentstore queries of each request (see monitoring.middleware), at
+    # some cost to every query
+    'RECORD_MODULESTORE_QUERIES': False,
 }
 ENABLE_JASMINE = False
 
@@ -132,6 +139,9 @@ GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoIP.dat"
 # This is where we stick our compiled template files.
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_cms')
+# Whether mako checks the template files for changes on each lookup (off in production, where
+# the templates only change with a deploy)
+MAKO_FILESYSTEM_CHECKS = True
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [
     PROJECT_ROOT / 'templates',
@@ -203,8 +213,13 @@ TEMPLATE_LOADERS = (
     'django.template.loaders.app_directories.Loader',
 )
 
+# When recording them (FEATURES['RECORD_MODULESTORE_QUERIES']), requests whose modulestore and contentstore queries
+# take longer than this many seconds log the queries they made (None to disable)
+MODULESTORE_SLOW_REQUEST_SECONDS = 1.0
+
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    'monitoring.middleware.ModulestoreQueryMiddleware',
     'django.middleware.cache.UpdateCacheMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -11,6 +11,8 @@ MEDIA_ROOT = "/edx/var/edxapp/uploads"
 DEBUG = True
 USE_I18N = True
 TEMPLATE_DEBUG = DEBUG
+# Pick up template edits without restarting
+MAKO_FILESYSTEM_CHECKS = True
 
 ################################ LOGGERS ######################################
 
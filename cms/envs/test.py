@@ -129,6 +129,18 @@ CACHES = {
         'VERSION': 4,
         'KEY_FUNCTION': 'util.memcache.safe_key',
     },
+    'enrollments': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        'KEY_PREFIX': 'enrollments',
+        'VERSION': 4,
+        'KEY_FUNCTION': 'util.memcache.safe_key',
+    },
+    'cohorts': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        'KEY_PREFIX': 'cohorts',
+        'VERSION': 4,
+        'KEY_FUNCTION': 'util.memcache.safe_key',
+    },
 
     'mongo_metadata_inheritance': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -7,6 +7,7 @@ from django.conf import settings
 settings.INSTALLED_APPS  # pylint: disable=W0104
 
 from django_startup import autostartup
+import edxmako
 
 
 def run():
@@ -17,6 +18,9 @@ def run():
 
     add_mimetypes()
 
+    if settings.FEATURES.get('PRECOMPILE_MAKO_TEMPLATES', False):
+        edxmako.paths.precompile_templates()
+
 
 def add_mimetypes():
     """
@@ -3,16 +3,31 @@ This file contains the logic for cohort groups, as exposed internally to the
 forums, and to the cohort admin views.
 """
 
+from collections import namedtuple
 from django.http import Http404
 import logging
 import random
 
 from courseware import courses
+from request_cache.middleware import RequestCache
 from student.models import get_user_by_username_or_email
-from .models import CourseUserGroup
+from util.cache import is_deleted_until_committed
+from .models import (
+    CourseUserGroup, USER_COHORTS_REQUEST_CACHE_NAME, USER_COHORT_CACHE_TIMEOUT, cohorts_cache, user_cohort_cache_key
+)
 
 log = logging.getLogger(__name__)
 
+# the request cache holding the CohortConfig of each course looked up during the request
+COHORT_CONFIG_REQUEST_CACHE_NAME = 'course_groups.cohort_configs'
+# the request cache holding the cohorts looked up by id during the request, by (course key, cohort id)
+COHORTS_BY_ID_REQUEST_CACHE_NAME = 'course_groups.cohorts_by_id'
+
+# the cohort settings of a course
+CohortConfig = namedtuple('CohortConfig', [
+    'is_cohorted', 'auto_cohort', 'auto_cohort_groups', 'top_level_discussion_topic_ids', 'cohorted_discussions'
+])
+
 
 # tl;dr: global state is bad.  capa reseeds random every time a problem is loaded.  Even
 # if and when that's fixed, it's a good idea to have a local generator to avoid any other
@@ -33,6 +48,31 @@ def local_random():
     return _local_random
 
 
+def get_cohort_config(course_key):
+    """
+    Return the CohortConfig of the course, loading the course only the first
+    time it's needed in a request.
+
+    Raises:
+       Http404 if the course doesn't exist.
+    """
+    request_configs = RequestCache.get_cache(COHORT_CONFIG_REQUEST_CACHE_NAME)
+    if RequestCache.is_request_active() and course_key in request_configs:
+        return request_configs[course_key]
+
+    course = courses.get_course_by_id(course_key)
+    config = CohortConfig(
+        is_cohorted=course.is_cohorted,
+        auto_cohort=course.auto_cohort,
+        auto_cohort_groups=course.auto_cohort_groups,
+        top_level_discussion_topic_ids=course.top_level_discussion_topic_ids,
+        cohorted_discussions=course.cohorted_discussions,
+    )
+    if RequestCache.is_request_active():
+        request_configs[course_key] = config
+    return config
+
+
 def is_course_cohorted(course_key):
     """
     Given a course key, return a boolean for whether or not the course is
@@ -41,7 +81,7 @@ def is_course_cohorted(course_key):
     Raises:
        Http404 if the course doesn't exist.
     """
-    return courses.get_course_by_id(course_key).is_cohorted
+    return get_cohort_config(course_key).is_cohorted
 
 
 def get_cohort_id(user, course_key):
@@ -65,15 +105,15 @@ def is_commentable_cohorted(course_key, commentable_id):
     Raises:
         Http404 if the course doesn't exist.
     """
-    course = courses.get_course_by_id(course_key)
+    config = get_cohort_config(course_key)
 
-    if not course.is_cohorted:
+    if not config.is_cohorted:
         # this is the easy case :)
         ans = False
-    elif commentable_id in course.top_level_discussion_topic_ids:
+    elif commentable_id in config.top_level_discussion_topic_ids:
         # top level discussions have to be manually configured as cohorted
         # (default is not)
-        ans = commentable_id in course.cohorted_discussions
+        ans = commentable_id in config.cohorted_discussions
     else:
         # inline discussions are cohorted by default
         ans = True
@@ -89,13 +129,13 @@ def get_cohorted_commentables(course_key):
     Given a course_key return a list of strings representing cohorted commentables
     """
 
-    course = courses.get_course_by_id(course_key)
+    config = get_cohort_config(course_key)
 
-    if not course.is_cohorted:
+    if not config.is_cohorted:
         # this is the easy case :)
         ans = []
     else:
-        ans = course.cohorted_discussions
+        ans = config.cohorted_discussions
 
     return ans
 
@@ -119,25 +159,22 @@ def get_cohort(user, course_key):
     # First check whether the course is cohorted (users shouldn't be in a cohort
     # in non-cohorted courses, but settings can change after course starts)
     try:
-        course = courses.get_course_by_id(course_key)
+        config = get_cohort_config(course_key)
     except Http404:
         raise ValueError("Invalid course_key")
 
-    if not course.is_cohorted:
+    if not config.is_cohorted:
         return None
 
-    try:
-        return CourseUserGroup.objects.get(course_id=course_key,
-                                            group_type=CourseUserGroup.COHORT,
-                                            users__id=user.id)
-    except CourseUserGroup.DoesNotExist:
-        # Didn't find the group.  We'll go on to create one if needed.
-        pass
-
-    if not course.auto_cohort:
+    cohort = _get_assigned_cohort(user, course_key)
+    if cohort is not None:
+        return cohort
+    # Didn't find the group.  We'll go on to create one if needed.
+
+    if not config.auto_cohort:
         return None
 
-    choices = course.auto_cohort_groups
+    choices = config.auto_cohort_groups
     n = len(choices)
     if n == 0:
         # Nowhere to put user
@@ -159,6 +196,76 @@ def get_cohort(user, course_key):
     return group
 
 
+def _get_assigned_cohort(user, course_key):
+    """
+    Return the cohort the user was assigned to in the course, or None. Cached
+    for the request and in the cohorts cache (the models forget the users'
+    cached cohorts as they change, and this thread doesn't use the cohorts
+    cache for the users whose changes it hasn't committed yet).
+    """
+    request_cohorts = RequestCache.get_cache(USER_COHORTS_REQUEST_CACHE_NAME)
+    if RequestCache.is_request_active() and (course_key, user.id) in request_cohorts:
+        return request_cohorts[(course_key, user.id)]
+
+    cache = cohorts_cache()
+    cache_key = user_cohort_cache_key(course_key, user.id)
+    uncommitted = is_deleted_until_committed(cache_key)
+    cached = None if uncommitted else cache.get(cache_key)
+    if cached is not None:
+        # the cohort, or None, in a tuple so that users without a cohort are cached too
+        cohort = cached[0]
+    else:
+        try:
+            cohort = CourseUserGroup.objects.get(course_id=course_key,
+                                                 group_type=CourseUserGroup.COHORT,
+                                                 users__id=user.id)
+        except CourseUserGroup.DoesNotExist:
+            cohort = None
+        if not uncommitted:
+            cache.set(cache_key, (cohort,), USER_COHORT_CACHE_TIMEOUT)
+
+    if RequestCache.is_request_active():
+        request_cohorts[(course_key, user.id)] = cohort
+    return cohort
+
+
+def get_cohorts_for_users(users, course_key):
+    """
+    Given a list of django Users and a CourseKey, return the users' cohorts in
+    that course with a single query.
+
+    Unlike get_cohort, doesn't put users without a cohort into auto cohorts.
+
+    Returns:
+        A dict of {user id: CourseUserGroup, or None if the course isn't
+        cohorted or the user has no cohort}
+
+    Raises:
+       ValueError if the CourseKey doesn't exist.
+    """
+    cohorts = dict.fromkeys(user.id for user in users)
+    try:
+        config = get_cohort_config(course_key)
+    except Http404:
+        raise ValueError("Invalid course_key")
+    if not config.is_cohorted or not cohorts:
+        return cohorts
+
+    memberships = CourseUserGroup.users.through.objects.filter(
+        user__in=cohorts.keys(),
+        courseusergroup__course_id=course_key,
+        courseusergroup__group_type=CourseUserGroup.COHORT,
+    ).select_related('courseusergroup')
+    for membership in memberships:
+        cohorts[membership.user_id] = membership.courseusergroup
+
+    if RequestCache.is_request_active():
+        RequestCache.get_cache(USER_COHORTS_REQUEST_CACHE_NAME).update(
+            ((course_key, user_id), cohort) for user_id, cohort in cohorts.iteritems()
+        )
+    return cohorts
+
+
 def get_course_cohorts(course_key):
     """
     Get a list of all the cohorts in the given course.
@@ -194,12 +301,22 @@ def get_cohort_by_id(course_key, cohort_id):
     """
     Return the CourseUserGroup object for the given cohort.  Raises DoesNotExist
     it isn't present.  Uses the course_key for extra validation...
+
+    Forum pages look up the cohort of each of their threads; so, the cohorts
+    are looked up once per request.
     """
-    return CourseUserGroup.objects.get(
+    request_cohorts = RequestCache.get_cache(COHORTS_BY_ID_REQUEST_CACHE_NAME)
+    if RequestCache.is_request_active() and (course_key, cohort_id) in request_cohorts:
+        return request_cohorts[(course_key, cohort_id)]
+
+    cohort = CourseUserGroup.objects.get(
         course_id=course_key,
         group_type=CourseUserGroup.COHORT,
         id=cohort_id
     )
+    if RequestCache.is_request_active():
+        request_cohorts[(course_key, cohort_id)] = cohort
+    return cohort
 
 
 def add_cohort(course_key, name):
@@ -1,7 +1,12 @@
 import logging
 
 from django.contrib.auth.models import User
+from django.core.cache import get_cache, InvalidCacheBackendError
 from django.db import models
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+from request_cache.middleware import RequestCache
+from util.cache import delete_until_committed
 from xmodule_django.models import CourseKeyField
 
 log = logging.getLogger(__name__)
@@ -32,3 +37,64 @@ class CourseUserGroup(models.Model):
     COHORT = 'cohort'
     GROUP_TYPE_CHOICES = ((COHORT, 'Cohort'),)
     group_type = models.CharField(max_length=20, choices=GROUP_TYPE_CHOICES)
+
+
+# the request cache holding the users' cohorts, by (course key, user id)
+USER_COHORTS_REQUEST_CACHE_NAME = 'course_groups.user_cohorts'
+
+USER_COHORT_CACHE_TIMEOUT = 60 * 60
+
+
+def cohorts_cache():
+    """
+    The cache of the users' cohorts
+    """
+    try:
+        return get_cache('cohorts')
+    except InvalidCacheBackendError:
+        return get_cache('default')
+
+
+def user_cohort_cache_key(course_key, user_id):
+    """
+    The cache key of the user's cohort in the course
+    """
+    return u'course_groups.user_cohort.{}.{}'.format(course_key, user_id)
+
+
+def forget_user_cohorts(course_key, user_ids):
+    """
+    Forget the cached cohorts of the users in the course, as their cohorts are changing (and again once the
+    request's transaction is committed, see delete_until_committed)
+    """
+    request_cohorts = RequestCache.get_cache(USER_COHORTS_REQUEST_CACHE_NAME)
+    for user_id in user_ids:
+        request_cohorts.pop((course_key, user_id), None)
+    delete_until_committed(cohorts_cache(), [user_cohort_cache_key(course_key, user_id) for user_id in user_ids])
+
+
+@receiver(m2m_changed, sender=CourseUserGroup.users.through)
+def forget_changed_memberships(sender, instance, action, reverse, pk_set, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the cached cohorts of the users added to or removed from groups
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        # instance is a user, and pk_set its groups
+        groups = instance.course_groups.all() if action == 'pre_clear' else CourseUserGroup.objects.filter(
+            pk__in=pk_set
+        )
+        for group in groups:
+            forget_user_cohorts(group.course_id, [instance.id])
+    else:
+        user_ids = instance.users.values_list('id', flat=True) if action == 'pre_clear' else pk_set
+        forget_user_cohorts(instance.course_id, list(user_ids))
+
+
+@receiver(pre_delete, sender=CourseUserGroup)
+def forget_deleted_group_memberships(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the cached cohorts of the users of a group being deleted
+    """
+    forget_user_cohorts(instance.course_id, list(instance.users.values_list('id', flat=True)))
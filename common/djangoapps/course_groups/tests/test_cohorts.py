@@ -2,14 +2,18 @@ import django.test
 from django.contrib.auth.models import User
 from django.conf import settings
 
+from django.core.cache import get_cache
+from django.core.signals import request_finished
 from django.test.utils import override_settings
+from mock import Mock, patch
 
-from course_groups.models import CourseUserGroup
-from course_groups.cohorts import (get_cohort, get_course_cohorts,
-                                   is_commentable_cohorted, get_cohort_by_name)
+from course_groups.models import CourseUserGroup, user_cohort_cache_key
+from course_groups.cohorts import (get_cohort, get_course_cohorts, get_cohorts_for_users,
+                                   is_commentable_cohorted, get_cohort_by_name, add_user_to_cohort)
 
 from xmodule.modulestore.django import modulestore, clear_existing_modulestores
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
 
 from xmodule.modulestore.tests.django_utils import mixed_store_config
 
@@ -254,3 +258,84 @@ class TestCohorts(django.test.TestCase):
         self.assertTrue(
             is_commentable_cohorted(course.id, to_id("Feedback")),
             "Feedback was listed as cohorted.  Should be.")
+
+    def test_user_cohort_cache(self):
+        cohorts_cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='test_cohorts')
+        course = modulestore().get_course(self.toy_course_key)
+        self.config_course_cohorts(course, [], cohorted=True)
+        user = User.objects.create(username="test", email="a@b.com")
+        cohort = CourseUserGroup.objects.create(name="TestCohort",
+                                                course_id=course.id,
+                                                group_type=CourseUserGroup.COHORT)
+        other_cohort = CourseUserGroup.objects.create(name="TestCohort2",
+                                                      course_id=course.id,
+                                                      group_type=CourseUserGroup.COHORT)
+
+        with patch('course_groups.cohorts.cohorts_cache', return_value=cohorts_cache), \
+                patch('course_groups.models.cohorts_cache', return_value=cohorts_cache):
+            self.assertIsNone(get_cohort(user, course.id))
+            # users without a cohort are cached too
+            with self.assertNumQueries(0):
+                self.assertIsNone(get_cohort(user, course.id))
+
+            # changing the user's cohort drops the cached one
+            add_user_to_cohort(cohort, user.username)
+            self.assertEqual(get_cohort(user, course.id), cohort)
+            with self.assertNumQueries(0):
+                self.assertEqual(get_cohort(user, course.id), cohort)
+            add_user_to_cohort(other_cohort, user.username)
+            self.assertEqual(get_cohort(user, course.id), other_cohort)
+            other_cohort.users.remove(user)
+            self.assertIsNone(get_cohort(user, course.id))
+
+    @patch('util.cache.RequestCache.is_request_active', Mock(return_value=True))
+    def test_user_cohort_cache_uncommitted(self):
+        cohorts_cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='test_uncommitted_cohorts')
+        course = modulestore().get_course(self.toy_course_key)
+        self.config_course_cohorts(course, [], cohorted=True)
+        user = User.objects.create(username="test", email="a@b.com")
+        cohort = CourseUserGroup.objects.create(name="TestCohort",
+                                                course_id=course.id,
+                                                group_type=CourseUserGroup.COHORT)
+        cache_key = user_cohort_cache_key(course.id, user.id)
+        RequestCache().clear_request_cache()
+        self.addCleanup(RequestCache().clear_request_cache)
+
+        with patch('course_groups.cohorts.cohorts_cache', return_value=cohorts_cache), \
+                patch('course_groups.models.cohorts_cache', return_value=cohorts_cache):
+            add_user_to_cohort(cohort, user.username)
+            # meanwhile, another request caches the user's cohort without the uncommitted membership
+            cohorts_cache.set(cache_key, (None,))
+
+            # until the transaction is over, this thread doesn't use the cohorts cache for the user
+            self.assertEqual(get_cohort(user, course.id), cohort)
+            self.assertEqual(cohorts_cache.get(cache_key), (None,))
+
+            # and the stale cached cohort is dropped once the request finished
+            request_finished.send(sender=None)
+            self.assertIsNone(cohorts_cache.get(cache_key))
+            RequestCache().clear_request_cache()
+            self.assertEqual(get_cohort(user, course.id), cohort)
+            self.assertEqual(cohorts_cache.get(cache_key), (cohort,))
+
+    def test_get_cohorts_for_users(self):
+        course = modulestore().get_course(self.toy_course_key)
+        users = [User.objects.create(username="test{}".format(i), email="a{}@b.com".format(i)) for i in range(3)]
+        cohort = CourseUserGroup.objects.create(name="TestCohort",
+                                                course_id=course.id,
+                                                group_type=CourseUserGroup.COHORT)
+        cohort.users.add(users[0], users[2])
+        other_course_cohort = CourseUserGroup.objects.create(name="TestCohort",
+                                                             course_id=SlashSeparatedCourseKey('a', 'b', 'c'),
+                                                             group_type=CourseUserGroup.COHORT)
+        other_course_cohort.users.add(users[1])
+
+        # not cohorted
+        self.assertEqual(get_cohorts_for_users(users, course.id), dict.fromkeys(user.id for user in users))
+
+        self.config_course_cohorts(course, [], cohorted=True)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                get_cohorts_for_users(users, course.id),
+                {users[0].id: cohort, users[1].id: None, users[2].id: cohort}
+            )
@@ -15,12 +15,31 @@
 from django.template import RequestContext
 from util.request import safe_get_host
 requestcontext = None
+# requestcontext collapsed into a single dictionary, the first time a template needs it
+_requestcontext_dict = None
+
+
+def request_context_dict():
+    """
+    Returns the current request's context collapsed into a single dictionary, which the
+    renders of the request copy (rather than collapsing the context each time). Empty if
+    there's no current request context, as in various testing contexts.
+    """
+    global _requestcontext_dict
+    if requestcontext is None:
+        return {}
+    if _requestcontext_dict is None:
+        _requestcontext_dict = {}
+        for d in requestcontext:
+            _requestcontext_dict.update(d)
+    return _requestcontext_dict
 
 
 class MakoMiddleware(object):
 
     def process_request(self, request):
-        global requestcontext
+        global requestcontext, _requestcontext_dict
         requestcontext = RequestContext(request)
         requestcontext['is_secure'] = request.is_secure()
         requestcontext['site'] = safe_get_host(request)
+        _requestcontext_dict = None
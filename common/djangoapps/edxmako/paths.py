@@ -1,14 +1,22 @@
 """
 Set up lookup paths for mako templates.
 """
+import logging
 import os
 import pkg_resources
 
 from django.conf import settings
+from mako.exceptions import MakoException
 from mako.lookup import TemplateLookup
 
 from . import LOOKUP
 
+log = logging.getLogger(__name__)
+
+# The extensions of the files `precompile_templates` compiles (the others, e.g., underscore
+# templates, are served as is)
+TEMPLATE_EXTENSIONS = ('.html', '.js', '.txt', '.xml')
+
 
 class DynamicTemplateLookup(TemplateLookup):
     """
@@ -23,6 +31,24 @@ class DynamicTemplateLookup(TemplateLookup):
             self.directories.insert(0, os.path.normpath(directory))
         else:
             self.directories.append(os.path.normpath(directory))
+        # the new directory may hold overrides of the templates already looked up
+        self._collection.clear()
+        self._uri_cache.clear()
+
+    def template_uris(self):
+        """
+        Yields the uris of all the templates in the lookup's directories
+        """
+        seen = set()
+        for directory in self.directories:
+            for root, __, filenames in os.walk(directory):
+                for filename in filenames:
+                    if not filename.endswith(TEMPLATE_EXTENSIONS):
+                        continue
+                    uri = os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+                    if uri not in seen:
+                        seen.add(uri)
+                        yield uri
 
 
 def clear_lookups(namespace):
@@ -48,6 +74,8 @@ def add_lookup(namespace, directory, package=None, prepend=False):
             input_encoding='utf-8',
             default_filters=['decode.utf8'],
             encoding_errors='replace',
+            # without the checks, templates are only compiled and loaded once per process
+            filesystem_checks=getattr(settings, 'MAKO_FILESYSTEM_CHECKS', True),
         )
     if package:
         directory = pkg_resources.resource_filename(package, directory)
@@ -59,3 +87,24 @@ def lookup_template(namespace, name):
     Look up a Mako template by namespace and name.
     """
     return LOOKUP[namespace].get_template(name)
+
+
+def precompile_templates(namespaces=None):
+    """
+    Compile (into settings.MAKO_MODULE_DIR) and load all the templates of the namespaces (all
+    of them by default), so that requests don't have to. Returns the number of templates
+    compiled.
+
+    Files which aren't mako templates (e.g., js files) are skipped.
+    """
+    compiled = 0
+    for namespace in (namespaces or LOOKUP.keys()):
+        lookup = LOOKUP[namespace]
+        for uri in lookup.template_uris():
+            try:
+                lookup.get_template(uri)
+            except (MakoException, SyntaxError, UnicodeDecodeError) as exc:
+                log.debug(u"Didn't precompile %s:%s: %s", namespace, uri, exc)
+            else:
+                compiled += 1
+    return compiled
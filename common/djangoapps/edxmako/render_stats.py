@@ -0,0 +1,45 @@
+"""
+Counts and times of the mako template renders.
+
+The times are inclusive: a template rendering others (e.g., a courseware page rendering its
+modules' templates) counts their time too.
+"""
+from contextlib import contextmanager
+import time
+
+from dogapi import dog_stats_api
+
+# (render count, total seconds), by template uri, since the process started
+_render_stats = {}
+
+
+@contextmanager
+def timed_render(template_uri):
+    """
+    Records the time of the render of the template done in the block
+    """
+    start = time.time()
+    try:
+        yield
+    finally:
+        duration = time.time() - start
+        count, total = _render_stats.get(template_uri, (0, 0.0))
+        _render_stats[template_uri] = (count + 1, total + duration)
+        dog_stats_api.histogram('edxmako.render.time', duration, tags=[u'template:{}'.format(template_uri)])
+
+
+def render_stats():
+    """
+    Returns the number of renders and their total time (in seconds), by template uri
+    """
+    return {
+        uri: {'count': count, 'time': total}
+        for uri, (count, total) in _render_stats.items()
+    }
+
+
+def reset_render_stats():
+    """
+    Forget the renders recorded so far
+    """
+    _render_stats.clear()
@@ -12,13 +12,13 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from django.template import Context
 from django.http import HttpResponse
 import logging
 
 from microsite_configuration import microsite
 
 from edxmako import lookup_template
+from edxmako.render_stats import timed_render
 import edxmako.middleware
 from django.conf import settings
 from django.core.urlresolvers import reverse
@@ -82,26 +82,19 @@ def render_to_string(template_name, dictionary, context=None, namespace='main'):
     # see if there is an override template defined in the microsite
     template_name = microsite.get_template_path(template_name)
 
-    context_instance = Context(dictionary)
-    # add dictionary to context_instance
-    context_instance.update(dictionary or {})
-    # collapse context_instance to a single dictionary for mako
-    context_dictionary = {}
-    context_instance['settings'] = settings
-    context_instance['EDX_ROOT_URL'] = settings.EDX_ROOT_URL
-    context_instance['marketing_link'] = marketing_link
-
-    # In various testing contexts, there might not be a current request context.
-    if edxmako.middleware.requestcontext is not None:
-        for d in edxmako.middleware.requestcontext:
-            context_dictionary.update(d)
-    for d in context_instance:
-        context_dictionary.update(d)
+    # layer this render's variables over (a copy of) the request's context, which is only
+    # collapsed once per request
+    context_dictionary = dict(edxmako.middleware.request_context_dict())
+    context_dictionary.update(dictionary or {})
+    context_dictionary['settings'] = settings
+    context_dictionary['EDX_ROOT_URL'] = settings.EDX_ROOT_URL
+    context_dictionary['marketing_link'] = marketing_link
     if context:
         context_dictionary.update(context)
     # fetch and render template
     template = lookup_template(namespace, template_name)
-    return template.render_unicode(**context_dictionary)
+    with timed_render(template.uri):
+        return template.render_unicode(**context_dictionary)
 
 
 def render_to_response(template_name, dictionary=None, context_instance=None, namespace='main', **kwargs):
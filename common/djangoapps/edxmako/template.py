@@ -14,6 +14,7 @@
 
 from django.conf import settings
 from mako.template import Template as MakoTemplate
+from edxmako.render_stats import timed_render
 from edxmako.shortcuts import marketing_link
 
 import edxmako
@@ -44,13 +45,8 @@ class Template(MakoTemplate):
         This takes a render call with a context (from Django) and translates
         it to a render call on the mako template.
         """
-        # collapse context_instance to a single dictionary for mako
-        context_dictionary = {}
-
-        # In various testing contexts, there might not be a current request context.
-        if edxmako.middleware.requestcontext is not None:
-            for d in edxmako.middleware.requestcontext:
-                context_dictionary.update(d)
+        # collapse context_instance to a single dictionary for mako, over the request's context
+        context_dictionary = dict(edxmako.middleware.request_context_dict())
         for d in context_instance:
             context_dictionary.update(d)
         context_dictionary['settings'] = settings
@@ -58,4 +54,5 @@ class Template(MakoTemplate):
         context_dictionary['django_context'] = context_instance
         context_dictionary['marketing_link'] = marketing_link
 
-        return super(Template, self).render_unicode(**context_dictionary)
+        with timed_render(self.uri):
+            return super(Template, self).render_unicode(**context_dictionary)
@@ -1,8 +1,16 @@
+import os
+import shutil
+import tempfile
+
 from django.test import TestCase
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
-from edxmako import add_lookup, LOOKUP
-from edxmako.shortcuts import marketing_link
+import edxmako.middleware
+from edxmako import add_lookup, clear_lookups, LOOKUP
+from edxmako.paths import precompile_templates
+from edxmako.render_stats import render_stats, reset_render_stats
+from edxmako.shortcuts import marketing_link, render_to_string
 from mock import patch
 from util.testing import UrlResetMixin
 
@@ -37,3 +45,52 @@ class AddLookupTests(TestCase):
         dirs = LOOKUP['test'].directories
         self.assertEqual(len(dirs), 1)
         self.assertTrue(dirs[0].endswith('management'))
+
+
+class RenderTests(TestCase):
+    """
+    Test precompiling and rendering templates
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        os.mkdir(os.path.join(self.directory, 'sub'))
+        for name, content in [
+            ('hello.html', u'Hello ${name} on ${site}'),
+            ('sub/bye.html', u'Bye'),
+            ('broken.html', u'<%def name="'),
+            ('template.underscore', u'<%= name %>'),
+        ]:
+            with open(os.path.join(self.directory, name), 'w') as template_file:
+                template_file.write(content)
+        clear_lookups('test')
+        self.addCleanup(clear_lookups, 'test')
+        add_lookup('test', self.directory)
+        reset_render_stats()
+
+    @override_settings(MAKO_FILESYSTEM_CHECKS=False)
+    def test_precompile(self):
+        clear_lookups('test')
+        add_lookup('test', self.directory)
+        self.assertEqual(precompile_templates(['test']), 2)
+        self.assertEqual(sorted(LOOKUP['test'].template_uris()), ['broken.html', 'hello.html', 'sub/bye.html'])
+
+        # without filesystem checks, the compiled templates are rendered as they were
+        with open(os.path.join(self.directory, 'sub', 'bye.html'), 'w') as template_file:
+            template_file.write(u'Farewell')
+        self.assertEqual(render_to_string('sub/bye.html', {}, namespace='test'), u'Bye')
+
+    def test_render(self):
+        middleware = edxmako.middleware.MakoMiddleware()
+        middleware.process_request(RequestFactory().get('/', SERVER_NAME='example.com'))
+        self.addCleanup(setattr, edxmako.middleware, 'requestcontext', None)
+
+        self.assertEqual(render_to_string('hello.html', {'name': 'you'}, namespace='test'), u'Hello you on example.com')
+        # the render's variables are layered over the request's
+        self.assertEqual(
+            render_to_string('hello.html', {'name': 'you', 'site': 'here'}, namespace='test'), u'Hello you on here'
+        )
+        self.assertNotIn('name', edxmako.middleware.request_context_dict())
+
+        self.assertEqual(render_stats()['hello.html']['count'], 2)
+        self.assertGreater(render_stats()['hello.html']['time'], 0)
@@ -31,7 +31,6 @@ EMBARGO_SITE_REDIRECT_URL = 'https://www.edx.org/'
 
 """
 import logging
-import pygeoip
 
 from django.core.exceptions import MiddlewareNotUsed
 from django.conf import settings
@@ -40,6 +39,8 @@ from django.http import HttpResponseRedirect, HttpResponseForbidden
 from ipware.ip import get_ip
 from util.request import course_id_from_url
 
+from geoinfo.api import country_code_by_addr
+
 from embargo.models import EmbargoedCourse, EmbargoedState, IPFilter
 
 log = logging.getLogger(__name__)
@@ -76,7 +77,6 @@ class EmbargoMiddleware(object):
                 response = HttpResponseRedirect(redirect_url) if redirect_url \
                            else HttpResponseForbidden('Access Denied')
 
-            # If we're having performance issues, add caching here
             ip_addr = get_ip(request)
 
             # if blacklisted, immediately fail
@@ -90,7 +90,7 @@ class EmbargoMiddleware(object):
                 log.info(msg)
                 return response
 
-            country_code_from_ip = pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+            country_code_from_ip = country_code_by_addr(ip_addr)
             is_embargoed = country_code_from_ip in EmbargoedState.current().embargoed_countries_list
             # Fail if country is embargoed and the ip address isn't explicitly whitelisted
             if is_embargoed and ip_addr not in IPFilter.current().whitelist_ips:
@@ -11,13 +11,19 @@ file and check it in at the same time as your model changes. To do that,
 3. Add the migration file created in edx-platform/common/djangoapps/embargo/migrations/
 """
 
+from bisect import bisect_right
+
 import ipaddr
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
-from config_models.models import ConfigurationModel
+from config_models.models import ConfigurationModel, cache
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 
+EMBARGOED_COURSES_CACHE_KEY = 'embargo/embargoed_courses'
+
 
 class EmbargoedCourse(models.Model):
     """
@@ -31,6 +37,9 @@ class EmbargoedCourse(models.Model):
     # Whether or not to embargo
     embargoed = models.BooleanField(default=False)
 
+    # The number of seconds the set of embargoed courses is cached for
+    cache_timeout = 600
+
     @classmethod
     def is_embargoed(cls, course_id):
         """
@@ -38,11 +47,23 @@ class EmbargoedCourse(models.Model):
 
         If course has not been explicitly embargoed, returns False.
         """
-        try:
-            record = cls.objects.get(course_id=course_id)
-            return record.embargoed
-        except cls.DoesNotExist:
+        if course_id is None:
             return False
+        return course_id.to_deprecated_string() in cls.embargoed_course_ids()
+
+    @classmethod
+    def embargoed_course_ids(cls):
+        """
+        Returns the frozenset of the (deprecated string) ids of the embargoed courses.
+
+        The set is cached (like the ConfigurationModels), and dropped whenever an EmbargoedCourse
+        is saved or deleted, so checking every request's course doesn't query the database.
+        """
+        course_ids = cache.get(EMBARGOED_COURSES_CACHE_KEY)
+        if course_ids is None:
+            course_ids = frozenset(cls.objects.filter(embargoed=True).values_list('course_id', flat=True))
+            cache.set(EMBARGOED_COURSES_CACHE_KEY, course_ids, cls.cache_timeout)
+        return course_ids
 
     def __unicode__(self):
         not_em = "Not "
@@ -52,6 +73,15 @@ class EmbargoedCourse(models.Model):
         return u"Course '{}' is {}Embargoed".format(self.course_id.to_deprecated_string(), not_em)
 
 
+@receiver(post_save, sender=EmbargoedCourse)
+@receiver(post_delete, sender=EmbargoedCourse)
+def clear_embargoed_courses_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cached set of embargoed courses when one changes
+    """
+    cache.delete(EMBARGOED_COURSES_CACHE_KEY)
+
+
 class EmbargoedState(ConfigurationModel):
     """
     Register countries to be embargoed.
@@ -89,10 +119,26 @@ class IPFilter(ConfigurationModel):
     class IPFilterList(object):
         """
         Represent a list of IP addresses with support of networks.
+
+        The networks are compiled into sorted, disjoint ranges of addresses (per IP version), so
+        that checking an address is a binary search.
         """
 
         def __init__(self, ips):
             self.networks = [ipaddr.IPNetwork(ip) for ip in ips]
+            self.ranges = {}
+            for version in (4, 6):
+                ranges = sorted(
+                    (int(network.network), int(network.broadcast))
+                    for network in self.networks if network.version == version
+                )
+                merged = []
+                for first, last in ranges:
+                    if merged and first <= merged[-1][1] + 1:
+                        merged[-1][1] = max(merged[-1][1], last)
+                    else:
+                        merged.append([first, last])
+                self.ranges[version] = ([first for first, __ in merged], [last for __, last in merged])
 
         def __iter__(self):
             for network in self.networks:
@@ -104,11 +150,27 @@ class IPFilter(ConfigurationModel):
             except ValueError:
                 return False
 
-            for network in self.networks:
-                if network.Contains(ip):
-                    return True
+            firsts, lasts = self.ranges[ip.version]
+            index = bisect_right(firsts, int(ip)) - 1
+            return index >= 0 and int(ip) <= lasts[index]
 
-            return False
+    # The compiled IPFilterLists, by list string: the lists are only recompiled when the
+    # configuration changes, rather than for each request
+    _compiled_lists = {}
+
+    @classmethod
+    def _ip_filter_list(cls, ips):
+        """
+        Returns the (compiled once) IPFilterList of the comma-separated ips
+        """
+        ip_filter_list = cls._compiled_lists.get(ips)
+        if ip_filter_list is None:
+            ip_filter_list = cls.IPFilterList([addr.strip() for addr in ips.split(',')])
+            if len(cls._compiled_lists) >= 10:
+                # keep the whitelist and blacklist of the current configuration, not every past one
+                cls._compiled_lists.clear()
+            cls._compiled_lists[ips] = ip_filter_list
+        return ip_filter_list
 
     @property
     def whitelist_ips(self):
@@ -117,7 +179,7 @@ class IPFilter(ConfigurationModel):
         """
         if self.whitelist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.whitelist.split(',')])  # pylint: disable=no-member
+        return self._ip_filter_list(self.whitelist)
 
     @property
     def blacklist_ips(self):
@@ -126,4 +188,4 @@ class IPFilter(ConfigurationModel):
         """
         if self.blacklist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.blacklist.split(',')])  # pylint: disable=no-member
+        return self._ip_filter_list(self.blacklist)
@@ -95,3 +95,33 @@ class EmbargoModelsTest(TestCase):
         self.assertTrue('1.1.0.1' in cblacklist)
         self.assertTrue('1.1.1.0' in cblacklist)
         self.assertFalse('1.2.0.0' in cblacklist)
+
+    def test_ip_ranges(self):
+        IPFilter(blacklist='1.0.0.0/24, 1.0.0.128/25, 1.0.1.0/24, 10.0.0.5, 2001:db8::/32').save()
+
+        cblacklist = IPFilter.current().blacklist_ips
+        self.assertTrue('1.0.0.0' in cblacklist)
+        self.assertTrue('1.0.1.255' in cblacklist)
+        self.assertFalse('1.0.2.0' in cblacklist)
+        self.assertFalse('0.255.255.255' in cblacklist)
+        self.assertTrue('10.0.0.5' in cblacklist)
+        self.assertFalse('10.0.0.6' in cblacklist)
+        self.assertTrue('2001:db8::1' in cblacklist)
+        self.assertFalse('2001:db9::1' in cblacklist)
+        self.assertFalse('not an ip' in cblacklist)
+        self.assertEqual(len(list(cblacklist)), 5)
+
+        # the list is compiled once for the configuration
+        self.assertIs(IPFilter.current().blacklist_ips, cblacklist)
+
+    def test_embargoed_courses_cached(self):
+        course_id = SlashSeparatedCourseKey('abc', '123', 'doremi')
+        EmbargoedCourse(course_id=course_id, embargoed=True).save()
+        self.assertTrue(EmbargoedCourse.is_embargoed(course_id))
+        with self.assertNumQueries(0):
+            self.assertTrue(EmbargoedCourse.is_embargoed(course_id))
+            self.assertFalse(EmbargoedCourse.is_embargoed(SlashSeparatedCourseKey('abc', '123', 'fasola')))
+            self.assertFalse(EmbargoedCourse.is_embargoed(None))
+
+        EmbargoedCourse.objects.get(course_id=course_id).delete()
+        self.assertFalse(EmbargoedCourse.is_embargoed(course_id))
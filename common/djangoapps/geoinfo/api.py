@@ -0,0 +1,34 @@
+"""
+Country lookups of IP addresses, shared by the middlewares.
+"""
+import threading
+
+import pygeoip
+from django.conf import settings
+
+_readers = {}
+_readers_lock = threading.Lock()
+
+
+def geoip_reader():
+    """
+    Returns the process' reader of the GeoIP database at settings.GEOIP_PATH.
+
+    The database is opened (memory mapped) once per process, rather than read again for each
+    lookup.
+    """
+    path = settings.GEOIP_PATH
+    reader = _readers.get(path)
+    if reader is None:
+        with _readers_lock:
+            reader = _readers.get(path)
+            if reader is None:
+                reader = _readers[path] = pygeoip.GeoIP(path, pygeoip.MMAP_CACHE)
+    return reader
+
+
+def country_code_by_addr(ip_address):
+    """
+    Returns the code of the country of the IP address, or '' if unknown
+    """
+    return geoip_reader().country_code_by_addr(ip_address)
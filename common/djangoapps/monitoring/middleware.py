@@ -0,0 +1,71 @@
+"""
+Report the modulestore and contentstore queries each request makes.
+"""
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from dogapi import dog_stats_api
+
+from xmodule.modulestore.mongo_instrumentation import start_recording, stop_recording
+
+log = logging.getLogger(__name__)
+
+
+class ModulestoreQueryMiddleware(object):
+    """
+    Records the mongo operations of each request, and reports their totals as statsd metrics (tagged by view), and
+    in debug mode in the X-Modulestore-Queries response header.
+
+    Logs the breakdown of the requests whose operations took longer than settings.MODULESTORE_SLOW_REQUEST_SECONDS
+    (if not None) by calling modulestore method.
+
+    Recording adds to the cost of every operation, so it's only done with the RECORD_MODULESTORE_QUERIES feature.
+    """
+    def __init__(self):
+        if not settings.FEATURES.get('RECORD_MODULESTORE_QUERIES', False):
+            raise MiddlewareNotUsed()
+
+    def process_request(self, request):
+        start_recording()
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.modulestore_view_name = u'{}.{}'.format(view_func.__module__, view_func.__name__)
+        return None
+
+    def process_response(self, request, response):
+        stats = stop_recording()
+        if stats is None:
+            return response
+
+        totals = stats.totals()
+        if settings.DEBUG:
+            response['X-Modulestore-Queries'] = 'calls={}; documents={}; bytes={}; time_ms={:.1f}'.format(
+                totals.calls, totals.documents, totals.bytes, totals.time * 1000
+            )
+        if totals.calls == 0:
+            return response
+
+        # requests answered by an earlier middleware (e.g., static content) have no view
+        view_name = getattr(request, 'modulestore_view_name', u'none')
+        tags = [u'view:{}'.format(view_name)]
+        dog_stats_api.histogram('modulestore.request.calls', totals.calls, tags=tags)
+        dog_stats_api.histogram('modulestore.request.documents', totals.documents, tags=tags)
+        dog_stats_api.histogram('modulestore.request.bytes', totals.bytes, tags=tags)
+        dog_stats_api.histogram('modulestore.request.time', totals.time, tags=tags)
+
+        threshold = getattr(settings, 'MODULESTORE_SLOW_REQUEST_SECONDS', None)
+        if threshold is not None and totals.time >= threshold:
+            log.warning(
+                u"%s %s (%s) made %d modulestore calls taking %.3fs:\n%s",
+                request.method, request.path, view_name, totals.calls, totals.time,
+                u"\n".join(
+                    u"  {:.3f}s {} calls, {} documents, {} bytes: {}.{} from {}".format(
+                        operation.time, operation.calls, operation.documents, operation.bytes,
+                        collection, name, caller
+                    )
+                    for (caller, collection, name), operation in stats.breakdown()
+                )
+            )
+        return response
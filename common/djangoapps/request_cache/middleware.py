@@ -2,19 +2,39 @@ import threading
 
 _request_cache_threadlocal = threading.local()
 _request_cache_threadlocal.data = {}
+_request_cache_threadlocal.in_request = False
 
 class RequestCache(object):
     @classmethod
     def get_request_cache(cls):
         return _request_cache_threadlocal
-            
+
+    @classmethod
+    def get_cache(cls, name):
+        """
+        Returns the dict stored under name in the request cache, creating it if needed
+        """
+        if not hasattr(_request_cache_threadlocal, 'data'):
+            _request_cache_threadlocal.data = {}
+        return _request_cache_threadlocal.data.setdefault(name, {})
+
+    @classmethod
+    def is_request_active(cls):
+        """
+        Returns whether this thread is currently handling a request. Caches which could go stale
+        outside of a request's lifetime (e.g., in tests or management commands) check this first.
+        """
+        return getattr(_request_cache_threadlocal, 'in_request', False)
+
     def clear_request_cache(self):
         _request_cache_threadlocal.data = {}
 
     def process_request(self, request):
         self.clear_request_cache()
+        _request_cache_threadlocal.in_request = True
         return None
 
     def process_response(self, request, response):
         self.clear_request_cache()
-        return response
\ No newline at end of file
+        _request_cache_threadlocal.in_request = False
+        return response
@@ -24,8 +24,10 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.core.cache import get_cache, InvalidCacheBackendError
 from django.db import models, IntegrityError
 from django.db.models import Count
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
@@ -37,7 +39,8 @@ from importlib import import_module
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 import lms.lib.comment_client as cc
-from util.query import use_read_replica_if_available
+from util.cache import delete_until_committed, is_deleted_until_committed
+from util.query import increment_count, use_read_replica_if_available
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 from opaque_keys.edx.keys import CourseKey
 from functools import total_ordering
@@ -665,10 +668,11 @@ class CourseEnrollment(models.Model):
         Returns the count of active enrollments in a course.
 
         'course_id' is the course_id to return enrollments
-        """
-        enrollment_number = CourseEnrollment.objects.filter(course_id=course_id, is_active=1).count()
 
-        return enrollment_number
+        This reads the course's CourseEnrollmentCount rather than counting its enrollments.
+        """
+        counts = list(CourseEnrollmentCount.objects.filter(course_id=course_id).values_list('count', flat=True))
+        return counts[0] if counts else 0
 
     @classmethod
     def is_course_full(cls, course):
@@ -864,12 +868,10 @@ class CourseEnrollment(models.Model):
                adding an enrollment for it.
 
         `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+
+        This reads the user's cached `enrolled_course_ids`.
         """
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_key)
-            return record.is_active
-        except cls.DoesNotExist:
-            return False
+        return course_key.to_deprecated_string() in cls.enrolled_course_ids(user)
 
     @classmethod
     def is_enrolled_by_partial(cls, user, course_id_partial):
@@ -889,15 +891,35 @@ class CourseEnrollment(models.Model):
         assert isinstance(course_id_partial, CourseKey)
         assert not course_id_partial.run  # None or empty string
         course_key = SlashSeparatedCourseKey(course_id_partial.org, course_id_partial.course, '')
-        querystring = unicode(course_key.to_deprecated_string())
-        try:
-            return CourseEnrollment.objects.filter(
-                user=user,
-                course_id__startswith=querystring,
-                is_active=1
-            ).exists()
-        except cls.DoesNotExist:
-            return False
+        prefix = unicode(course_key.to_deprecated_string())
+        return any(course_id.startswith(prefix) for course_id in cls.enrolled_course_ids(user))
+
+    @classmethod
+    def enrolled_course_ids(cls, user):
+        """
+        Returns the frozenset of the (deprecated string) ids of the courses the user is actively
+        enrolled in.
+
+        The set is cached per user, and dropped whenever one of the user's enrollments is saved or
+        deleted, so that checking the user's enrollment in many courses (or many times, e.g., for
+        each of a page's locked assets) costs at most one query. While this thread has uncommitted
+        changes of the user's enrollments, the set is read from the database and not cached.
+        """
+        if user.id is None:
+            return frozenset()
+        cache_key = _enrolled_course_ids_cache_key(user.id)
+        if is_deleted_until_committed(cache_key):
+            return frozenset(
+                cls.objects.filter(user_id=user.id, is_active=True).values_list('course_id', flat=True)
+            )
+        cache = _enrollments_cache()
+        course_ids = cache.get(cache_key)
+        if course_ids is None:
+            course_ids = frozenset(
+                cls.objects.filter(user_id=user.id, is_active=True).values_list('course_id', flat=True)
+            )
+            cache.set(cache_key, course_ids, ENROLLED_COURSE_IDS_CACHE_TIMEOUT)
+        return course_ids
 
     @classmethod
     def enrollment_mode_for_user(cls, user, course_id):
@@ -983,6 +1005,83 @@ class CourseEnrollment(models.Model):
             return True
 
 
+# How long a user's set of enrolled course ids is cached for. Enrollment changes drop it (again
+# once committed); this only bounds how long a change made outside of the models can go unnoticed.
+ENROLLED_COURSE_IDS_CACHE_TIMEOUT = 60 * 60
+
+def _enrollments_cache():
+    """
+    The cache of the users' enrolled course ids
+    """
+    try:
+        return get_cache('enrollments')
+    except InvalidCacheBackendError:
+        return get_cache('default')
+
+
+def _enrolled_course_ids_cache_key(user_id):
+    """
+    The cache key of the user's enrolled course ids
+    """
+    return u'student.enrolled_course_ids.{}'.format(user_id)
+
+
+def _drop_enrolled_course_ids(user_id):
+    """
+    Drop the user's cached enrolled course ids after a change of their enrollments (and again once the
+    request's transaction is committed, see delete_until_committed).
+    """
+    delete_until_committed(_enrollments_cache(), [_enrolled_course_ids_cache_key(user_id)])
+
+
+class CourseEnrollmentCount(models.Model):
+    """
+    The number of active enrollments in a course, kept up to date as enrollments are saved and
+    deleted, so that CourseEnrollment.num_enrolled_in (and with it is_course_full, checked on every
+    enrollment attempt) doesn't have to count the course's enrollments.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+    count = models.IntegerField(default=0)
+
+    def __unicode__(self):
+        return u"[CourseEnrollmentCount] {}: {}".format(self.course_id, self.count)
+
+
+@receiver(post_init, sender=CourseEnrollment)
+def remember_enrollment_activity(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remember whether the enrollment was active when loaded, to count its activation changes
+    """
+    instance._was_active = bool(instance.is_active)  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def update_enrollment_count(sender, instance, created, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """
+    Count the enrollment's activation changes in its course's CourseEnrollmentCount, and drop the
+    user's cached enrolled course ids
+    """
+    # pylint: disable=protected-access
+    _drop_enrolled_course_ids(instance.user_id)
+    if raw:
+        return
+    is_active = bool(instance.is_active)
+    was_active = False if created else instance._was_active
+    if is_active != was_active:
+        increment_count(CourseEnrollmentCount, 1 if is_active else -1, course_id=instance.course_id)
+    instance._was_active = is_active
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def remove_enrollment_from_count(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Stop counting a deleted enrollment, and drop the user's cached enrolled course ids
+    """
+    _drop_enrolled_course_ids(instance.user_id)
+    if instance._was_active:  # pylint: disable=protected-access
+        increment_count(CourseEnrollmentCount, -1, course_id=instance.course_id)
+
+
 class CourseEnrollmentAllowed(models.Model):
     """
     Table of users (specified by email address strings) who are allowed to enroll in a specified course.
@@ -6,6 +6,7 @@ adding users, removing users, and listing members
 from abc import ABCMeta, abstractmethod
 
 from django.contrib.auth.models import User
+from request_cache.middleware import RequestCache
 from student.models import CourseAccessRole
 from xmodule_django.models import CourseKeyField
 
@@ -14,21 +15,48 @@ class RoleCache(object):
     """
     A cache of the CourseAccessRoles held by a particular user
     """
+    REQUEST_CACHE_NAME = 'student.roles.RoleCache'
+
     def __init__(self, user):
-        self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
+        # Stored as (role, course_id, org) tuples, rather than django models, so that checking a role is
+        # a set lookup
+        self._roles = frozenset(
+            (access_role.role, access_role.course_id, access_role.org)
+            for access_role in CourseAccessRole.objects.filter(user=user)
         )
 
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        return (role, course_id, org) in self._roles
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Return the RoleCache of user, loading all of the user's roles with a single query the first
+        time it's needed in a request (or on this user object, outside of requests).
+        """
+        # pylint: disable=protected-access
+        if not hasattr(user, '_roles'):
+            request_roles = RequestCache.get_cache(cls.REQUEST_CACHE_NAME)
+            if RequestCache.is_request_active() and user.id in request_roles:
+                user._roles = request_roles[user.id]
+            else:
+                user._roles = cls(user)
+                if RequestCache.is_request_active():
+                    request_roles[user.id] = user._roles
+        return user._roles
+
+    @classmethod
+    def invalidate(cls, user):
+        """
+        Forget the cached roles of user as they are changing
+        """
+        # pylint: disable=protected-access
+        if hasattr(user, '_roles'):
+            del user._roles
+        RequestCache.get_cache(cls.REQUEST_CACHE_NAME).pop(user.id, None)
 
 
 class AccessRole(object):
@@ -113,13 +141,7 @@ class RoleBase(AccessRole):
         if not (user.is_authenticated() and user.is_active):
             return False
 
-        # pylint: disable=protected-access
-        if not hasattr(user, '_roles'):
-            # Cache a list of tuples identifying the particular roles that a user has
-            # Stored as tuples, rather than django models, to make it cheaper to construct objects for comparison
-            user._roles = RoleCache(user)
-
-        return user._roles.has_role(self._role_name, self.course_key, self.org)
+        return RoleCache.for_user(user).has_role(self._role_name, self.course_key, self.org)
 
     def add_users(self, *users):
         """
@@ -131,8 +153,7 @@ class RoleBase(AccessRole):
             if user.is_authenticated and user.is_active and not self.has_user(user):
                 entry = CourseAccessRole(user=user, role=self._role_name, course_id=self.course_key, org=self.org)
                 entry.save()
-                if hasattr(user, '_roles'):
-                    del user._roles
+                RoleCache.invalidate(user)
 
     def remove_users(self, *users):
         """
@@ -143,8 +164,7 @@ class RoleBase(AccessRole):
         )
         entries.delete()
         for user in users:
-            if hasattr(user, '_roles'):
-                del user._roles
+            RoleCache.invalidate(user)
 
     def users_with_role(self):
         """
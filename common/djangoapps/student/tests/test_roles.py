@@ -2,8 +2,11 @@
 Tests of student.roles
 """
 import ddt
+from django.contrib.auth.models import User
 from django.test import TestCase
 
+from request_cache.middleware import RequestCache
+
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
 from student.tests.factories import AnonymousUserFactory
 
@@ -191,3 +194,18 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+    def test_shared_within_request(self):
+        request_cache = RequestCache()
+        request_cache.process_request(None)
+        try:
+            cache = RoleCache.for_user(self.user)
+            # another instance of the same user shares the request's cache
+            self.assertIs(RoleCache.for_user(User.objects.get(id=self.user.id)), cache)
+
+            # changing the user's roles invalidates it
+            CourseStaffRole(self.IN_KEY).add_users(self.user)
+            self.assertIsNot(RoleCache.for_user(self.user), cache)
+            self.assertTrue(RoleCache.for_user(self.user).has_role('staff', self.IN_KEY, 'edX'))
+        finally:
+            request_cache.process_response(None, None)
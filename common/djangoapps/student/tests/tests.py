@@ -14,7 +14,10 @@ from django.test import TestCase
 from django.test.utils import override_settings
 from django.test.client import RequestFactory, Client
 from django.contrib.auth.models import User, AnonymousUser
+from django.core.cache import get_cache
+from django.core.signals import request_finished
 from django.core.urlresolvers import reverse, NoReverseMatch
+from django.db import transaction
 from django.http import HttpResponse
 from unittest.case import SkipTest
 
@@ -476,6 +479,97 @@ class EnrollInCourseTest(TestCase):
         CourseEnrollment.enroll(user, course_id, "honor")
         self.assert_enrollment_mode_change_event_was_emitted(user, course_id, "honor")
 
+    def test_enrollment_count(self):
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        users = [UserFactory.create() for __ in xrange(3)]
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 0)
+
+        for user in users:
+            CourseEnrollment.enroll(user, course_id)
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 3)
+
+        # changing modes or enrolling again doesn't count the enrollment twice
+        CourseEnrollment.enroll(users[0], course_id, "audit")
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 3)
+
+        CourseEnrollment.unenroll(users[0], course_id)
+        CourseEnrollment.unenroll(users[0], course_id)
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 2)
+
+        CourseEnrollment.enroll(users[0], course_id)
+        CourseEnrollment.objects.get(user=users[1], course_id=course_id).delete()
+        self.assertEqual(CourseEnrollment.num_enrolled_in(course_id), 2)
+
+        course = Mock(id=course_id, max_student_enrollments_allowed=2)
+        self.assertTrue(CourseEnrollment.is_course_full(course))
+        CourseEnrollment.unenroll(users[2], course_id)
+        self.assertFalse(CourseEnrollment.is_course_full(course))
+
+        # other courses aren't counted
+        self.assertEqual(CourseEnrollment.num_enrolled_in(SlashSeparatedCourseKey("edX", "Test102", "2013")), 0)
+
+    def test_enrolled_course_ids_cache(self):
+        enrollments_cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='test_enrollments')
+        user = UserFactory.create()
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        other_course_id = SlashSeparatedCourseKey("edX", "Test102", "2013")
+
+        with patch('student.models._enrollments_cache', return_value=enrollments_cache):
+            CourseEnrollment.enroll(user, course_id)
+            # the request which enrolled the user finished
+            request_finished.send(sender=None)
+            with self.assertNumQueries(1):
+                self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+                self.assertFalse(CourseEnrollment.is_enrolled(user, other_course_id))
+                self.assertTrue(
+                    CourseEnrollment.is_enrolled_by_partial(user, SlashSeparatedCourseKey("edX", "Test101", None))
+                )
+
+            # enrollment changes drop the cached course ids
+            CourseEnrollment.enroll(user, other_course_id)
+            self.assertTrue(CourseEnrollment.is_enrolled(user, other_course_id))
+            CourseEnrollment.unenroll(user, course_id)
+            self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+            self.assertEqual(CourseEnrollment.enrolled_course_ids(user), frozenset([u"edX/Test102/2013"]))
+            request_finished.send(sender=None)
+
+        self.assertFalse(CourseEnrollment.is_enrolled(AnonymousUser(), other_course_id))
+
+    @patch('util.cache.RequestCache.is_request_active', Mock(return_value=True))
+    def test_enrolled_course_ids_cache_uncommitted(self):
+        enrollments_cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='test_enrollments')
+        user = UserFactory.create()
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        cache_key = u'student.enrolled_course_ids.{}'.format(user.id)
+
+        with patch('student.models._enrollments_cache', return_value=enrollments_cache):
+            CourseEnrollment.enroll(user, course_id)
+            # meanwhile, another request caches the user's enrollments without the uncommitted one
+            enrollments_cache.set(cache_key, frozenset())
+
+            # until the transaction is over, this thread doesn't use the cache for the user
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+            self.assertEqual(enrollments_cache.get(cache_key), frozenset())
+
+            # and the stale cached ids are dropped once the request finished
+            request_finished.send(sender=None)
+            self.assertIsNone(enrollments_cache.get(cache_key))
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+            self.assertEqual(enrollments_cache.get(cache_key), frozenset([u"edX/Test101/2013"]))
+
+    def test_enrolled_course_ids_cache_outside_request(self):
+        enrollments_cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='test_enrollments')
+        user = UserFactory.create()
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+
+        with patch('student.models._enrollments_cache', return_value=enrollments_cache):
+            # e.g., in a celery task: no request finishes, so the cache is used again right after the commit
+            with transaction.commit_on_success():
+                CourseEnrollment.enroll(user, course_id)
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+            with self.assertNumQueries(0):
+                self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+
 
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
@@ -8,6 +8,7 @@ import json
 import requests
 import time
 import copy
+from capa.xqueue_interface import XQueueInterface, CONNECTION_ERROR_MSG, make_xheader
 from ..xqueue import StubXQueueService, StubXQueueHandler
 
 
@@ -179,3 +180,61 @@ class StubXQueueServiceTest(unittest.TestCase):
 
         # Check that the POST request was made with the correct params
         self.post.assert_called_with(callback_url, data=expected_callback_dict)
+
+
+class XQueueInterfaceTest(unittest.TestCase):
+    """
+    Test the LMS's xqueue client against the stub XQueue.
+    """
+    CALLBACK_URL = 'http://127.0.0.1:8000/test_callback'
+
+    def setUp(self):
+        self.server = StubXQueueService()
+        self.addCleanup(self.server.shutdown)
+        self.url = "http://127.0.0.1:{0}".format(self.server.port)
+
+        # Record the grade responses rather than posting them
+        patcher = mock.patch('terrain.stubs.xqueue.post')
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch('terrain.stubs.xqueue.Timer')
+        timer = patcher.start()
+        timer.side_effect = FakeTimer
+        self.addCleanup(patcher.stop)
+
+        self.header = make_xheader(self.CALLBACK_URL, 'test_queuekey', 'test_queue')
+        self.body = json.dumps({'student_response': 'test'})
+
+    def _interface(self, url=None, sender=None):
+        """
+        An XQueueInterface to the stub (or to `url`)
+        """
+        return XQueueInterface(
+            url or self.url, {'username': 'lms', 'password': 'password'}, pool_size=2, timeout=5, sender=sender
+        )
+
+    def test_send_to_queue(self):
+        self.assertEqual(self._interface().send_to_queue(self.header, self.body), (0, ''))
+        self.assertEqual(self.post.call_args[0][0], self.CALLBACK_URL)
+
+    def test_cannot_connect(self):
+        # nothing listens on the stub's port once it is shut down
+        interface = self._interface()
+        self.server.shutdown()
+        self.assertEqual(interface.send_to_queue(self.header, self.body), (1, CONNECTION_ERROR_MSG))
+
+    def test_sender(self):
+        sender = mock.Mock()
+        sender.submit.return_value = 3
+        interface = self._interface(sender=sender)
+        self.assertEqual(interface.send_to_queue(self.header, self.body), (0, '3'))
+        sender.submit.assert_called_once_with(self.header, self.body)
+        self.assertFalse(self.post.called)
+
+    def test_sender_cannot_store(self):
+        # when the sender can't store the submission, it is sent right away
+        sender = mock.Mock()
+        sender.submit.return_value = None
+        self.assertEqual(self._interface(sender=sender).send_to_queue(self.header, self.body), (0, ''))
+        self.assertTrue(self.post.called)
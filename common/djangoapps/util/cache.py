@@ -5,9 +5,15 @@ invalidation. Import these instead of django.core.cache.
 Note that 'default' is being preserved for user session caching, which we're
 not migrating so as not to inconvenience users by logging them all out.
 """
+import threading
 from functools import wraps
 
 from django.core import cache
+from django.core.signals import request_finished
+from django.db import transaction
+from django.dispatch import receiver
+
+from request_cache.middleware import RequestCache
 
 
 # If we can't find a 'general' CACHE defined in settings.py, we simply fall back
@@ -58,3 +64,57 @@ def cache_if_anonymous(view_func):
             return view_func(request, *args, **kwargs)
 
     return _decorated
+
+
+# {cache key: its cache} of the keys this thread deleted in a request whose transaction isn't committed yet
+_uncommitted_deletes = threading.local()
+
+
+def _uncommitted_keys():
+    """
+    The {cache key: its cache} of the keys this thread deleted in a request whose transaction isn't committed yet
+    """
+    if not hasattr(_uncommitted_deletes, 'keys'):
+        _uncommitted_deletes.keys = {}
+    return _uncommitted_deletes.keys
+
+
+def delete_until_committed(key_cache, keys):
+    """
+    Delete the keys from key_cache, as the data they cache is changing.
+
+    In a request under transaction management (where the TransactionMiddleware commits at the end), other threads
+    can still read and cache the data as it was before the change, and a rollback would undo it, so the keys are
+    deleted again once the request finished (after the commit or rollback), and until then
+    `is_deleted_until_committed` tells this thread not to use them. Outside of requests (e.g., in celery tasks or
+    management commands), nothing would delete them again, so they are only deleted once.
+    """
+    key_cache.delete_many(keys)
+    if RequestCache.is_request_active() and transaction.is_managed():
+        uncommitted_keys = _uncommitted_keys()
+        for key in keys:
+            uncommitted_keys[key] = key_cache
+
+
+def is_deleted_until_committed(key):
+    """
+    Whether this thread deleted the cache key (with delete_until_committed) in the request it's handling, so that
+    it should neither read nor set it until the request finished
+    """
+    return key in _uncommitted_keys()
+
+
+@receiver(request_finished)
+def delete_committed_keys(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Delete again the cache keys deleted during the finished request
+    """
+    uncommitted_keys = _uncommitted_keys()
+    if not uncommitted_keys:
+        return
+    keys_by_cache = {}
+    for key, key_cache in uncommitted_keys.iteritems():
+        keys_by_cache.setdefault(id(key_cache), (key_cache, []))[1].append(key)
+    for key_cache, keys in keys_by_cache.itervalues():
+        key_cache.delete_many(keys)
+    uncommitted_keys.clear()
@@ -1,9 +1,41 @@
 """ Utility functions related to database queries """
+import random
+
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
 
 
 def use_read_replica_if_available(queryset):
     """
     If there is a database called 'read_replica', use that database for the queryset.
     """
-    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
\ No newline at end of file
+    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
+
+
+def increment_count(model, delta, **lookup):
+    """
+    Atomically add delta to the `count` of the model's row matching lookup, creating the row (with
+    count delta) if there's none yet.
+    """
+    rows = model.objects.filter(**lookup)
+    if rows.update(count=F('count') + delta):
+        return
+
+    savepoint = transaction.savepoint()
+    try:
+        model.objects.create(count=delta, **lookup)
+        transaction.savepoint_commit(savepoint)
+    except IntegrityError:
+        # another request created the row first
+        transaction.savepoint_rollback(savepoint)
+        rows.update(count=F('count') + delta)
+
+
+def increment_sharded_count(model, delta, shards, **lookup):
+    """
+    Atomically add delta to the `count` of a random one of the model's `shards` rows matching lookup (which
+    differ by their `shard`), so that concurrent increments of the same counter rarely lock the same row.
+    The counter's value is the sum of its shards.
+    """
+    increment_count(model, delta, shard=random.randrange(shards), **lookup)
@@ -4,8 +4,10 @@
 import hashlib
 import json
 import logging
+
 import requests
 from dogapi import dog_stats_api
+from requests.adapters import HTTPAdapter
 
 
 log = logging.getLogger(__name__)
@@ -16,6 +18,18 @@ XQUEUE_METRIC_NAME = 'edxapp.xqueue'
 # Wait time for response from Xqueue.
 XQUEUE_TIMEOUT = 35 # seconds
 
+# Wait time for Xqueue to accept a request (a submission or a login)
+XQUEUE_REQUEST_TIMEOUT = 10  # seconds
+
+# Connections each XQueueInterface keeps open to Xqueue. Requests beyond this open (and then close) a connection of
+# their own rather than waiting for a free one.
+XQUEUE_POOL_SIZE = 10
+
+# The errors of failing to get a reply from Xqueue, which are worth retrying
+CONNECTION_ERROR_MSG = 'cannot connect to server'
+TIMEOUT_ERROR_MSG = 'request to server timed out'
+HTTP_STATUS_ERROR_MSG = 'unexpected HTTP status code'
+
 
 def make_hashkey(seed):
     """
@@ -62,16 +76,36 @@ def parse_xreply(xreply):
     return (return_code, content)
 
 
+def is_transient_error(msg):
+    """
+    Whether the send_to_queue error msg means Xqueue couldn't be reached (rather than that it refused the request)
+    """
+    if not isinstance(msg, basestring):
+        return False
+    return msg in (CONNECTION_ERROR_MSG, TIMEOUT_ERROR_MSG) or msg.startswith(HTTP_STATUS_ERROR_MSG)
+
+
 class XQueueInterface(object):
     """
     Interface to the external grading system
+
+    Requests share a bounded pool of keep-alive connections, and time out after `timeout` seconds. With a
+    `sender`, submissions without files are handed to it to be delivered later (by calling `deliver`), and
+    send_to_queue returns as soon as they are. The sender's submit(header, body) stores the submission, and returns
+    the number of submissions it is queued behind, or None if it couldn't be stored.
     """
 
-    def __init__(self, url, django_auth, requests_auth=None):
+    def __init__(self, url, django_auth, requests_auth=None, pool_size=XQUEUE_POOL_SIZE,
+                 timeout=XQUEUE_REQUEST_TIMEOUT, sender=None):
         self.url = unicode(url)
         self.auth = django_auth
         self.session = requests.Session()
         self.session.auth = requests_auth
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=False)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.timeout = timeout
+        self.sender = sender
 
     def send_to_queue(self, header, body, files_to_upload=None):
         """
@@ -95,6 +129,19 @@ class XQueueInterface(object):
             u'queue:{}'.format(queue_name)
         ])
 
+        # The uploaded files are only readable during the request, so they are always sent right away
+        if self.sender is not None and not files_to_upload:
+            pending = self.sender.submit(header, body)
+            if pending is not None:
+                return (0, str(pending))
+            log.warning("Xqueue sender couldn't store the submission, sending it to queue %s synchronously", queue_name)
+
+        return self.deliver(header, body, files_to_upload)
+
+    def deliver(self, header, body, files_to_upload=None):
+        """
+        Submit a request to xqueue now (logging in if need be), and return its (error_code, msg)
+        """
         # Attempt to send to queue
         (error, msg) = self._send_to_queue(header, body, files_to_upload)
 
@@ -134,12 +181,16 @@ class XQueueInterface(object):
 
     def _http_post(self, url, data, files=None):
         try:
-            r = self.session.post(url, data=data, files=files)
+            r = self.session.post(url, data=data, files=files, timeout=self.timeout)
+        except requests.exceptions.Timeout, err:
+            log.error(err)
+            return (1, TIMEOUT_ERROR_MSG)
         except requests.exceptions.ConnectionError, err:
             log.error(err)
-            return (1, 'cannot connect to server')
+            return (1, CONNECTION_ERROR_MSG)
 
         if r.status_code not in [200]:
-            return (1, 'unexpected HTTP status code [%d]' % r.status_code)
+            return (1, '%s [%d]' % (HTTP_STATUS_ERROR_MSG, r.status_code))
 
         return parse_xreply(r.text)
+
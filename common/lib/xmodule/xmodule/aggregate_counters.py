@@ -0,0 +1,67 @@
+"""
+Counters aggregated over all the users of a block (word cloud words, poll votes, ...).
+
+Blocks get their counters from the runtime's 'aggregate_counters' service, which stores every counter
+separately and increments it atomically. Runtimes without that service (e.g., Studio and the xmodule
+tests) get FieldAggregateCounters, which keeps each set of counters in a Scope.user_state_summary Dict
+field of the block named after the counters.
+
+Both implement:
+
+    increment(block, counter_name, keys, delta=1) -> {key: count}
+        Add delta to the counter of each of keys (a key listed twice is incremented twice), and
+        return the counts of the incremented keys.
+
+    get_counts(block, counter_name, keys=None) -> {key: count}
+        Return the counts of keys (every counted key if keys is None). Keys never counted are 0.
+
+    get_top(block, counter_name, size) -> ({key: count}, total)
+        Return the size largest counters and the sum of all the counters. This may be a few seconds
+        out of date.
+"""
+from collections import Counter
+
+AGGREGATE_COUNTERS_SERVICE = 'aggregate_counters'
+
+
+def get_aggregate_counters(block):
+    """
+    Return the block's runtime's aggregate counters service, or FieldAggregateCounters if it has none.
+    The block's class must declare `@XBlock.wants('aggregate_counters')`.
+    """
+    service = block.runtime.service(block, AGGREGATE_COUNTERS_SERVICE)
+    if service is None:
+        service = FieldAggregateCounters()
+    return service
+
+
+class FieldAggregateCounters(object):
+    """
+    Aggregate counters stored in the block's Dict field named counter_name. Every increment reads
+    and rewrites the whole dict, so this is only fit for runtimes with few concurrent users.
+    """
+    def _counts(self, block, counter_name):
+        """
+        The current counts (the field may still be None from before it was ever set)
+        """
+        return getattr(block, counter_name) or {}
+
+    def increment(self, block, counter_name, keys, delta=1):
+        counts = self._counts(block, counter_name)
+        deltas = Counter(keys)
+        for key, count in deltas.iteritems():
+            counts[key] = counts.get(key, 0) + count * delta
+        # reassign the field, so that the runtime knows that the dict was changed
+        setattr(block, counter_name, counts)
+        return {key: counts[key] for key in deltas}
+
+    def get_counts(self, block, counter_name, keys=None):
+        counts = self._counts(block, counter_name)
+        if keys is None:
+            return dict(counts)
+        return {key: counts.get(key, 0) for key in keys}
+
+    def get_top(self, block, counter_name, size):
+        counts = self._counts(block, counter_name)
+        top = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True)[:size])
+        return top, sum(counts.itervalues())
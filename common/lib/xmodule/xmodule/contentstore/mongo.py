@@ -11,13 +11,24 @@ from xmodule.exceptions import NotFoundError
 from fs.osfs import OSFS
 import os
 import json
+import calendar
+import tarfile
+import time
+from cStringIO import StringIO
 from bson.son import SON
 from opaque_keys.edx.keys import AssetKey
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
+from xmodule.modulestore.mongo_instrumentation import InstrumentedGridFS, instrument_collection
 
 
 class MongoContentStore(ContentStore):
 
+    # how many bytes of an asset export reads from GridFS at a time
+    EXPORT_CHUNK_SIZE = 1024 * 1024
+
+    # the GridFS file attributes which are not exported to the assets policy
+    NON_POLICY_ATTRS = ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']
+
     # pylint: disable=W0613
     def __init__(self, host, db, port=27017, user=None, password=None, bucket='fs', collection=None, **kwargs):
         """
@@ -39,9 +50,9 @@ class MongoContentStore(ContentStore):
         if user is not None and password is not None:
             _db.authenticate(user, password)
 
-        self.fs = gridfs.GridFS(_db, bucket)
+        self.fs = InstrumentedGridFS(gridfs.GridFS(_db, bucket), bucket)
 
-        self.fs_files = _db[bucket + ".files"]  # the underlying collection GridFS uses
+        self.fs_files = instrument_collection(_db[bucket + ".files"])  # the underlying collection GridFS uses
 
     def close_connections(self):
         """
@@ -119,18 +130,58 @@ class MongoContentStore(ContentStore):
                 return None
 
     def export(self, location, output_directory):
-        content = self.find(location)
+        """
+        Write the asset at location under output_directory (in the subdirectory it was imported from,
+        if any), copying it from GridFS EXPORT_CHUNK_SIZE bytes at a time.
+        """
+        with self._open_grid_file(location) as grid_file:
+            import_path = getattr(grid_file, 'import_path', None)
+            if import_path is not None:
+                output_directory = output_directory + '/' + os.path.dirname(import_path)
 
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
+            if not os.path.exists(output_directory):
+                os.makedirs(output_directory)
 
-        if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
+            disk_fs = OSFS(output_directory)
 
-        disk_fs = OSFS(output_directory)
+            with disk_fs.open(grid_file.displayname, 'wb') as asset_file:
+                self._copy_in_chunks(grid_file, asset_file)
+
+    def export_to_tar(self, location, tar_file, static_dir):
+        """
+        Add the asset at location to the open tar_file under static_dir (in the subdirectory it was imported
+        from, if any), streaming it from GridFS EXPORT_CHUNK_SIZE bytes at a time.
+        """
+        with self._open_grid_file(location) as grid_file:
+            import_path = getattr(grid_file, 'import_path', None)
+            if import_path is not None:
+                static_dir = static_dir + '/' + os.path.dirname(import_path)
+
+            tar_info = tarfile.TarInfo(os.path.normpath(static_dir + '/' + grid_file.displayname))
+            tar_info.size = grid_file.length
+            tar_info.mtime = calendar.timegm(grid_file.uploadDate.utctimetuple())
+            # tarfile copies from the GridOut in fixed size blocks, so the asset is never fully in memory
+            tar_file.addfile(tar_info, grid_file)
+
+    def _open_grid_file(self, location):
+        """
+        Returns the GridOut for the asset at location. Raises NotFoundError if there isn't one.
+        """
+        content_id, __ = self.asset_db_key(location)
+        try:
+            return self.fs.get(content_id)
+        except NoFile:
+            raise NotFoundError(content_id)
 
-        with disk_fs.open(content.name, 'wb') as asset_file:
-            asset_file.write(content.data)
+    def _copy_in_chunks(self, grid_file, output_file):
+        """
+        Copies grid_file to output_file without holding more than one chunk in memory
+        """
+        while True:
+            chunk = grid_file.read(self.EXPORT_CHUNK_SIZE)
+            if not chunk:
+                break
+            output_file.write(chunk)
 
     def export_all_for_course(self, course_key, output_directory, assets_policy_file):
         """
@@ -156,13 +207,43 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
-            for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].name, {})[attr] = value
+            self._add_to_assets_policy(policy, asset)
 
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f)
 
+    def export_all_for_course_to_tar(self, course_key, tar_file, static_dir, assets_policy_path):
+        """
+        Like export_all_for_course, but streams the assets and the policy file into the open tar_file
+        rather than writing them to disk.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            tar_file: the tarfile.TarFile to add the assets to
+            static_dir: the archive directory under which to put all the asset files
+            assets_policy_path: the archive path of the policy file
+        """
+        policy = {}
+        assets, __ = self.get_all_content_for_course(course_key)
+
+        for asset in assets:
+            self.export_to_tar(asset['asset_key'], tar_file, static_dir)
+            self._add_to_assets_policy(policy, asset)
+
+        policy_json = json.dumps(policy)
+        tar_info = tarfile.TarInfo(assets_policy_path)
+        tar_info.size = len(policy_json)
+        tar_info.mtime = time.time()
+        tar_file.addfile(tar_info, StringIO(policy_json))
+
+    def _add_to_assets_policy(self, policy, asset):
+        """
+        Record the exportable attributes of the asset in the assets policy
+        """
+        for attr, value in asset.iteritems():
+            if attr not in self.NON_POLICY_ATTRS:
+                policy.setdefault(asset['asset_key'].name, {})[attr] = value
+
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
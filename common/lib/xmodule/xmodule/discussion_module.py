@@ -1,6 +1,6 @@
 from pkg_resources import resource_string
 
-from xmodule.x_module import XModule
+from xmodule.x_module import XModule, STUDENT_VIEW
 from xmodule.raw_module import RawDescriptor
 from xmodule.editing_module import MetadataOnlyEditingDescriptor
 from xblock.fields import String, Scope
@@ -48,6 +48,8 @@ class DiscussionModule(DiscussionFields, XModule):
         ]
     }
     js_module_name = "InlineDiscussion"
+    # the inline discussion is fetched by the client; its fragment only holds the discussion id
+    user_independent_views = (STUDENT_VIEW,)
 
     def get_html(self):
         context = {
@@ -6,6 +6,8 @@ import sys
 
 from collections import namedtuple
 
+import numpy
+
 log = logging.getLogger("edx.courseware")
 
 # This is a tuple for holding scores, either from problems or sections.
@@ -40,6 +42,55 @@ def aggregate_scores(scores, section_name="summary"):
     return all_total, graded_total
 
 
+# The scores of one section format in a ScoreMatrix: (students x sections) arrays of the earned and possible
+# points and the section names, and the number of the format's scores each student has (counts)
+FormatScores = namedtuple("FormatScores", "earned possible names counts")
+
+
+class ScoreMatrix(object):
+    """
+    The grade sheets (see CourseGrader) of many students, as arrays for a grader's grade_matrix to grade
+    them all in one pass. Row i holds the scores of the i-th grade sheet and, for each section format,
+    column j its j-th score in the format (if the sheet has that many: see FormatScores.counts).
+    """
+    def __init__(self, num_students, format_scores):
+        self.num_students = num_students
+        self.format_scores = format_scores
+
+    @classmethod
+    def from_grade_sheets(cls, grade_sheets):
+        """
+        Build the ScoreMatrix of the list of grade sheets
+        """
+        num_students = len(grade_sheets)
+        format_scores = {}
+        for section_format in set(section_format for grade_sheet in grade_sheets for section_format in grade_sheet):
+            counts = numpy.array([len(grade_sheet.get(section_format, [])) for grade_sheet in grade_sheets])
+            shape = (num_students, counts.max())
+            earned = numpy.zeros(shape)
+            possible = numpy.zeros(shape)
+            names = numpy.empty(shape, dtype=object)
+            for row, grade_sheet in enumerate(grade_sheets):
+                for column, score in enumerate(grade_sheet.get(section_format, [])):
+                    earned[row, column] = score.earned
+                    possible[row, column] = score.possible
+                    names[row, column] = score.section
+            format_scores[section_format] = FormatScores(earned, possible, names, counts)
+        return cls(num_students, format_scores)
+
+    def scores(self, section_format):
+        """
+        The FormatScores of section_format (with no columns if no student has scores in it)
+        """
+        if section_format not in self.format_scores:
+            shape = (self.num_students, 0)
+            return FormatScores(
+                numpy.zeros(shape), numpy.zeros(shape), numpy.empty(shape, dtype=object),
+                numpy.zeros(self.num_students, dtype=int)
+            )
+        return self.format_scores[section_format]
+
+
 def invalid_args(func, argdict):
     """
     Given a function and a dictionary of arguments, returns a set of arguments
@@ -154,6 +205,13 @@ class CourseGrader(object):
         '''Given a grade sheet, return a dict containing grading information'''
         raise NotImplementedError
 
+    def grade_matrix(self, score_matrix):
+        '''
+        Given a ScoreMatrix, return an array of the percent grade() gives each of its students.
+        The percents are computed in the same order of operations as grade()'s, so they are equal.
+        '''
+        raise NotImplementedError
+
 
 class WeightedSubsectionsGrader(CourseGrader):
     """
@@ -193,6 +251,12 @@ class WeightedSubsectionsGrader(CourseGrader):
                 'section_breakdown': section_breakdown,
                 'grade_breakdown': grade_breakdown}
 
+    def grade_matrix(self, score_matrix):
+        total_percent = numpy.zeros(score_matrix.num_students)
+        for subgrader, _category, weight in self.sections:
+            total_percent += subgrader.grade_matrix(score_matrix) * weight
+        return total_percent
+
 
 class SingleSectionGrader(CourseGrader):
     """
@@ -243,6 +307,18 @@ class SingleSectionGrader(CourseGrader):
                 #No grade_breakdown here
                 }
 
+    def grade_matrix(self, score_matrix):
+        earned, possible, names, counts = score_matrix.scores(self.type)
+        percent = numpy.zeros(score_matrix.num_students)
+        if names.shape[1] == 0:
+            return percent
+        # the first of each student's scores with the name
+        matches = (numpy.arange(names.shape[1]) < counts[:, numpy.newaxis]) & (names == self.name)
+        rows = numpy.nonzero(matches.any(axis=1))[0]
+        columns = matches.argmax(axis=1)[rows]
+        percent[rows] = earned[rows, columns] / possible[rows, columns]
+        return percent
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -382,3 +458,32 @@ class AssignmentFormatGrader(CourseGrader):
                 'section_breakdown': breakdown,
                 #No grade_breakdown here
                 }
+
+    def grade_matrix(self, score_matrix):
+        earned, possible, _names, counts = score_matrix.scores(self.type)
+        num_students, num_columns = earned.shape
+        # each student's breakdown: their scores, then 0% placeholders up to min_count. The columns beyond
+        # a student's breakdown are infinite so that they sort before the student's lowest percents.
+        has_score = numpy.arange(num_columns) < counts[:, numpy.newaxis]
+        has_placeholder = numpy.arange(self.min_count) < (self.min_count - counts)[:, numpy.newaxis]
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            percents = numpy.hstack([
+                numpy.where(has_score, earned / numpy.where(has_score, possible, 1.0), numpy.inf),
+                numpy.where(has_placeholder, 0.0, numpy.inf),
+            ])
+        kept = numpy.hstack([has_score, has_placeholder])
+        breakdown_lengths = numpy.maximum(self.min_count, counts)
+
+        if self.drop_count > 0:
+            # drop the lowest percents like total_with_drops: a stable sort on descending percents, so the
+            # later of equal percents are dropped first
+            order = numpy.argsort(-percents, axis=1, kind='mergesort')
+            dropped = order[:, max(percents.shape[1] - self.drop_count, 0):]
+            kept[numpy.arange(num_students)[:, numpy.newaxis], dropped] = False
+
+        # add the kept percents in the breakdown's order
+        total_percent = numpy.zeros(num_students)
+        for column in xrange(percents.shape[1]):
+            total_percent += numpy.where(kept[:, column], percents[:, column], 0.0)
+        denominators = breakdown_lengths - self.drop_count
+        return numpy.where(denominators > 0, total_percent / numpy.maximum(denominators, 1), total_percent)
@@ -11,7 +11,7 @@ from xblock.fields import Scope, String, Boolean, List
 from xmodule.editing_module import EditingDescriptor
 from xmodule.html_checker import check_html
 from xmodule.stringify import stringify_children
-from xmodule.x_module import XModule
+from xmodule.x_module import XModule, STUDENT_VIEW
 from xmodule.xml_module import XmlDescriptor, name_to_pathname
 import textwrap
 from xmodule.contentstore.content import StaticContent
@@ -71,6 +71,10 @@ class HtmlModule(HtmlFields, XModule):
             return self.data.replace("%%USER_ID%%", self.system.anonymous_student_id)
         return self.data
 
+    def is_user_independent_view(self, view_name):
+        # the %%USER_ID%% substitution makes the html specific to the student
+        return view_name == STUDENT_VIEW and "%%USER_ID%%" not in self.data
+
 
 class HtmlDescriptor(HtmlFields, XmlDescriptor, EditingDescriptor):
     """
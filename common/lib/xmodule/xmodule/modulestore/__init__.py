@@ -100,6 +100,74 @@ class PublishState(object):
     public = 'public'
 
 
+class CourseSummary(object):
+    """
+    The index-level information about a course which course listings need (e.g., Studio's course list
+    and the LMS catalog filtering), fetched without instantiating the course descriptor.
+    """
+    # the Scope.settings fields of the course root which summaries carry
+    SUMMARY_FIELDS = ('display_name', 'display_organization', 'display_coursenumber')
+
+    def __init__(self, course_key, display_name=None, display_organization=None, display_coursenumber=None,
+                 location=None):
+        self.id = course_key  # pylint: disable=invalid-name
+        self.location = location or course_key.make_usage_key('course', course_key.run)
+        self.display_name = display_name
+        self.display_organization = display_organization
+        self.display_coursenumber = display_coursenumber
+
+    @classmethod
+    def from_course(cls, course):
+        """
+        Returns the summary of an already loaded course descriptor
+        """
+        return cls(
+            course.id,
+            location=course.location,
+            **{field_name: getattr(course, field_name, None) for field_name in cls.SUMMARY_FIELDS}
+        )
+
+    @property
+    def org(self):
+        return self.id.org
+
+    @property
+    def number(self):
+        return self.id.course
+
+    @property
+    def display_org_with_default(self):
+        """
+        Return a display organization if it has been specified, otherwise return the 'org' that is in the location
+        """
+        return self.display_organization or self.org
+
+    @property
+    def display_number_with_default(self):
+        """
+        Return a display course number if it has been specified, otherwise return the 'course' that is in the location
+        """
+        return self.display_coursenumber or self.number
+
+    def sort_key(self):
+        """
+        The (org, course, run) order in which the stores return summaries
+        """
+        return (self.id.org, self.id.course, self.id.run)
+
+    def __eq__(self, other):
+        return isinstance(other, CourseSummary) and self.id == other.id
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return u'CourseSummary({!r})'.format(self.id)
+
+
 class ModuleStoreRead(object):
     """
     An abstract interface for a database backend that stores XModuleDescriptor
@@ -243,6 +311,26 @@ class ModuleStoreRead(object):
         '''
         pass
 
+    @abstractmethod
+    def get_course_summaries(self, org=None, offset=0, limit=None):
+        '''
+        Returns a list of :class:`CourseSummary` for the courses in this modulestore, ordered by
+        (org, course, run), without instantiating any course descriptors.
+
+        Args:
+            org (str): if given, only return the courses of this org
+            offset (int): the number of (matching) courses to skip
+            limit (int): if given, the maximum number of summaries to return
+        '''
+        pass
+
+    @abstractmethod
+    def get_course_summary(self, course_key):
+        '''
+        Returns the :class:`CourseSummary` of the given course, or None if not found.
+        '''
+        pass
+
     @abstractmethod
     def has_course(self, course_id, ignore_case=False):
         '''
@@ -492,6 +580,29 @@ class ModuleStoreReadBase(ModuleStoreRead):
                 return course
         return None
 
+    def get_course_summaries(self, org=None, offset=0, limit=None):
+        """
+        See ModuleStoreRead.get_course_summaries
+
+        Default impl--summarizes the loaded courses
+        """
+        summaries = [
+            CourseSummary.from_course(course) for course in self.get_courses()
+            if org is None or course.id.org == org
+        ]
+        return paginate_course_summaries(summaries, offset, limit)
+
+    def get_course_summary(self, course_key):
+        """
+        See ModuleStoreRead.get_course_summary
+
+        Default impl--summarizes the loaded course
+        """
+        course = self.get_course(course_key)
+        if course is None:
+            return None
+        return CourseSummary.from_course(course)
+
     def has_course(self, course_id, ignore_case=False):
         """
         Returns the course_id of the course if it was found, else None
@@ -627,6 +738,15 @@ class ModuleStoreWriteBase(ModuleStoreReadBase, ModuleStoreWrite):
         parent.children.append(item.location)
         self.update_item(parent, user_id)
 
+    def update_items(self, xblocks, user_id, allow_not_found=False):
+        """
+        Update the persisted repr of each of the given xblocks, which must all belong to the same course.
+        Stores which can batch their writes (e.g., during a bulk write operation) override this.
+
+        Returns the list of updated xblocks.
+        """
+        return [self.update_item(xblock, user_id, allow_not_found=allow_not_found) for xblock in xblocks]
+
     @contextmanager
     def bulk_write_operations(self, course_id):
         """
@@ -651,6 +771,16 @@ class ModuleStoreWriteBase(ModuleStoreReadBase, ModuleStoreWrite):
                 self._end_bulk_write_operation(course_id)
 
 
+def paginate_course_summaries(summaries, offset=0, limit=None):
+    """
+    Sorts summaries into (org, course, run) order and returns the requested page of them
+    """
+    summaries = sorted(summaries, key=lambda summary: summary.sort_key())
+    if limit is None:
+        return summaries[offset:]
+    return summaries[offset:offset + limit]
+
+
 def only_xmodules(identifier, entry_points):
     """Only use entry_points that are supplied by the xmodule package"""
     from_xmodule = [entry_point for entry_point in entry_points if entry_point.dist.key == 'xmodule']
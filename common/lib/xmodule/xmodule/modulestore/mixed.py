@@ -15,6 +15,7 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from . import ModuleStoreWriteBase
 from . import ModuleStoreEnum
+from . import paginate_course_summaries
 from .exceptions import ItemNotFoundError
 from .draft_and_published import ModuleStoreDraftAndPublished
 from .split_migrator import SplitMigrator
@@ -198,6 +199,32 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
 
         return courses.values()
 
+    def get_course_summaries(self, org=None, offset=0, limit=None):
+        """
+        Returns the CourseSummary of the courses in all the stores, ordered by (org, course, run).
+
+        Each store returns at most offset + limit summaries (filtered by org in the store) which are then
+        merged and paginated. A course which is mapped to a store is only listed from that store.
+        """
+        store_limit = None if limit is None else offset + limit
+        summaries = {}
+        for store in self.modulestores:
+            for summary in store.get_course_summaries(org=org, limit=store_limit):
+                course_id = self._clean_course_id_for_mapping(summary.id)
+                mapped_store = self.mappings.get(course_id)
+                if mapped_store is not None and mapped_store is not store:
+                    continue
+                summaries.setdefault(course_id, summary)
+        return paginate_course_summaries(summaries.values(), offset, limit)
+
+    def get_course_summary(self, course_key):
+        """
+        Returns the CourseSummary of the given course from the store which has it, or None
+        """
+        assert(isinstance(course_key, CourseKey))
+        store = self._get_modulestore_for_courseid(course_key)
+        return store.get_course_summary(course_key)
+
     def get_course(self, course_key, depth=0):
         """
         returns the course module associated with the course_id. If no such course exists,
@@ -361,6 +388,16 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(xblock.location.course_key, 'update_item')
         return store.update_item(xblock, user_id, allow_not_found)
 
+    def update_items(self, xblocks, user_id, allow_not_found=False):
+        """
+        Update the persisted versions of several xblocks of the same course at once.
+        """
+        xblocks = list(xblocks)
+        if not xblocks:
+            return xblocks
+        store = self._verify_modulestore_support(xblocks[0].location.course_key, 'update_items')
+        return store.update_items(xblocks, user_id, allow_not_found)
+
     def delete_item(self, location, user_id, **kwargs):
         """
         Delete the given item from persistence. kwargs allow modulestore specific parameters.
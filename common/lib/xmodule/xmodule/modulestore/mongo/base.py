@@ -34,11 +34,12 @@ from xblock.runtime import KvsFieldData
 from xblock.exceptions import InvalidScopeError
 from xblock.fields import Scope, ScopeIds, Reference, ReferenceList, ReferenceValueDict
 
-from xmodule.modulestore import ModuleStoreWriteBase, ModuleStoreEnum
+from xmodule.modulestore import ModuleStoreWriteBase, ModuleStoreEnum, CourseSummary
 from xmodule.modulestore.draft_and_published import ModuleStoreDraftAndPublished, DIRECT_ONLY_CATEGORIES
 from opaque_keys.edx.locations import Location
 from xmodule.modulestore.exceptions import ItemNotFoundError, InvalidLocationError, ReferentialIntegrityError
 from xmodule.modulestore.inheritance import own_metadata, InheritanceMixin, inherit_metadata, InheritanceKeyValueStore
+from xmodule.modulestore.mongo_instrumentation import instrument_collection
 from xblock.core import XBlock
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from opaque_keys.edx.keys import UsageKey, CourseKey
@@ -141,7 +142,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem):
     A system that has a cache of module json that it will use to load modules
     from, with a backup of calling to the underlying modulestore for more data
     """
-    def __init__(self, modulestore, course_key, module_data, default_class, cached_metadata, **kwargs):
+    def __init__(self, modulestore, course_key, module_data, default_class, cached_metadata,
+                 cache_descriptors=False, **kwargs):
         """
         modulestore: the module store that can be used to retrieve additional modules
 
@@ -155,6 +157,10 @@ class CachingDescriptorSystem(MakoDescriptorSystem):
 
         cached_metadata: the cache for handling inheritance computation. internal use only
 
+        cache_descriptors: whether load_item should return the same descriptor instance each time
+            it's asked for a location. Only safe while nothing writes to the course (see
+            MongoModuleStore._load_item)
+
         resources_fs: a filesystem, as per MakoDescriptorSystem
 
         error_tracker: a function that logs errors for later display to users
@@ -175,12 +181,25 @@ class CachingDescriptorSystem(MakoDescriptorSystem):
         # define an attribute here as well, even though it's None
         self.course_id = course_key
         self.cached_metadata = cached_metadata
+        self.descriptor_cache = {} if cache_descriptors else None
 
     def load_item(self, location):
         """
         Return an XModule instance for the specified location
         """
         assert isinstance(location, UsageKey)
+        if self.descriptor_cache is not None:
+            module = self.descriptor_cache.get(location)
+            if module is None:
+                module = self._load_item(location)
+                self.descriptor_cache[location] = module
+            return module
+        return self._load_item(location)
+
+    def _load_item(self, location):
+        """
+        Construct the XModule instance for the specified location from module_data (or the modulestore)
+        """
         json_data = self.module_data.get(location)
         if json_data is None:
             module = self.modulestore.get_item(location)
@@ -343,6 +362,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
     """
     reference_type = SlashSeparatedCourseKey
 
+    # the maximum number of new documents update_items inserts in a single round-trip
+    BULK_INSERT_BATCH_SIZE = 500
+
     # TODO (cpennington): Enable non-filesystem filestores
     # pylint: disable=C0103
     # pylint: disable=W0201
@@ -373,7 +395,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
                 ),
                 db
             )
-            self.collection = self.database[collection]
+            self.collection = instrument_collection(self.database[collection])
 
             if user is not None and password is not None:
                 self.database.authenticate(user, password)
@@ -589,6 +611,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         a runtime may mean that some objects report old values for inherited data.
         """
         course_id = course_id.for_branch(None)
+        self._discard_request_runtimes(course_id)
         if not self._is_bulk_write_in_progress(course_id):
             # below is done for side effects when runtime is None
             cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
@@ -652,10 +675,36 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
     def _load_item(self, course_key, item, data_cache, apply_cached_metadata=True):
         """
         Load an XModuleDescriptor from item, using the children stored in data_cache
+
+        While a request is in progress, all the items loaded for a course share one runtime (and so one
+        resources filesystem and one copy of the inheritance tree), which also hands back the same
+        descriptor for a location each time it's loaded. Any write to the course discards the shared runtime.
         """
         course_key = self.fill_in_run(course_key)
         location = Location._from_deprecated_son(item['location'], course_key.run)
         data_dir = getattr(item, 'data_dir', location.course)
+
+        request_runtimes = self._get_request_runtimes(course_key)
+        if request_runtimes is None:
+            system = self._create_runtime(course_key, data_dir, data_cache, apply_cached_metadata)
+        else:
+            runtime_key = (course_key, data_dir, apply_cached_metadata)
+            system = request_runtimes.get(runtime_key)
+            if system is None:
+                system = self._create_runtime(
+                    course_key, data_dir, data_cache, apply_cached_metadata, cache_descriptors=True
+                )
+                request_runtimes[runtime_key] = system
+            elif system.module_data is not data_cache:
+                # add any json for newly prefetched children (and leave the json of already loaded ones alone)
+                for child_location, child_data in data_cache.iteritems():
+                    system.module_data.setdefault(child_location, child_data)
+        return system.load_item(location)
+
+    def _create_runtime(self, course_key, data_dir, data_cache, apply_cached_metadata, cache_descriptors=False):
+        """
+        Create the CachingDescriptorSystem for loading items of the given course from data_cache
+        """
         root = self.fs_root / data_dir
 
         root.makedirs_p()  # create directory if it doesn't exist
@@ -670,7 +719,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         if self.i18n_service:
             services["i18n"] = self.i18n_service
 
-        system = CachingDescriptorSystem(
+        return CachingDescriptorSystem(
             modulestore=self,
             course_key=course_key,
             module_data=data_cache,
@@ -679,11 +728,35 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
             error_tracker=self.error_tracker,
             render_template=self.render_template,
             cached_metadata=cached_metadata,
+            cache_descriptors=cache_descriptors,
             mixins=self.xblock_mixins,
             select=self.xblock_select,
             services=services,
         )
-        return system.load_item(location)
+
+    def _get_request_runtimes(self, course_key):
+        """
+        Returns the dict of (course_key, data_dir, apply_cached_metadata) -> runtime shared within the
+        current request, or None if runtimes can't be shared for course_key right now: outside of a request,
+        nothing would ever discard them, and during a bulk write they would go stale.
+        """
+        if self.request_cache is None or not getattr(self.request_cache, 'in_request', False):
+            return None
+        if self._is_bulk_write_in_progress(course_key):
+            return None
+        return self.request_cache.data.setdefault('mongo_runtimes', {}).setdefault(self, {})
+
+    def _discard_request_runtimes(self, course_key):
+        """
+        Drop the runtimes (and so the descriptors) shared within the current request for course_key's course
+        """
+        if self.request_cache is None:
+            return
+        request_runtimes = getattr(self.request_cache, 'data', {}).get('mongo_runtimes', {}).get(self)
+        if request_runtimes:
+            for runtime_key in request_runtimes.keys():
+                if runtime_key[0].org == course_key.org and runtime_key[0].course == course_key.course:
+                    del request_runtimes[runtime_key]
 
     def _load_items(self, course_key, items, depth=0):
         """
@@ -726,6 +799,62 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         )
         return [course for course in base_list if not isinstance(course, ErrorDescriptor)]
 
+    def get_course_summaries(self, org=None, offset=0, limit=None):
+        """
+        Returns the CourseSummary of each course, filtered by org and paginated by the database.
+        Only the course's _id and its display metadata are fetched.
+        """
+        query = SON([('_id.category', 'course')])
+        if org is not None:
+            query['_id.org'] = org
+        # TODO kill this (see get_courses)
+        query['$nor'] = [{'_id.org': 'edx', '_id.course': 'templates'}]
+
+        cursor = self.collection.find(
+            query,
+            self._course_summary_fields(),
+            sort=[('_id.org', pymongo.ASCENDING), ('_id.course', pymongo.ASCENDING), ('_id.name', pymongo.ASCENDING)],
+        ).skip(offset)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return [self._course_summary_from_item(course) for course in cursor]
+
+    def get_course_summary(self, course_key):
+        """
+        Returns the CourseSummary of the given course, or None if it doesn't exist
+        """
+        assert(isinstance(course_key, CourseKey))
+        course_key = self.fill_in_run(course_key)
+        course = self.collection.find_one(
+            {'_id': course_key.make_usage_key('course', course_key.run).to_deprecated_son()},
+            self._course_summary_fields()
+        )
+        if course is None:
+            return None
+        return self._course_summary_from_item(course)
+
+    @staticmethod
+    def _course_summary_fields():
+        """
+        The projection which fetches only what a CourseSummary needs
+        """
+        fields = {'_id': True}
+        for field_name in CourseSummary.SUMMARY_FIELDS:
+            fields['metadata.{}'.format(field_name)] = True
+        return fields
+
+    @staticmethod
+    def _course_summary_from_item(course):
+        """
+        Builds a CourseSummary from a course document fetched with _course_summary_fields
+        """
+        course_key = SlashSeparatedCourseKey(course['_id']['org'], course['_id']['course'], course['_id']['name'])
+        metadata = course.get('metadata', {})
+        return CourseSummary(
+            course_key,
+            **{field_name: metadata.get(field_name) for field_name in CourseSummary.SUMMARY_FIELDS}
+        )
+
     def _find_one(self, location):
         '''Look for a given location in the collection. If the item is not present, raise
         ItemNotFoundError.
@@ -1050,6 +1179,8 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         if the location doesn't exist
         """
 
+        self._discard_request_runtimes(location.course_key)
+
         # See http://www.mongodb.org/display/DOCS/Updating for
         # atomic update syntax
         result = self.collection.update(
@@ -1088,27 +1219,8 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
           therefore propagate subtree edit info up the tree
         """
         try:
-            definition_data = self._convert_reference_fields_to_strings(
-                xblock,
-                xblock.get_explicitly_set_fields_by_scope()
-            )
             now = datetime.now(UTC)
-            payload = {
-                'definition.data': definition_data,
-                'metadata': self._convert_reference_fields_to_strings(xblock, own_metadata(xblock)),
-                'edit_info.edited_on': now,
-                'edit_info.edited_by': user_id,
-                'edit_info.subtree_edited_on': now,
-                'edit_info.subtree_edited_by': user_id,
-            }
-
-            if isPublish:
-                payload['edit_info.published_date'] = now
-                payload['edit_info.published_by'] = user_id
-
-            if xblock.has_children:
-                children = self._convert_reference_fields_to_strings(xblock, {'children': xblock.children})
-                payload.update({'definition.children': children['children']})
+            payload = self._get_update_payload(xblock, user_id, now, isPublish=isPublish)
             self._update_single_item(xblock.scope_ids.usage_id, payload)
 
             # update subtree edited info for ancestors
@@ -1123,18 +1235,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
                 }
                 self._update_ancestors(xblock.scope_ids.usage_id, ancestor_payload)
 
-            # update the edit info of the instantiated xblock
-            xblock.edited_on = now
-            xblock.edited_by = user_id
-            xblock.subtree_edited_on = now
-            xblock.subtree_edited_by = user_id
-            if not hasattr(xblock, 'published_date'):
-                xblock.published_date = None
-            if not hasattr(xblock, 'published_by'):
-                xblock.published_by = None
-            if isPublish:
-                xblock.published_date = now
-                xblock.published_by = user_id
+            self._update_edit_info_on_xblock(xblock, user_id, now, isPublish=isPublish)
 
             # recompute (and update) the metadata inheritance tree which is cached
             self.refresh_cached_metadata_inheritance_tree(xblock.scope_ids.usage_id.course_key, xblock.runtime)
@@ -1145,9 +1246,121 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
             elif not self.has_course(xblock.location.course_key):
                 raise ItemNotFoundError(xblock.location.course_key)
 
-
         return xblock
 
+    def update_items(self, xblocks, user_id, allow_not_found=False):
+        """
+        Persist several xblocks of one course, batching the writes.
+
+        Outside of a bulk write operation this just calls update_item for each xblock. Inside of one
+        (e.g., during course import) the ancestors' subtree edit info and the inheritance cache are
+        not maintained per write anyway, so the items which do not exist yet are written with
+        batched inserts of BULK_INSERT_BATCH_SIZE documents and only the existing ones are updated
+        one by one. The inheritance cache is refreshed once when the bulk operation ends.
+        """
+        xblocks = list(xblocks)
+        if not xblocks:
+            return xblocks
+        if not self._is_bulk_write_in_progress(xblocks[0].location.course_key):
+            return super(MongoModuleStore, self).update_items(xblocks, user_id, allow_not_found)
+
+        now = datetime.now(UTC)
+        existing_ids = self._find_existing_ids(xblock.scope_ids.usage_id for xblock in xblocks)
+
+        new_documents = []
+        for xblock in xblocks:
+            usage_id = xblock.scope_ids.usage_id
+            payload = self._get_update_payload(xblock, user_id, now)
+            if self._id_key(usage_id.to_deprecated_son()) in existing_ids:
+                self._update_single_item(usage_id, payload)
+            elif not allow_not_found:
+                raise ItemNotFoundError(usage_id)
+            else:
+                new_documents.append(self._payload_to_document(usage_id, payload))
+            self._update_edit_info_on_xblock(xblock, user_id, now)
+
+        if new_documents:
+            self._discard_request_runtimes(xblocks[0].location.course_key)
+        for start in xrange(0, len(new_documents), self.BULK_INSERT_BATCH_SIZE):
+            self.collection.insert(
+                new_documents[start:start + self.BULK_INSERT_BATCH_SIZE],
+                # Must include this to avoid the django debug toolbar (which defines the deprecated "safe=False")
+                # from overriding our default value set in the init method.
+                safe=self.collection.safe
+            )
+        return xblocks
+
+    def _get_update_payload(self, xblock, user_id, now, isPublish=False):
+        """
+        Returns the '$set' payload which persists the current field values of xblock
+        """
+        definition_data = self._convert_reference_fields_to_strings(
+            xblock,
+            xblock.get_explicitly_set_fields_by_scope()
+        )
+        payload = {
+            'definition.data': definition_data,
+            'metadata': self._convert_reference_fields_to_strings(xblock, own_metadata(xblock)),
+            'edit_info.edited_on': now,
+            'edit_info.edited_by': user_id,
+            'edit_info.subtree_edited_on': now,
+            'edit_info.subtree_edited_by': user_id,
+        }
+
+        if isPublish:
+            payload['edit_info.published_date'] = now
+            payload['edit_info.published_by'] = user_id
+
+        if xblock.has_children:
+            children = self._convert_reference_fields_to_strings(xblock, {'children': xblock.children})
+            payload.update({'definition.children': children['children']})
+        return payload
+
+    @staticmethod
+    def _update_edit_info_on_xblock(xblock, user_id, now, isPublish=False):
+        """
+        Update the edit info of the instantiated xblock to match what was persisted
+        """
+        xblock.edited_on = now
+        xblock.edited_by = user_id
+        xblock.subtree_edited_on = now
+        xblock.subtree_edited_by = user_id
+        if not hasattr(xblock, 'published_date'):
+            xblock.published_date = None
+        if not hasattr(xblock, 'published_by'):
+            xblock.published_by = None
+        if isPublish:
+            xblock.published_date = now
+            xblock.published_by = user_id
+
+    @staticmethod
+    def _id_key(id_dict):
+        """
+        Returns a hashable version of a deprecated son _id, independent of the key order
+        """
+        return tuple(id_dict.get(key) for key in ('tag', 'org', 'course', 'category', 'name', 'revision'))
+
+    def _find_existing_ids(self, usage_keys):
+        """
+        Returns the set of `_id_key`s of the given usage keys which are already persisted, using one query
+        """
+        query = {'_id': {'$in': [usage_key.to_deprecated_son() for usage_key in usage_keys]}}
+        return set(self._id_key(item['_id']) for item in self.collection.find(query, {'_id': True}))
+
+    @staticmethod
+    def _payload_to_document(usage_key, payload):
+        """
+        Expands a dotted '$set' payload into the full document an upsert of it would create
+        """
+        document = {'_id': usage_key.to_deprecated_son()}
+        for dotted_key, value in payload.iteritems():
+            path_elements = dotted_key.split('.')
+            target = document
+            for element in path_elements[:-1]:
+                target = target.setdefault(element, {})
+            target[path_elements[-1]] = value
+        return document
+
     def _convert_reference_fields_to_strings(self, xblock, jsonfields):
         """
         Find all fields of type reference and convert the payload from UsageKeys to deprecated strings
@@ -32,7 +32,9 @@ def wrap_draft(item):
     Sets `item.is_draft` to `True` if the item is DRAFT, and `False` otherwise.
     Sets the item's location to the non-draft location in either case.
     """
-    setattr(item, 'is_draft', item.location.revision == MongoRevisionKey.draft)
+    # items shared within a request may already have been wrapped, so don't lose their draft status
+    if not getattr(item, 'is_draft', False):
+        setattr(item, 'is_draft', item.location.revision == MongoRevisionKey.draft)
     item.location = item.location.replace(revision=MongoRevisionKey.published)
     return item
 
@@ -153,6 +155,7 @@ class DraftModuleStore(MongoModuleStore):
 
         # delete all of the db records for the course
         course_query = self._course_key_to_son(course_key)
+        self._discard_request_runtimes(course_key)
         self.collection.remove(course_query, multi=True)
 
     def clone_course(self, source_course_id, dest_course_id, user_id, fields=None):
@@ -423,6 +426,7 @@ class DraftModuleStore(MongoModuleStore):
             # ensure keys are in fixed and right order before inserting
             item['_id'] = self._id_dict_to_son(item['_id'])
             try:
+                self._discard_request_runtimes(location.course_key)
                 self.collection.insert(item)
             except pymongo.errors.DuplicateKeyError:
                 # prevent re-creation of DRAFT versions, unless explicitly requested to ignore
@@ -467,6 +471,45 @@ class DraftModuleStore(MongoModuleStore):
         super(DraftModuleStore, self).update_item(xblock, user_id, allow_not_found, isPublish=isPublish)
         return wrap_draft(xblock)
 
+    def update_items(self, xblocks, user_id, allow_not_found=False):
+        """
+        See superclass doc.
+        Like update_item, writes the DRAFT version of each xblock which isn't direct-only. Only xblocks
+        which have a published but no draft version need converting to draft first; those go through
+        update_item, while all the others are handed to the superclass's batched write.
+        """
+        self._verify_branch_setting(ModuleStoreEnum.Branch.draft_preferred)
+        xblocks = list(xblocks)
+        if not xblocks or not self._is_bulk_write_in_progress(xblocks[0].location.course_key):
+            return [self.update_item(xblock, user_id, allow_not_found) for xblock in xblocks]
+
+        existing_ids = self._find_existing_ids(
+            location
+            for xblock in xblocks
+            for location in (as_published(xblock.location), as_draft(xblock.location))
+        )
+
+        batch = []
+        for xblock in xblocks:
+            if xblock.location.category in DIRECT_ONLY_CATEGORIES:
+                batch.append(xblock)
+                continue
+            draft_loc = as_draft(xblock.location)
+            published_loc = as_published(xblock.location)
+            if (
+                self._id_key(draft_loc.to_deprecated_son()) not in existing_ids and
+                self._id_key(published_loc.to_deprecated_son()) in existing_ids
+            ):
+                self.update_item(xblock, user_id, allow_not_found)
+            else:
+                xblock.location = draft_loc
+                batch.append(xblock)
+
+        super(DraftModuleStore, self).update_items(batch, user_id, allow_not_found)
+        for xblock in batch:
+            wrap_draft(xblock)
+        return xblocks
+
     def delete_item(self, location, user_id, revision=None, **kwargs):
         """
         Delete an item from this modulestore.
@@ -597,6 +640,7 @@ class DraftModuleStore(MongoModuleStore):
                 _internal(next_tier)
 
         _internal([root_usage.to_deprecated_son() for root_usage in root_usages])
+        self._discard_request_runtimes(root_usages[0].course_key)
         self.collection.remove({'_id': {'$in': to_be_deleted}}, safe=self.collection.safe)
 
     def has_changes(self, location):
@@ -693,6 +737,7 @@ class DraftModuleStore(MongoModuleStore):
 
         _internal_depth_first(location, True)
         if len(to_be_deleted) > 0:
+            self._discard_request_runtimes(location.course_key)
             self.collection.remove({'_id': {'$in': to_be_deleted}})
         return self.get_item(as_published(location))
 
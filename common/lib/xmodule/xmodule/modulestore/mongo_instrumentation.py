@@ -0,0 +1,294 @@
+"""
+Instrumentation of the pymongo collections (and GridFS) used by the mongo modulestores and contentstore.
+
+The stores make their collections InstrumentedCollections with `instrument_collection`. While a thread is recording
+(see `start_recording`, which the monitoring middleware calls for each request when the RECORD_MODULESTORE_QUERIES
+feature is enabled), every operation on them is counted in the thread's `QueryStats`, with the documents and bytes it
+returned and its time, keyed by the store method which made it. The bytes are the BSON size of the returned documents,
+which are encoded again to measure it, outside of the operation's time. When no thread is recording, the operations
+aren't measured.
+"""
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from bson import BSON
+from pymongo.collection import Collection
+from pymongo.cursor import Cursor
+
+# the GridFS operations counted
+GRIDFS_OPERATIONS = ('get', 'put', 'delete', 'exists')
+
+# the modules whose frames aren't the "calling modulestore method" of an operation
+_SKIPPED_MODULES = ('pymongo', 'bson', 'gridfs', __name__, 'xmodule.modulestore.split_mongo.mongo_connection')
+
+_recording = threading.local()
+
+
+class OperationStats(object):
+    """
+    The totals of some operations
+    """
+    def __init__(self):
+        self.calls = 0
+        self.documents = 0
+        self.bytes = 0
+        self.time = 0.0
+
+    def add(self, other):
+        """
+        Add other's totals to these
+        """
+        self.calls += other.calls
+        self.documents += other.documents
+        self.bytes += other.bytes
+        self.time += other.time
+
+
+class QueryStats(object):
+    """
+    The operations made while recording, by (calling method, collection, operation)
+    """
+    def __init__(self):
+        self.operations = defaultdict(OperationStats)
+
+    def record(self, caller, collection, operation, calls=0, documents=0, size=0, duration=0.0):
+        """
+        Count an operation, or (with calls=0) more of an operation's results
+        """
+        stats = self.operations[(caller, collection, operation)]
+        stats.calls += calls
+        stats.documents += documents
+        stats.bytes += size
+        stats.time += duration
+
+    def totals(self):
+        """
+        Returns the OperationStats of all the operations
+        """
+        totals = OperationStats()
+        for stats in self.operations.itervalues():
+            totals.add(stats)
+        return totals
+
+    def breakdown(self):
+        """
+        Returns the ((caller, collection, operation), OperationStats) pairs, the slowest first
+        """
+        return sorted(self.operations.iteritems(), key=lambda item: item[1].time, reverse=True)
+
+
+def start_recording():
+    """
+    Record this thread's operations in a new QueryStats, and return it
+    """
+    _recording.stats = QueryStats()
+    return _recording.stats
+
+
+def stop_recording():
+    """
+    Stop recording this thread's operations. Returns the QueryStats recorded, if any.
+    """
+    stats = getattr(_recording, 'stats', None)
+    _recording.stats = None
+    return stats
+
+
+def current_stats():
+    """
+    The QueryStats this thread is recording into, or None
+    """
+    return getattr(_recording, 'stats', None)
+
+
+def _caller():
+    """
+    The name of the store method (or function) which made the current operation
+    """
+    frame = sys._getframe(2)  # pylint: disable=protected-access
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith(_SKIPPED_MODULES):
+            instance = frame.f_locals.get('self')
+            if instance is None:
+                return frame.f_code.co_name
+            return '{}.{}'.format(type(instance).__name__, frame.f_code.co_name)
+        frame = frame.f_back
+    return 'unknown'
+
+
+def _bson_size(document):
+    """
+    The size of the document as returned by mongod
+    """
+    return len(BSON.encode(document)) if document else 0
+
+
+def _returned_documents(operation, result):
+    """
+    Returns the number of documents the operation returned, and their size
+    """
+    if operation == 'aggregate' and isinstance(result, dict):
+        documents = result.get('result', [])
+        return len(documents), sum(_bson_size(document) for document in documents)
+    if operation == 'find_and_modify' and result is not None:
+        return 1, _bson_size(result)
+    return 0, 0
+
+
+def instrument_collection(collection):
+    """
+    Returns the collection as an InstrumentedCollection
+    """
+    return InstrumentedCollection(collection.database, collection.name)
+
+
+def _recorded(operation):
+    """
+    Returns a Collection method performing the operation, recording it while the thread is recording
+    """
+    method = getattr(Collection, operation)
+
+    def recorded(self, *args, **kwargs):
+        """ Perform the operation, recording it """
+        stats = current_stats()
+        if stats is None:
+            return method(self, *args, **kwargs)
+        start = time.time()
+        result = method(self, *args, **kwargs)
+        duration = time.time() - start
+        documents, size = _returned_documents(operation, result)
+        stats.record(_caller(), self.name, operation, 1, documents, size, duration)
+        return result
+    recorded.__name__ = operation
+    recorded.__doc__ = method.__doc__
+    return recorded
+
+
+class InstrumentedCollection(Collection):
+    """
+    A pymongo Collection recording its operations while the thread is recording.
+
+    find_one, count and save are made of the other operations (find, insert and update), and recorded as those.
+    """
+    def find(self, *args, **kwargs):
+        """
+        find, returning a cursor which records the documents it fetches
+        """
+        cursor = super(InstrumentedCollection, self).find(*args, **kwargs)
+        stats = current_stats()
+        if stats is None:
+            return cursor
+        return InstrumentedCursor(cursor, stats, _caller(), self.name)
+
+    find_and_modify = _recorded('find_and_modify')
+    aggregate = _recorded('aggregate')
+    distinct = _recorded('distinct')
+    insert = _recorded('insert')
+    update = _recorded('update')
+    remove = _recorded('remove')
+
+
+class InstrumentedCursor(object):
+    """
+    Wraps a pymongo Cursor, recording the documents it returns and the time spent fetching them in its find.
+
+    Like the cursor, which only queries when the first document is fetched, the find is only counted then: a
+    cursor which is only counted (with count()) makes a count command, not a find.
+    """
+    def __init__(self, cursor, stats, caller, collection_name):
+        self._cursor = cursor
+        self._stats = stats
+        self._caller = caller
+        self._collection_name = collection_name
+        self._queried = False
+
+    def __iter__(self):
+        return self
+
+    def _record_fetch(self, documents, size, duration):
+        """
+        Record fetching documents, and the find itself when it's the first fetch
+        """
+        self._stats.record(
+            self._caller, self._collection_name, 'find', calls=0 if self._queried else 1, documents=documents,
+            size=size, duration=duration
+        )
+        self._queried = True
+
+    def next(self):
+        """
+        Fetch the next document
+        """
+        start = time.time()
+        try:
+            document = self._cursor.next()
+        except StopIteration:
+            self._record_fetch(0, 0, time.time() - start)
+            raise
+        duration = time.time() - start
+        self._record_fetch(1, _bson_size(document), duration)
+        return document
+
+    def __getitem__(self, index):
+        start = time.time()
+        result = self._cursor[index]
+        if isinstance(result, Cursor):
+            # a slice
+            return InstrumentedCursor(result, self._stats, self._caller, self._collection_name)
+        # a separate find of the single document
+        duration = time.time() - start
+        self._stats.record(
+            self._caller, self._collection_name, 'find', calls=1, documents=1, size=_bson_size(result),
+            duration=duration
+        )
+        return result
+
+    def count(self, *args, **kwargs):
+        """
+        Count the matching documents (a separate command)
+        """
+        start = time.time()
+        result = self._cursor.count(*args, **kwargs)
+        self._stats.record(self._caller, self._collection_name, 'count', calls=1, duration=time.time() - start)
+        return result
+
+    def __getattr__(self, name):
+        attr = getattr(self._cursor, name)
+        if not callable(attr):
+            return attr
+
+        def chained(*args, **kwargs):
+            """ Keep the cursor modifiers (sort, limit, ...) chaining on the wrapper """
+            result = attr(*args, **kwargs)
+            return self if result is self._cursor else result
+        return chained
+
+
+class InstrumentedGridFS(object):
+    """
+    Wraps a GridFS, recording its operations (as operations on its bucket) while the thread is recording
+    """
+    def __init__(self, fs, bucket):
+        self._fs = fs
+        self._bucket = bucket
+
+    def __getattr__(self, name):
+        attr = getattr(self._fs, name)
+        if name not in GRIDFS_OPERATIONS:
+            return attr
+
+        def call(*args, **kwargs):
+            """ Call the operation, recording it """
+            stats = current_stats()
+            if stats is None:
+                return attr(*args, **kwargs)
+            start = time.time()
+            result = attr(*args, **kwargs)
+            duration = time.time() - start
+            documents, size = (1, result.length) if name == 'get' else (0, 0)
+            stats.record(_caller(), self._bucket, name, 1, documents, size, duration)
+            return result
+        return call
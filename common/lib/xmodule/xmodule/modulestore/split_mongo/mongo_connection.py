@@ -1,10 +1,43 @@
 """
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
+
+Structures are stored as deltas: a structure derived from a previous version stores only the blocks which differ
+from (and the ids of the blocks deleted since) a base version, which is always stored whole (a snapshot). When
+the delta would exceed DELTA_FRACTION of the structure's blocks, the structure is stored whole and becomes the
+base of its successors. The reads reassemble the structures transparently from the snapshots.
+
+update_structure can overwrite a snapshot, so every write of a whole structure gives it a new snapshot_revision,
+and deltas name the revision of their base. The snapshots' blocks are cached by (version guid, revision), which
+never changes content, so connections in other processes never use overwritten blocks.
 """
 import re
+import threading
+from collections import OrderedDict
+
 import pymongo
-from bson import son
+from bson import BSON, son
+from bson.objectid import ObjectId
 from xmodule.exceptions import HeartbeatFailure
+from xmodule.modulestore.mongo_instrumentation import instrument_collection
+
+# a structure whose changed and deleted blocks exceed this fraction of its blocks is stored whole
+DELTA_FRACTION = 0.25
+# the number of snapshots' blocks each connection caches
+SNAPSHOT_CACHE_SIZE = 10
+
+
+class MissingSnapshotError(Exception):
+    """
+    A structure is stored as a delta against a snapshot which no longer exists (at the revision it was computed
+    against), so it can't be reassembled
+    """
+    def __init__(self, version_guid, base_version, base_revision):
+        super(MissingSnapshotError, self).__init__(
+            u"Structure {} is a delta against revision {} of structure {}, which is not stored".format(
+                version_guid, base_revision, base_version
+            )
+        )
+
 
 class MongoConnection(object):
     """
@@ -30,9 +63,9 @@ class MongoConnection(object):
         if user is not None and password is not None:
             self.database.authenticate(user, password)
 
-        self.course_index = self.database[collection + '.active_versions']
-        self.structures = self.database[collection + '.structures']
-        self.definitions = self.database[collection + '.definitions']
+        self.course_index = instrument_collection(self.database[collection + '.active_versions'])
+        self.structures = instrument_collection(self.database[collection + '.structures'])
+        self.definitions = instrument_collection(self.database[collection + '.definitions'])
 
         # every app has write access to the db (v having a flag to indicate r/o v write)
         # Force mongo to report errors, at the expense of performance
@@ -42,6 +75,11 @@ class MongoConnection(object):
         self.structures.write_concern = {'w': 1}
         self.definitions.write_concern = {'w': 1}
 
+        # the BSON of the snapshots' blocks by (version guid, snapshot revision), the most recently used last
+        self._snapshots = OrderedDict()
+        self._snapshots_lock = threading.Lock()
+        self.structures.ensure_index('base_version', sparse=True)
+
     def heartbeat(self):
         """
         Check that the db is reachable.
@@ -55,26 +93,148 @@ class MongoConnection(object):
         """
         Get the structure from the persistence mechanism whose id is the given key
         """
-        return self.structures.find_one({'_id': key})
+        return self._assemble_structure(self.structures.find_one({'_id': key}))
 
-    def find_matching_structures(self, query):
+    def find_matching_structures(self, query, fields=None):
         """
-        Find the structure matching the query. Right now the query must be a legal mongo query
+        Find the structure matching the query. Right now the query must be a legal mongo query. Note, queries
+        on the blocks only match the structures which changed (or are snapshots of) the queried blocks.
         :param query: a mongo-style query of {key: [value|{$in ..}|..], ..}
+        :param fields: if given, the projection of the structures to return. Projections of the blocks return
+        the whole reassembled structures.
         """
-        return self.structures.find(query)
+        if fields is None:
+            return (self._assemble_structure(structure) for structure in self.structures.find(query))
+
+        projects_blocks = any(field.split('.')[0] == 'blocks' for field in fields)
+        return (
+            self._assemble_projection(structure, projects_blocks)
+            for structure in self.structures.find(query, list(fields) + ['base_version'])
+        )
 
     def insert_structure(self, structure):
         """
         Create the structure in the db
         """
-        self.structures.insert(structure)
+        self.structures.insert(self._stored_structure(structure))
 
     def update_structure(self, structure):
         """
         Update the db record for structure
         """
-        self.structures.update({'_id': structure['_id']}, structure)
+        # the structures stored as deltas against this one can't use it as their base anymore
+        for dependent in self.structures.find({'base_version': structure['_id']}):
+            dependent = self._assemble_structure(dependent)
+            self.structures.update({'_id': dependent['_id']}, self._whole_structure(dependent))
+        with self._snapshots_lock:
+            for key in [key for key in self._snapshots if key[0] == structure['_id']]:
+                del self._snapshots[key]
+        self.structures.update({'_id': structure['_id']}, self._stored_structure(structure))
+
+    @staticmethod
+    def _whole_structure(structure):
+        """
+        Returns the document storing structure whole, as a new revision of the snapshot of its version
+        """
+        stored = structure.copy()
+        stored['snapshot_revision'] = ObjectId()
+        return stored
+
+    def _stored_structure(self, structure):
+        """
+        Returns the document storing structure: a delta against the base of its previous version, or itself
+        """
+        previous_version = structure.get('previous_version')
+        if previous_version is None:
+            return self._whole_structure(structure)
+        previous = self.structures.find_one(
+            {'_id': previous_version}, ['base_version', 'base_revision', 'snapshot_revision']
+        )
+        if previous is None:
+            return self._whole_structure(structure)
+        if 'base_version' in previous:
+            base_version, base_revision = previous['base_version'], previous.get('base_revision')
+            # only compute the delta against the current revision of the base
+            base = self.structures.find_one({'_id': base_version}, ['base_version', 'snapshot_revision'])
+            if base is None or 'base_version' in base or base.get('snapshot_revision') != base_revision:
+                return self._whole_structure(structure)
+        else:
+            base_version, base_revision = previous_version, previous.get('snapshot_revision')
+        base_blocks = self._snapshot_blocks(base_version, base_revision)
+        if base_blocks is None:
+            return self._whole_structure(structure)
+
+        blocks = structure['blocks']
+        changed_blocks = son.SON(
+            (block_id, block) for block_id, block in blocks.iteritems() if base_blocks.get(block_id) != block
+        )
+        deleted_blocks = [block_id for block_id in base_blocks if block_id not in blocks]
+        if len(changed_blocks) + len(deleted_blocks) > DELTA_FRACTION * len(blocks):
+            return self._whole_structure(structure)
+
+        delta = structure.copy()
+        delta['blocks'] = changed_blocks
+        delta['deleted_blocks'] = deleted_blocks
+        delta['base_version'] = base_version
+        delta['base_revision'] = base_revision
+        delta.pop('snapshot_revision', None)
+        return delta
+
+    def _snapshot_blocks(self, version_guid, revision):
+        """
+        Returns a copy of the blocks of the given revision of the snapshot whose id is version_guid, or None if
+        it's not stored (the structure is missing, is a delta, or was overwritten since)
+        """
+        key = (version_guid, revision)
+        with self._snapshots_lock:
+            encoded = self._snapshots.pop(key, None)
+            if encoded is not None:
+                self._snapshots[key] = encoded
+        if encoded is None:
+            snapshot = self.structures.find_one({'_id': version_guid}, ['blocks', 'base_version', 'snapshot_revision'])
+            if snapshot is None or 'base_version' in snapshot or snapshot.get('snapshot_revision') != revision:
+                return None
+            encoded = BSON.encode({'blocks': snapshot['blocks']})
+            with self._snapshots_lock:
+                self._snapshots[key] = encoded
+                while len(self._snapshots) > SNAPSHOT_CACHE_SIZE:
+                    self._snapshots.popitem(last=False)
+            return snapshot['blocks']
+        # decoding gives every caller its own blocks to change
+        return BSON(encoded).decode(as_class=son.SON, tz_aware=True)['blocks']
+
+    def _assemble_structure(self, stored):
+        """
+        Returns the structure stored in the document stored (the document itself unless it's a delta)
+
+        Raises MissingSnapshotError if the delta's base isn't stored anymore
+        """
+        if stored is None:
+            return stored
+        stored.pop('snapshot_revision', None)
+        if 'base_version' not in stored:
+            return stored
+        base_version, base_revision = stored.pop('base_version'), stored.pop('base_revision', None)
+        blocks = self._snapshot_blocks(base_version, base_revision)
+        if blocks is None:
+            raise MissingSnapshotError(stored['_id'], base_version, base_revision)
+        for block_id in stored.pop('deleted_blocks', []):
+            blocks.pop(block_id, None)
+        blocks.update(stored['blocks'])
+        stored['blocks'] = blocks
+        return stored
+
+    def _assemble_projection(self, stored, projects_blocks):
+        """
+        Returns the projection stored of a structure, the whole structure if it projects a delta's blocks
+        """
+        if 'base_version' not in stored:
+            return stored
+        if projects_blocks:
+            return self.get_structure(stored['_id'])
+        del stored['base_version']
+        stored.pop('base_revision', None)
+        return stored
 
     def get_course_index(self, key, ignore_case=False):
         """
@@ -88,12 +248,20 @@ class MongoConnection(object):
             ])
         )
 
-    def find_matching_course_indexes(self, query):
+    def find_matching_course_indexes(self, query, offset=0, limit=None):
         """
         Find the course_index matching the query. Right now the query must be a legal mongo query
         :param query: a mongo-style query of {key: [value|{$in ..}|..], ..}
+        :param offset, limit: if given, return only this page of the indexes sorted by org, course, run
         """
-        return self.course_index.find(query)
+        cursor = self.course_index.find(query)
+        if offset or limit is not None:
+            cursor = cursor.sort(
+                [('org', pymongo.ASCENDING), ('course', pymongo.ASCENDING), ('run', pymongo.ASCENDING)]
+            ).skip(offset)
+            if limit is not None:
+                cursor = cursor.limit(limit)
+        return cursor
 
     def insert_course_index(self, course_index):
         """
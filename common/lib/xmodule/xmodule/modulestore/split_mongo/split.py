@@ -68,12 +68,13 @@ from opaque_keys.edx.locator import (
 from xmodule.modulestore.exceptions import InsufficientSpecificationError, VersionConflictError, DuplicateItemError, \
     DuplicateCourseError
 from xmodule.modulestore import (
-    inheritance, ModuleStoreWriteBase, ModuleStoreEnum
+    inheritance, ModuleStoreWriteBase, ModuleStoreEnum, CourseSummary
 )
 
 from ..exceptions import ItemNotFoundError
 from .definition_lazy_loader import DefinitionLazyLoader
 from .caching_descriptor_system import CachingDescriptorSystem
+from .structure_index import StructureIndex
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
 from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore.split_mongo import encode_key_for_mongo, decode_key_from_mongo
@@ -279,8 +280,23 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
                 del self.thread_cache.course_cache[course_version_guid]
             except KeyError:
                 pass
+            getattr(self.thread_cache, 'structure_indexes', {}).pop(course_version_guid, None)
         else:
             self.thread_cache.course_cache = {}
+            self.thread_cache.structure_indexes = {}
+
+    def _get_structure_index(self, structure):
+        """
+        Get the StructureIndex of this structure version, building it the first time
+        :param structure:
+        """
+        if not hasattr(self.thread_cache, 'structure_indexes'):
+            self.thread_cache.structure_indexes = {}
+        index = self.thread_cache.structure_indexes.get(structure['_id'])
+        if index is None:
+            index = StructureIndex(structure['blocks'])
+            self.thread_cache.structure_indexes[structure['_id']] = index
+        return index
 
     def _lookup_course(self, course_locator):
         '''
@@ -376,6 +392,68 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
                 result.append(course_list[0])
         return result
 
+    def get_course_summaries(self, branch, org=None, offset=0, limit=None):
+        '''
+        Returns the CourseSummary of each course which has the given branch. The org filter and pagination
+        are applied to the course index query; only the display fields of each root block are fetched.
+
+        :param branch: the branch for which to return courses.
+        '''
+        qualifiers = {"versions.{}".format(branch): {"$exists": True}}
+        if org is not None:
+            qualifiers['org'] = org
+        matching_indexes = list(self.db_connection.find_matching_course_indexes(
+            qualifiers, offset=offset, limit=limit
+        ))
+        return self._summarize_course_indexes(matching_indexes, branch)
+
+    def get_course_summary(self, course_key):
+        '''
+        Returns the CourseSummary of the course identified by the locator, or None if it doesn't exist
+        '''
+        if not isinstance(course_key, CourseLocator):
+            return None
+        course_index = self.db_connection.get_course_index(course_key)
+        branch = course_key.branch or ModuleStoreEnum.BranchName.draft
+        if course_index is None or branch not in course_index['versions']:
+            return None
+        summaries = self._summarize_course_indexes([course_index], branch)
+        return summaries[0] if summaries else None
+
+    def _summarize_course_indexes(self, course_indexes, branch):
+        '''
+        Builds the CourseSummary for each of the course_indexes' head of branch. Fetches the structures'
+        roots in one query and then their display fields with one query per distinct root block id.
+        '''
+        version_guids = [course_index['versions'][branch] for course_index in course_indexes]
+        guids_by_root = {}
+        for structure in self.db_connection.find_matching_structures({'_id': {'$in': version_guids}}, ['root']):
+            guids_by_root.setdefault(structure['root'], []).append(structure['_id'])
+
+        root_blocks = {}
+        for root, guids in guids_by_root.iteritems():
+            encoded_root = encode_key_for_mongo(root)
+            fields = ['blocks.{}.category'.format(encoded_root)] + [
+                'blocks.{}.fields.{}'.format(encoded_root, field_name) for field_name in CourseSummary.SUMMARY_FIELDS
+            ]
+            for structure in self.db_connection.find_matching_structures({'_id': {'$in': guids}}, fields):
+                root_blocks[structure['_id']] = (root, structure.get('blocks', {}).get(encoded_root, {}))
+
+        summaries = []
+        for course_index in course_indexes:
+            version_guid = course_index['versions'][branch]
+            if version_guid not in root_blocks:
+                continue
+            root, block = root_blocks[version_guid]
+            course_key = CourseLocator(course_index['org'], course_index['course'], course_index['run'], branch)
+            block_fields = block.get('fields', {})
+            summaries.append(CourseSummary(
+                course_key,
+                location=course_key.make_usage_key(block.get('category', 'course'), root),
+                **{field_name: block_fields.get(field_name) for field_name in CourseSummary.SUMMARY_FIELDS}
+            ))
+        return summaries
+
     def get_course(self, course_id, depth=0):
         '''
         Gets the course descriptor for the course identified by the locator
@@ -462,9 +540,10 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
                 For substring matching pass a regex object.
                 For split,
                 you can search by ``edited_by``, ``edited_on`` providing a function testing limits.
+                Plain string ``category``, ``children``, and indexed settings (see StructureIndex)
+                qualifiers use the structure's indexes rather than scanning all its blocks.
         """
         course = self._lookup_course(course_locator)
-        items = []
 
         def _block_matches_all(block_json):
             """
@@ -494,9 +573,27 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         # don't expect caller to know that children are in fields
         if 'children' in kwargs:
             settings['children'] = kwargs.pop('children')
-        for block_id, value in course['structure']['blocks'].iteritems():
-            if _block_matches_all(value):
-                items.append(block_id)
+        blocks = course['structure']['blocks']
+        candidates = self._get_structure_index(course['structure']).candidates(kwargs, settings)
+        if candidates is None:
+            candidates = blocks.iterkeys()
+        items = [
+            block_id for block_id in candidates
+            if self._block_matches(blocks[block_id], kwargs) and
+            self._block_matches(blocks[block_id].get('fields', {}), settings)
+        ]
+        if content and items:
+            # fetch the remaining candidates' definitions at once
+            definitions = {
+                definition['_id']: definition
+                for definition in self.db_connection.find_matching_definitions({
+                    '_id': {'$in': list({blocks[block_id]['definition'] for block_id in items})}
+                })
+            }
+            items = [
+                block_id for block_id in items
+                if self._block_matches(definitions.get(blocks[block_id]['definition'], {}).get('fields', {}), content)
+            ]
 
         if len(items) > 0:
             return self._load_items(course, items, 0, lazy=True)
@@ -512,7 +609,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         :param locator: BlockUsageLocator restricting search scope
         '''
         course = self._lookup_course(locator)
-        parent_id = self._get_parent_from_structure(locator.block_id, course['structure'])
+        parent_id = self._get_structure_index(course['structure']).get_parent(locator.block_id)
         if parent_id is None:
             return None
         return BlockUsageLocator.make_relative(
@@ -1048,8 +1145,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             draft_structure = self._lookup_course(draft_version)['structure']
             draft_structure = self._version_structure(draft_structure, user_id)
             new_id = draft_structure['_id']
-            encoded_block_id = encode_key_for_mongo(draft_structure['root'])
-            root_block = draft_structure['blocks'][encoded_block_id]
+            root_block = self._get_block_for_update(draft_structure, draft_structure['root'])
             if block_fields is not None:
                 root_block['fields'].update(self._serialize_fields(root_category, block_fields))
             if definition_fields is not None:
@@ -1128,7 +1224,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         # if updated, rev the structure
         if is_updated:
             new_structure = self._version_structure(original_structure, user_id)
-            block_data = self._get_block_from_structure(new_structure, descriptor.location.block_id)
+            block_data = self._get_block_for_update(new_structure, descriptor.location.block_id)
 
             block_data["definition"] = descriptor.definition_locator.definition_id
             block_data["fields"] = settings
@@ -1374,7 +1470,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
                     orphans.update(
                         self._sync_children(
                             source_structure['blocks'][parent],
-                            destination_blocks[parent],
+                            self._get_block_for_update(destination_structure, parent),
                             subtree_root.block_id
                         )
                     )
@@ -1431,7 +1527,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         new_blocks = new_structure['blocks']
         new_id = new_structure['_id']
         encoded_block_id = self._get_parent_from_structure(usage_locator.block_id, original_structure)
-        parent_block = new_blocks[encoded_block_id]
+        parent_block = self._get_block_for_update(new_structure, encoded_block_id)
         parent_block['fields']['children'].remove(usage_locator.block_id)
         parent_block['edit_info']['edited_on'] = datetime.datetime.now(UTC)
         parent_block['edit_info']['edited_by'] = user_id
@@ -1653,10 +1749,14 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
     def _version_structure(self, structure, user_id):
         """
         Copy the structure and update the history info (edited_by, edited_on, previous_version)
+
+        The new version shares the block entries with the old one; so, get any block to be changed
+        in the new version with _get_block_for_update rather than changing it in place.
         :param structure:
         :param user_id:
         """
-        new_structure = copy.deepcopy(structure)
+        new_structure = structure.copy()
+        new_structure['blocks'] = structure['blocks'].copy()
         new_structure['_id'] = ObjectId()
         new_structure['previous_version'] = structure['_id']
         new_structure['edited_by'] = user_id
@@ -1898,6 +1998,19 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         """
         return structure['blocks'].get(encode_key_for_mongo(block_id))
 
+    def _get_block_for_update(self, structure, block_id):
+        """
+        Get the block from the structure for modifying it in place. The first time a version
+        changes one of the blocks it shares with its previous version (see _version_structure),
+        this copies the block into the version.
+        """
+        encoded_block_id = encode_key_for_mongo(block_id)
+        block = structure['blocks'][encoded_block_id]
+        if block['edit_info'].get('update_version') != structure['_id']:
+            block = copy.deepcopy(block)
+            structure['blocks'][encoded_block_id] = block
+        return block
+
     def _update_block_in_structure(self, structure, block_id, content):
         """
         Encodes the block id before accessing it in the structure to ensure it can
@@ -57,6 +57,14 @@ class DraftVersioningModuleStore(ModuleStoreDraftAndPublished, SplitMongoModuleS
         """
         return super(DraftVersioningModuleStore, self).get_courses(ModuleStoreEnum.BranchName.draft)
 
+    def get_course_summaries(self, org=None, offset=0, limit=None):
+        """
+        Returns the summaries of all the courses on the Draft branch.
+        """
+        return super(DraftVersioningModuleStore, self).get_course_summaries(
+            ModuleStoreEnum.BranchName.draft, org=org, offset=offset, limit=limit
+        )
+
     def _auto_publish_no_children(self, location, category, user_id):
         """
         Publishes item if the category is DIRECT_ONLY. This assumes another method has checked that
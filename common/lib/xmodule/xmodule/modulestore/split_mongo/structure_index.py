@@ -0,0 +1,54 @@
+"""
+In-memory indexes of a structure's blocks for split mongo's get_items and get_parent_location
+"""
+
+
+class StructureIndex(object):
+    """
+    Indexes a structure version's blocks by category, by parent, and by the values of the INDEXED_SETTINGS,
+    so that queries narrow their candidates rather than scanning every block. The indexes hold the encoded block
+    ids in the structure's order, and are only valid as long as the version doesn't change.
+    """
+    # the settings fields whose values are indexed
+    INDEXED_SETTINGS = ('discussion_id',)
+
+    def __init__(self, blocks):
+        self.by_category = {}
+        # child block_id -> the encoded ids of the blocks listing it as a child
+        self.parents = {}
+        self.by_setting = {field_name: {} for field_name in self.INDEXED_SETTINGS}
+        for block_id, block in blocks.iteritems():
+            self.by_category.setdefault(block.get('category'), []).append(block_id)
+            fields = block.get('fields', {})
+            for child in fields.get('children', []):
+                self.parents.setdefault(child, []).append(block_id)
+            for field_name, index in self.by_setting.iteritems():
+                value = fields.get(field_name)
+                for element in value if isinstance(value, list) else [value]:
+                    if isinstance(element, basestring):
+                        index.setdefault(element, []).append(block_id)
+
+    def candidates(self, qualifiers, settings):
+        """
+        Returns the ids of the blocks which may match the get_items qualifiers and settings (the caller still
+        has to check them), or None if the indexes can't narrow them down. Only plain string criteria can use
+        the indexes.
+        """
+        lookups = []
+        if isinstance(qualifiers.get('category'), basestring):
+            lookups.append(self.by_category.get(qualifiers['category'], []))
+        if isinstance(settings.get('children'), basestring):
+            lookups.append(self.parents.get(settings['children'], []))
+        for field_name, index in self.by_setting.iteritems():
+            if isinstance(settings.get(field_name), basestring):
+                lookups.append(index.get(settings[field_name], []))
+        if not lookups:
+            return None
+        return min(lookups, key=len)
+
+    def get_parent(self, block_id):
+        """
+        Returns the encoded id of the (first) block listing block_id as a child, or None
+        """
+        parents = self.parents.get(block_id)
+        return parents[0] if parents else None
@@ -0,0 +1,135 @@
+"""
+Benchmark of descriptor loading from the old mongo modulestore.
+
+Builds a course of roughly 2,000 blocks in a scratch database and times the common loading patterns with one
+runtime per loaded item (as happens outside of a request) and with the runtime shared for the whole request.
+
+Needs a mongod on localhost. Run with:
+
+    python -m xmodule.modulestore.tests.benchmark_mongo_load
+"""
+import time
+from uuid import uuid4
+
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from xmodule.contentstore.mongo import MongoContentStore
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.draft import DraftModuleStore
+from xmodule.modulestore.tests.test_mongo import HOST, PORT, FS_ROOT, DEFAULT_CLASS, RENDER_TEMPLATE
+
+DB = 'benchmark_mongo_%s' % uuid4().hex[:5]
+COLLECTION = 'modulestore'
+
+# children per block at each level below the course: 10 chapters, 100 sequentials, 400 verticals, 1,600 html
+FAN_OUT = (('chapter', 10), ('sequential', 10), ('vertical', 4), ('html', 4))
+
+REPEATS = 3
+
+
+class BenchmarkRequestCache(object):
+    """
+    Stands in for the request cache middleware's thread local while a "request" is being timed
+    """
+    def __init__(self):
+        self.data = {}
+        self.in_request = False
+
+
+def build_course(store, course_key, user_id):
+    """
+    Create the course and its FAN_OUT tree of blocks. Returns the locations of all the blocks.
+    """
+    course = store.create_course(course_key.org, course_key.course, course_key.run, user_id)
+    locations = [course.location]
+    parents = [course]
+    with store.bulk_write_operations(course_key):
+        for category, count in FAN_OUT:
+            children = []
+            for parent in parents:
+                for index in xrange(count):
+                    child = store.create_xmodule(
+                        course_key.make_usage_key(category, uuid4().hex),
+                        fields={'display_name': '{} {}'.format(category, index)},
+                        runtime=course.runtime,
+                    )
+                    parent.children.append(child.location)
+                    children.append(child)
+            store.update_items(parents + children, user_id, allow_not_found=True)
+            locations.extend(child.location for child in children)
+            parents = children
+    return locations
+
+
+def time_scenario(store, request_cache, shared, scenario):
+    """
+    Returns the best wall time (in seconds) of REPEATS runs of scenario, and the number of runtimes it created
+    """
+    created = []
+    create_runtime = store._create_runtime  # pylint: disable=protected-access
+
+    def counting_create_runtime(*args, **kwargs):
+        """ Count the runtimes created """
+        created.append(1)
+        return create_runtime(*args, **kwargs)
+    store._create_runtime = counting_create_runtime  # pylint: disable=protected-access
+
+    best = None
+    try:
+        for __ in xrange(REPEATS):
+            del created[:]
+            request_cache.data = {}
+            request_cache.in_request = shared
+            start = time.time()
+            scenario()
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        request_cache.in_request = False
+        del store._create_runtime  # pylint: disable=protected-access
+    return best, len(created)
+
+
+def main():
+    """
+    Build the course, run the scenarios both ways, and print the comparison
+    """
+    request_cache = BenchmarkRequestCache()
+    store = DraftModuleStore(
+        MongoContentStore(HOST, DB, port=PORT),
+        {'host': HOST, 'port': PORT, 'db': DB, 'collection': COLLECTION},
+        FS_ROOT,
+        RENDER_TEMPLATE,
+        default_class=DEFAULT_CLASS,
+        branch_setting_func=lambda: ModuleStoreEnum.Branch.draft_preferred,
+        request_cache=request_cache,
+    )
+    try:
+        course_key = SlashSeparatedCourseKey('benchmark', 'load', 'run')
+        locations = build_course(store, course_key, ModuleStoreEnum.UserID.test)
+        print '{} blocks'.format(len(locations))
+
+        def walk(block):
+            """ Load every descendant of block """
+            for child in block.get_children():
+                walk(child)
+
+        scenarios = [
+            ('get_item of every block', lambda: [store.get_item(location) for location in locations]),
+            ('get_items(category=html)', lambda: store.get_items(course_key, category='html')),
+            ('get_course(depth=None) + walk, twice', lambda: [
+                walk(store.get_course(course_key, depth=None)) for __ in xrange(2)
+            ]),
+        ]
+        print '{:<40} {:>22} {:>22} {:>8}'.format('scenario', 'per-item runtime (s)', 'shared runtime (s)', 'speedup')
+        for name, scenario in scenarios:
+            before, before_runtimes = time_scenario(store, request_cache, False, scenario)
+            after, after_runtimes = time_scenario(store, request_cache, True, scenario)
+            print '{:<40} {:>10.3f} ({:>5} rt) {:>10.3f} ({:>5} rt) {:>7.1f}x'.format(
+                name, before, before_runtimes, after, after_runtimes, before / after
+            )
+    finally:
+        store._drop_database()  # pylint: disable=protected-access
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark of split mongo's get_items and get_parent_location.
+
+Builds a course of roughly 2,500 blocks in a scratch database and times the common queries answered by scanning
+every block of the structure (as before the structure indexes) and by the structure's indexes. Also counts the
+mongo definition queries of each (content queries fetch all their candidates' definitions at once).
+
+Needs a mongod on localhost. Run with:
+
+    python -m xmodule.modulestore.tests.benchmark_split_get_items
+"""
+import re
+import time
+from uuid import uuid4
+
+from mock import patch
+from opaque_keys.edx.locator import LocalId
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.tests.test_mongo import HOST, PORT, FS_ROOT, DEFAULT_CLASS, RENDER_TEMPLATE
+
+DB = 'benchmark_split_%s' % uuid4().hex[:5]
+COLLECTION = 'modulestore'
+
+# children per block at each level below the course: 10 chapters, 100 sequentials, 500 verticals, 1,000 html
+# and 1,000 discussions
+FAN_OUT = (('chapter', 10), ('sequential', 10), ('vertical', 5))
+LEAVES_PER_VERTICAL = (('html', 2), ('discussion', 2))
+
+REPEATS = 3
+
+
+class ScanningIndex(object):
+    """
+    Stands in for a structure's StructureIndex, answering by scanning all the structure's blocks
+    """
+    def __init__(self, store, structure):
+        self.store = store
+        self.structure = structure
+
+    def candidates(self, qualifiers, settings):
+        """ Every block is a candidate """
+        return None
+
+    def get_parent(self, block_id):
+        """ Scan for the parent """
+        return self.store._get_parent_from_structure(block_id, self.structure)  # pylint: disable=protected-access
+
+
+def build_course(store, user_id):
+    """
+    Create the course and its tree of blocks in one structure version. Returns the course's locator, and the block
+    ids of the leaves.
+    """
+    course = store.create_course('benchmark', 'get_items', 'run', user_id)
+    parents = [course]
+    for category, count in FAN_OUT:
+        parents = [
+            store.create_xblock(
+                course.runtime, category, {'display_name': '{} {}'.format(category, index)},
+                LocalId(uuid4().hex), parent_xblock=parent
+            )
+            for parent in parents
+            for index in xrange(count)
+        ]
+    leaves = []
+    for index, parent in enumerate(parents):
+        for category, count in LEAVES_PER_VERTICAL:
+            for __ in xrange(count):
+                fields = {'data': '<p>html {}</p>'.format(index)} if category == 'html' else {
+                    'discussion_id': 'discussion_{}'.format(len(leaves))
+                }
+                leaves.append(store.create_xblock(
+                    course.runtime, category, fields, LocalId(uuid4().hex), parent_xblock=parent
+                ))
+    course = store.persist_xblock_dag(course, user_id)
+    return course.location.course_key, [leaf.location.block_id for leaf in leaves]
+
+
+def time_scenario(store, scenario):
+    """
+    Returns the best wall time (in seconds) of REPEATS runs of scenario, and the definition queries of one run
+    """
+    best = None
+    for __ in xrange(REPEATS):
+        # rebuild the structure's indexes each run, as each new request does
+        store._clear_cache()  # pylint: disable=protected-access
+        start = time.time()
+        scenario()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    store._clear_cache()  # pylint: disable=protected-access
+    definitions = store.db_connection.definitions
+    with patch.object(definitions, 'find', wraps=definitions.find) as find:
+        scenario()
+    return best, find.call_count
+
+
+def main():
+    """
+    Build the course, run the scenarios both ways, and print the comparison
+    """
+    store = SplitMongoModuleStore(
+        None,
+        {'host': HOST, 'port': PORT, 'db': DB, 'collection': COLLECTION},
+        FS_ROOT,
+        RENDER_TEMPLATE,
+        default_class=DEFAULT_CLASS,
+    )
+    try:
+        course_key, leaves = build_course(store, ModuleStoreEnum.UserID.test)
+        course_key = course_key.for_branch(ModuleStoreEnum.BranchName.draft)
+        print '{} leaves'.format(len(leaves))
+
+        discussion_ids = ['discussion_{}'.format(index) for index in xrange(0, len(leaves), 40)]
+        scenarios = [
+            ('get_items(category=html)', lambda: store.get_items(course_key, category='html')),
+            ('get_items(discussion_id=..) x{}'.format(len(discussion_ids)), lambda: [
+                store.get_items(course_key, category='discussion', settings={'discussion_id': discussion_id})
+                for discussion_id in discussion_ids
+            ]),
+            ('get_items(category=html, content=regex)', lambda: store.get_items(
+                course_key, category='html', content={'data': re.compile('html 1')}
+            )),
+            ('get_parent_location x100', lambda: [
+                store.get_parent_location(course_key.make_usage_key('html', block_id))
+                for block_id in leaves[:100]
+            ]),
+        ]
+        print '{:<44} {:>18} {:>18} {:>8}'.format('scenario', 'scan (s)', 'indexed (s)', 'speedup')
+        for name, scenario in scenarios:
+            with patch.object(store, '_get_structure_index', lambda structure: ScanningIndex(store, structure)):
+                before, before_queries = time_scenario(store, scenario)
+            after, after_queries = time_scenario(store, scenario)
+            print '{:<44} {:>10.3f} ({:>3} q) {:>10.3f} ({:>3} q) {:>7.1f}x'.format(
+                name, before, before_queries, after, after_queries, before / after
+            )
+    finally:
+        store._drop_database()  # pylint: disable=protected-access
+
+
+if __name__ == '__main__':
+    main()
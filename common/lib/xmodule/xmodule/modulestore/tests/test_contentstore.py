@@ -8,6 +8,9 @@ import mimetypes
 from tempfile import mkdtemp
 import path
 import shutil
+import json
+import tarfile
+from cStringIO import StringIO
 
 from opaque_keys.edx.locations import SlashSeparatedCourseKey, AssetLocation
 from xmodule.tests import DATA_DIR
@@ -145,6 +148,32 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_for_course_to_tar(self, deprecated):
+        """
+        Test streaming the export into a tar archive
+        """
+        self.set_up_assets(deprecated)
+        tar_buffer = StringIO()
+        with tarfile.open(fileobj=tar_buffer, mode='w|gz') as tar_file:
+            self.contentstore.export_all_for_course_to_tar(
+                self.course1_key, tar_file, 'course/static', 'course/policies/assets.json'
+            )
+        tar_buffer.seek(0)
+        with tarfile.open(fileobj=tar_buffer, mode='r:gz') as tar_file:
+            names = tar_file.getnames()
+            for filename in self.course1_files:
+                self.assertIn('course/static/' + filename, names)
+                with open("{}/static/{}".format(DATA_DIR, filename), "rb") as original:
+                    self.assertEqual(
+                        tar_file.extractfile('course/static/' + filename).read(), original.read()
+                    )
+            for filename in self.course2_files:
+                if filename not in self.course1_files:
+                    self.assertNotIn('course/static/' + filename, names)
+            policy = json.loads(tar_file.extractfile('course/policies/assets.json').read())
+            self.assertItemsEqual(policy.keys(), self.course1_files)
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
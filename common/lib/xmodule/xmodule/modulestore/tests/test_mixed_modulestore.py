@@ -465,6 +465,36 @@ class TestMixedModuleStore(unittest.TestCase):
         self.assertIn(self.course_locations[self.XML_COURSEID1], course_ids)
         self.assertIn(self.course_locations[self.XML_COURSEID2], course_ids)
 
+    @ddt.data('draft', 'split')
+    def test_get_course_summaries(self, default_ms):
+        """
+        Test that the course summaries cover the same courses as get_courses, with org filtering and paging
+        """
+        self.initdb(default_ms)
+        summaries = self.store.get_course_summaries()
+        self.assertItemsEqual(
+            [summary.id for summary in summaries],
+            [course.id for course in self.store.get_courses()]
+        )
+        self.assertEqual(
+            [summary.sort_key() for summary in summaries],
+            sorted(summary.sort_key() for summary in summaries)
+        )
+
+        mongo_course_key = self.course_locations[self.MONGO_COURSEID].course_key
+        org_summaries = self.store.get_course_summaries(org=mongo_course_key.org)
+        self.assertTrue(org_summaries)
+        self.assertTrue(all(summary.org == mongo_course_key.org for summary in org_summaries))
+
+        self.assertEqual(self.store.get_course_summaries(offset=1, limit=1), summaries[1:2])
+
+        summary = self.store.get_course_summary(mongo_course_key)
+        course = self.store.get_course(mongo_course_key)
+        self.assertEqual(summary.id, course.id)
+        self.assertEqual(summary.display_name, course.display_name)
+        self.assertEqual(summary.display_org_with_default, course.display_org_with_default)
+        self.assertEqual(summary.display_number_with_default, course.display_number_with_default)
+
     def test_xml_get_courses(self):
         """
         Test that the xml modulestore only loaded the courses from the maps.
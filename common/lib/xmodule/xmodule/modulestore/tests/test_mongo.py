@@ -13,6 +13,7 @@ from uuid import uuid4
 from datetime import datetime
 from pytz import UTC
 import unittest
+from mock import Mock
 from xblock.core import XBlock
 
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -833,6 +834,51 @@ class TestMongoModuleStore(unittest.TestCase):
         self.assertEqual(component.published_date, published_date)
         self.assertEqual(component.published_by, published_by)
 
+    def test_update_items_bulk(self):
+        """
+        Tests that update_items inserts the new blocks in one batch during a bulk write operation
+        """
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        locations = [course_key.make_usage_key('html', 'bulk_html_{}'.format(index)) for index in range(3)]
+        xblocks = [self.draft_store.create_xmodule(location) for location in locations]
+        for xblock in xblocks:
+            xblock.display_name = u'Bulk {}'.format(xblock.location.block_id)
+
+        with self.draft_store.bulk_write_operations(course_key):
+            # one find for the existing ids and one batched insert
+            with check_mongo_calls(self.draft_store, 1, 1):
+                updated = self.draft_store.update_items(xblocks, self.dummy_user, allow_not_found=True)
+
+        for xblock, location in zip(updated, locations):
+            self.assertTrue(xblock.is_draft)
+            self.assertEqual(xblock.location, location)
+            self.assertEqual(xblock.edited_by, self.dummy_user)
+            component = self.draft_store.get_item(location)
+            self.assertEqual(component.display_name, u'Bulk {}'.format(location.block_id))
+            self.assertEqual(component.edited_by, self.dummy_user)
+
+    def test_runtime_shared_within_request(self):
+        """
+        Tests that items loaded during a request share their runtime and descriptors until the course is written
+        """
+        request_cache = Mock(data={}, in_request=True)
+        self.draft_store.request_cache = request_cache
+        self.addCleanup(setattr, self.draft_store, 'request_cache', None)
+
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        location = course_key.make_usage_key('chapter', 'Overview')
+        chapter = self.draft_store.get_item(location)
+        course = self.draft_store.get_course(course_key, depth=1)
+        self.assertIs(chapter.runtime, course.runtime)
+        self.assertIs(self.draft_store.get_item(location), chapter)
+
+        self.draft_store.update_item(chapter, self.dummy_user)
+        self.assertIsNot(self.draft_store.get_item(location), chapter)
+
+        # outside of a request, every load gets a fresh runtime
+        request_cache.in_request = False
+        self.assertIsNot(self.draft_store.get_item(location).runtime, self.draft_store.get_item(location).runtime)
+
 
 
 class TestMongoKeyValueStore(object):
@@ -0,0 +1,83 @@
+"""
+Tests of the recording of the stores' mongo operations
+"""
+import unittest
+from uuid import uuid4
+
+import pymongo
+from bson import BSON
+
+from xmodule.modulestore.mongo_instrumentation import (
+    InstrumentedCollection, instrument_collection, start_recording, stop_recording
+)
+from xmodule.modulestore.tests.test_mongo import HOST, PORT
+
+
+class FakeStore(object):
+    """
+    Makes operations as a store method would
+    """
+    def __init__(self, collection):
+        self.collection = collection
+
+    def load_items(self):
+        """ Fetch all the items """
+        return list(self.collection.find().sort('_id'))
+
+    def save_item(self, item):
+        """ Save an item """
+        self.collection.update({'_id': item['_id']}, item, upsert=True)
+
+
+class TestMongoInstrumentation(unittest.TestCase):
+    """
+    Test the recorded operations, documents, bytes and callers
+    """
+    def setUp(self):
+        self.connection = pymongo.MongoClient(host=HOST, port=PORT)
+        self.database = self.connection['test_instrumentation_%s' % uuid4().hex[:5]]
+        self.addCleanup(self.connection.drop_database, self.database)
+        self.collection = instrument_collection(self.database['items'])
+        self.store = FakeStore(self.collection)
+        self.addCleanup(stop_recording)
+
+    def test_not_recording(self):
+        self.assertIsInstance(self.collection, InstrumentedCollection)
+        self.store.save_item({'_id': 1})
+        self.assertIsInstance(self.collection.find(), pymongo.cursor.Cursor)
+        self.assertIsNone(stop_recording())
+
+    def test_recording(self):
+        stats = start_recording()
+        for index in xrange(3):
+            self.store.save_item({'_id': index, 'data': 'x' * 100})
+        self.assertEqual([item['_id'] for item in self.store.load_items()], [0, 1, 2])
+        self.assertEqual(self.collection.find_one({'_id': 1})['_id'], 1)
+        self.assertEqual(self.collection.find({'_id': {'$gt': 0}}).count(), 2)
+        self.assertIs(stop_recording(), stats)
+
+        updates = stats.operations[('FakeStore.save_item', 'items', 'update')]
+        self.assertEqual((updates.calls, updates.documents), (3, 0))
+
+        finds = stats.operations[('FakeStore.load_items', 'items', 'find')]
+        self.assertEqual((finds.calls, finds.documents), (1, 3))
+        self.assertEqual(finds.bytes, 3 * len(BSON.encode({'_id': 0, 'data': 'x' * 100})))
+        self.assertGreater(finds.time, 0)
+
+        # find_one is recorded as the find it is made of
+        find_ones = stats.operations[('TestMongoInstrumentation.test_recording', 'items', 'find')]
+        self.assertEqual((find_ones.calls, find_ones.documents), (1, 1))
+        self.assertEqual(find_ones.bytes, len(BSON.encode({'_id': 1, 'data': 'x' * 100})))
+
+        # counting a cursor is recorded as the count command it makes, not as a find
+        counts = stats.operations[('TestMongoInstrumentation.test_recording', 'items', 'count')]
+        self.assertEqual((counts.calls, counts.documents, counts.bytes), (1, 0, 0))
+
+        totals = stats.totals()
+        self.assertEqual((totals.calls, totals.documents), (6, 4))
+        self.assertEqual(totals.bytes, finds.bytes + find_ones.bytes)
+        self.assertEqual(len(stats.breakdown()), 4)
+
+        # operations after the recording stopped aren't recorded
+        self.store.load_items()
+        self.assertEqual(stats.totals().calls, 6)
@@ -1,11 +1,13 @@
 """
     Test split modulestore w/o using any django stuff.
 """
+import copy
 import datetime
 import unittest
 import uuid
 from importlib import import_module
 from path import path
+from bson.objectid import ObjectId
 import re
 import random
 
@@ -21,6 +23,7 @@ from opaque_keys.edx.locator import CourseLocator, BlockUsageLocator, VersionTre
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
+from xmodule.modulestore.split_mongo.mongo_connection import MissingSnapshotError, MongoConnection
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 
@@ -1720,6 +1723,138 @@ class TestPublish(SplitModuleTest):
                 dest_cursor += 1
         self.assertEqual(dest_cursor, len(dest_children))
 
+class TestStructureStorage(SplitModuleTest):
+    """
+    Test the storage of structures as deltas against snapshots
+    """
+    def test_delta_storage(self):
+        locator = BlockUsageLocator(
+            CourseLocator(org="testx", course="GreekHero", run="run", branch=BRANCH_NAME_DRAFT),
+            'problem', block_id="problem3_2"
+        )
+        problem = modulestore().get_item(locator)
+        pre_version_guid = problem.location.version_guid
+        problem.max_attempts = 4
+        problem.save()
+        updated_problem = modulestore().update_item(problem, self.user_id)
+        version_guid = updated_problem.location.version_guid
+
+        # only the changed block is stored, against the previous version
+        db_connection = modulestore().db_connection
+        stored = db_connection.structures.find_one({'_id': version_guid})
+        self.assertEqual(stored['base_version'], pre_version_guid)
+        self.assertEqual(stored['blocks'].keys(), ['problem3_2'])
+        self.assertEqual(stored['deleted_blocks'], [])
+
+        # and the whole structure is read back
+        previous = db_connection.get_structure(pre_version_guid)
+        structure = db_connection.get_structure(version_guid)
+        self.assertNotIn('base_version', structure)
+        self.assertItemsEqual(structure['blocks'].keys(), previous['blocks'].keys())
+        for block_id, block in previous['blocks'].iteritems():
+            if block_id == 'problem3_2':
+                self.assertEqual(structure['blocks'][block_id]['fields']['max_attempts'], 4)
+                self.assertNotEqual(block['fields'].get('max_attempts'), 4)
+            else:
+                self.assertEqual(structure['blocks'][block_id], block)
+        self.assertEqual(
+            [found['_id'] for found in db_connection.find_matching_structures({'_id': version_guid}, ['root'])],
+            [version_guid]
+        )
+
+        # changing the base in place stores its successors whole
+        db_connection.update_structure(previous)
+        stored = db_connection.structures.find_one({'_id': version_guid})
+        self.assertNotIn('base_version', stored)
+        self.assertEqual(stored['blocks'], structure['blocks'])
+
+    def test_overwritten_snapshot(self):
+        db_connection = modulestore().db_connection
+        # a connection of another process
+        other_connection = MongoConnection(**SplitModuleTest.MODULESTORE['DOC_STORE_CONFIG'])
+        locator = BlockUsageLocator(
+            CourseLocator(org="testx", course="GreekHero", run="run", branch=BRANCH_NAME_DRAFT),
+            'problem', block_id="problem3_2"
+        )
+        base_version_guid = modulestore().get_item(locator).location.version_guid
+        # the other process caches the snapshot's blocks
+        original = other_connection.get_structure(base_version_guid)
+        self.assertNotEqual(original['blocks']['problem3_2']['fields'].get('max_attempts'), 7)
+
+        # this process overwrites the snapshot
+        base = db_connection.get_structure(base_version_guid)
+        base['blocks']['problem3_2']['fields']['max_attempts'] = 7
+        db_connection.update_structure(base)
+        self.assertNotIn('base_version', db_connection.structures.find_one({'_id': base_version_guid}))
+
+        # the other process doesn't use the blocks it cached, neither to read nor to compute deltas
+        self.assertEqual(
+            other_connection.get_structure(base_version_guid)['blocks']['problem3_2']['fields']['max_attempts'], 7
+        )
+        successor = original.copy()
+        successor['_id'] = ObjectId()
+        successor['previous_version'] = base_version_guid
+        other_connection.insert_structure(successor)
+        self.assertEqual(db_connection.get_structure(successor['_id'])['blocks'], original['blocks'])
+
+    def test_overwritten_large_delta_snapshot(self):
+        db_connection = modulestore().db_connection
+        # a connection of another process
+        other_connection = MongoConnection(**SplitModuleTest.MODULESTORE['DOC_STORE_CONFIG'])
+        locator = BlockUsageLocator(
+            CourseLocator(org="testx", course="GreekHero", run="run", branch=BRANCH_NAME_DRAFT),
+            'problem', block_id="problem3_2"
+        )
+        base_version_guid = modulestore().get_item(locator).location.version_guid
+
+        # a successor changing every block is stored whole, as a snapshot with a revision
+        snapshot = db_connection.get_structure(base_version_guid)
+        snapshot['_id'] = ObjectId()
+        snapshot['previous_version'] = base_version_guid
+        for block in snapshot['blocks'].itervalues():
+            block['fields']['max_attempts'] = 5
+        db_connection.insert_structure(copy.deepcopy(snapshot))
+        stored = db_connection.structures.find_one({'_id': snapshot['_id']})
+        self.assertNotIn('base_version', stored)
+        self.assertIsNotNone(stored.get('snapshot_revision'))
+
+        # the other process caches the snapshot's blocks, computing a delta against them
+        successor = copy.deepcopy(snapshot)
+        successor['_id'] = ObjectId()
+        successor['previous_version'] = snapshot['_id']
+        other_connection.insert_structure(successor)
+        self.assertEqual(db_connection.structures.find_one({'_id': successor['_id']})['base_version'], snapshot['_id'])
+
+        # this process overwrites the snapshot, again through a delta too large to store
+        overwritten = db_connection.get_structure(snapshot['_id'])
+        overwritten['blocks']['problem3_2']['fields']['max_attempts'] = 7
+        db_connection.update_structure(overwritten)
+
+        # the other process doesn't compute deltas against the blocks it cached
+        later = copy.deepcopy(snapshot)
+        later['_id'] = ObjectId()
+        later['previous_version'] = snapshot['_id']
+        other_connection.insert_structure(copy.deepcopy(later))
+        self.assertEqual(db_connection.get_structure(later['_id'])['blocks'], later['blocks'])
+
+    def test_missing_snapshot(self):
+        db_connection = modulestore().db_connection
+        locator = BlockUsageLocator(
+            CourseLocator(org="testx", course="GreekHero", run="run", branch=BRANCH_NAME_DRAFT),
+            'problem', block_id="problem3_2"
+        )
+        problem = modulestore().get_item(locator)
+        base_version_guid = problem.location.version_guid
+        problem.max_attempts = 4
+        problem.save()
+        version_guid = modulestore().update_item(problem, self.user_id).location.version_guid
+
+        db_connection.structures.remove({'_id': base_version_guid})
+        # (a connection which cached the snapshot's blocks can still use them)
+        with self.assertRaises(MissingSnapshotError):
+            MongoConnection(**SplitModuleTest.MODULESTORE['DOC_STORE_CONFIG']).get_structure(version_guid)
+
+
 class TestSchema(SplitModuleTest):
     """
     Test the db schema (and possibly eventually migrations?)
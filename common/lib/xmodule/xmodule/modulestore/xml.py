@@ -20,7 +20,9 @@ from xmodule.errortracker import make_error_tracker, exc_info_to_str
 from xmodule.mako_module import MakoDescriptorSystem
 from xmodule.x_module import XMLParsingSystem, policy_key
 from xmodule.modulestore.xml_exporter import DEFAULT_CONTENT_FIELDS
-from xmodule.modulestore import ModuleStoreEnum, ModuleStoreReadBase
+from xmodule.modulestore import (
+    ModuleStoreEnum, ModuleStoreReadBase, CourseSummary, paginate_course_summaries
+)
 from xmodule.tabs import CourseTabList
 from opaque_keys.edx.keys import UsageKey
 from opaque_keys.edx.locations import SlashSeparatedCourseKey, Location
@@ -773,6 +775,16 @@ class XMLModuleStore(ModuleStoreReadBase):
         """
         return self.courses.values()
 
+    def get_course_summaries(self, org=None, offset=0, limit=None):
+        """
+        Summarizes the already loaded courses, leaving out the ones which failed to load.
+        """
+        summaries = [
+            CourseSummary.from_course(course) for course in self.courses.itervalues()
+            if not isinstance(course, ErrorDescriptor) and (org is None or course.id.org == org)
+        ]
+        return paginate_course_summaries(summaries, offset, limit)
+
     def get_errored_courses(self):
         """
         Return a dictionary of course_dir -> [(msg, exception_str)], for each
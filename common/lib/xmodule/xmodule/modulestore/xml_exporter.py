@@ -10,11 +10,17 @@ from xmodule.exceptions import NotFoundError
 from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from fs.osfs import OSFS
+from fs.memoryfs import MemoryFS
 from json import dumps
+from cStringIO import StringIO
 import json
 import os
 from path import path
 import shutil
+import sys
+import tarfile
+import threading
+import time
 from xmodule.modulestore.draft_and_published import DIRECT_ONLY_CATEGORIES
 
 DRAFT_DIR = "drafts"
@@ -29,6 +35,9 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
     """
     Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
+    The static assets are copied out of the `contentstore` on a background thread while the modules are
+    exported on the calling thread.
+
     `modulestore`: A `ModuleStore` object that is the source of the modules to export
     `contentstore`: A `ContentStore` object that is the source of the content to export, can be None
     `course_key`: The `CourseKey` of the `CourseModuleDescriptor` to export
@@ -40,7 +49,161 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
 
     fsm = OSFS(root_dir)
     export_fs = course.runtime.export_fs = fsm.makeopendir(course_dir)
+    # the asset export writes policies/assets.json, so the directory has to exist before it starts
+    export_fs.makeopendir('policies')
+
+    asset_export = None
+    if contentstore:
+        asset_export = _BackgroundTask(
+            _export_assets_to_directory,
+            contentstore, course_key, _legacy_course_image_location(course), root_dir + '/' + course_dir
+        )
+        asset_export.start()
+
+    try:
+        _export_course_xml(modulestore, course, export_fs)
+    finally:
+        if asset_export is not None:
+            asset_export.join()
+
+    if asset_export is not None:
+        asset_export.reraise()
+
+
+def export_to_tarball(modulestore, contentstore, course_key, course_dir, output_file):
+    """
+    Export the course as `export_to_xml` does, but write it as a gzipped tar stream to `output_file`
+    (with all of its content under `course_dir/`) rather than to a directory tree on disk.
+
+    The static assets are streamed from the `contentstore` into the archive on a background thread
+    while the modules are exported to memory on the calling thread; the module xml is then appended
+    to the archive.
+
+    `modulestore`: A `ModuleStore` object that is the source of the modules to export
+    `contentstore`: A `ContentStore` object that is the source of the content to export, can be None
+    `course_key`: The `CourseKey` of the `CourseModuleDescriptor` to export
+    `course_dir`: The name of the archive directory to write the course content to
+    `output_file`: A writable file-like object to write the archive to
+    """
+    course = modulestore.get_course(course_key)
+    export_fs = course.runtime.export_fs = MemoryFS()
+    export_fs.makedir('policies')
+
+    with tarfile.open(fileobj=output_file, mode='w|gz') as tar_file:
+        asset_export = None
+        if contentstore:
+            # only the background thread adds to tar_file until it has been joined
+            asset_export = _BackgroundTask(
+                _export_assets_to_tar,
+                contentstore, course_key, _legacy_course_image_location(course), tar_file, course_dir
+            )
+            asset_export.start()
+
+        try:
+            _export_course_xml(modulestore, course, export_fs)
+        finally:
+            if asset_export is not None:
+                asset_export.join()
+
+        if asset_export is not None:
+            asset_export.reraise()
+
+        for file_path in export_fs.walkfiles():
+            contents = export_fs.getcontents(file_path)
+            tar_info = tarfile.TarInfo(course_dir + file_path)
+            tar_info.size = len(contents)
+            tar_info.mtime = time.time()
+            tar_file.addfile(tar_info, StringIO(contents))
+
+
+class _BackgroundTask(threading.Thread):
+    """
+    A thread which runs `target(*args)` and keeps any exception it raises so that the starting thread
+    can re-raise it once the task has been joined.
+    """
+    def __init__(self, target, *args):
+        super(_BackgroundTask, self).__init__(name='course-export-{}'.format(target.__name__))
+        self.daemon = True
+        self._target_func = target
+        self._target_args = args
+        self.exc_info = None
+
+    def run(self):
+        try:
+            self._target_func(*self._target_args)
+        except Exception:  # pylint: disable=broad-except
+            self.exc_info = sys.exc_info()
+
+    def reraise(self):
+        """
+        Re-raise the exception (with its original traceback) that the task failed with, if any
+        """
+        if self.exc_info is not None:
+            raise self.exc_info[0], self.exc_info[1], self.exc_info[2]
 
+
+def _legacy_course_image_location(course):
+    """
+    If the course uses the default course image, return the asset location which has to be
+    exported to the legacy location to support backwards compatibility, otherwise None.
+    """
+    if course.course_image == course.fields['course_image'].default:
+        return StaticContent.compute_location(course.id, course.course_image)
+    return None
+
+
+def _export_assets_to_directory(contentstore, course_key, course_image_location, course_root):
+    """
+    Export the course's static assets and assets policy to the `course_root` directory
+    """
+    contentstore.export_all_for_course(
+        course_key,
+        course_root + '/static/',
+        course_root + '/policies/assets.json',
+    )
+
+    if course_image_location is not None:
+        try:
+            course_image = contentstore.find(course_image_location)
+        except NotFoundError:
+            pass
+        else:
+            output_dir = course_root + '/static/images/'
+            if not os.path.isdir(output_dir):
+                os.makedirs(output_dir)
+            with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                course_image_file.write(course_image.data)
+
+
+def _export_assets_to_tar(contentstore, course_key, course_image_location, tar_file, course_dir):
+    """
+    Stream the course's static assets and assets policy into `tar_file` under `course_dir`
+    """
+    contentstore.export_all_for_course_to_tar(
+        course_key,
+        tar_file,
+        course_dir + '/static',
+        course_dir + '/policies/assets.json',
+    )
+
+    if course_image_location is not None:
+        try:
+            course_image = contentstore.find(course_image_location)
+        except NotFoundError:
+            pass
+        else:
+            tar_info = tarfile.TarInfo(course_dir + '/static/images/course_image.jpg')
+            tar_info.size = len(course_image.data)
+            tar_info.mtime = time.time()
+            tar_file.addfile(tar_info, StringIO(course_image.data))
+
+
+def _export_course_xml(modulestore, course, export_fs):
+    """
+    Export the course's modules, extra content, and course policies to `export_fs`
+    (whose `policies` directory must already exist).
+    """
+    course_key = course.id
     root = lxml.etree.Element('unknown')
 
     # export only the published content
@@ -50,34 +213,6 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
     with export_fs.open('course.xml', 'w') as course_xml:
         lxml.etree.ElementTree(root).write(course_xml)
 
-    # export the static assets
-    policies_dir = export_fs.makeopendir('policies')
-    if contentstore:
-        contentstore.export_all_for_course(
-            course_key,
-            root_dir + '/' + course_dir + '/static/',
-            root_dir + '/' + course_dir + '/policies/assets.json',
-        )
-
-        # If we are using the default course image, export it to the
-        # legacy location to support backwards compatibility.
-        if course.course_image == course.fields['course_image'].default:
-            try:
-                course_image = contentstore.find(
-                    StaticContent.compute_location(
-                        course.id,
-                        course.course_image
-                    ),
-                )
-            except NotFoundError:
-                pass
-            else:
-                output_dir = root_dir + '/' + course_dir + '/static/images/'
-                if not os.path.isdir(output_dir):
-                    os.makedirs(output_dir)
-                with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
-                    course_image_file.write(course_image.data)
-
     # export the static tabs
     export_extra_content(export_fs, modulestore, course_key, 'static_tab', 'tabs', '.html')
 
@@ -91,6 +226,7 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
     export_extra_content(export_fs, modulestore, course_key, 'about', 'about', '.html')
 
     # export the grading policy
+    policies_dir = export_fs.opendir('policies')
     course_run_policy_dir = policies_dir.makeopendir(course.location.name)
     with course_run_policy_dir.open('grading_policy.json', 'w') as grading_policy:
         grading_policy.write(dumps(course.grading_policy, cls=EdxJSONEncoder))
@@ -4,6 +4,7 @@ import mimetypes
 from path import path
 import json
 import re
+import time
 
 from .xml import XMLModuleStore, ImportSystem, ParentTracker
 from xblock.runtime import KvsFieldData, DictKeyValueStore
@@ -23,6 +24,35 @@ from xmodule.modulestore import ModuleStoreEnum
 
 log = logging.getLogger(__name__)
 
+# the number of converted modules the importer hands to the store's update_items at a time
+IMPORT_WRITE_BATCH_SIZE = 500
+
+
+class ImportPhaseTimer(object):
+    """
+    Records and logs how long each phase of the import of a course takes
+    """
+    def __init__(self, course_key):
+        self.course_key = course_key
+        self.timings = []
+        self._last = time.time()
+
+    def lap(self, phase):
+        """
+        Marks the end of the given phase, which started when the previous one ended
+        """
+        now = time.time()
+        self.timings.append((phase, now - self._last))
+        self._last = now
+
+    def log_timings(self):
+        """
+        Logs the duration of every recorded phase, plus the total
+        """
+        for phase, duration in self.timings:
+            log.info(u'Import of %s: %s took %.3fs', self.course_key, phase, duration)
+        log.info(u'Import of %s: total %.3fs', self.course_key, sum(duration for __, duration in self.timings))
+
 
 def import_static_content(
         course_data_path, static_content_store,
@@ -182,6 +212,7 @@ def import_from_xml(
                     )
                     continue
 
+            timer = ImportPhaseTimer(dest_course_id)
             with store.bulk_write_operations(dest_course_id):
                 course_data_path = None
 
@@ -254,6 +285,8 @@ def import_from_xml(
                         course_items.append(course)
                         break
 
+                timer.lap('course module')
+
                 # TODO: shouldn't this raise an exception if course wasn't found?
 
                 # then import all the static content
@@ -287,7 +320,10 @@ def import_from_xml(
                         dest_course_id, subpath=simport, verbose=verbose
                     )
 
-                # now loop through all the modules
+                timer.lap('static content')
+
+                # now loop through all the modules, writing the converted ones in batches
+                pending_modules = []
                 for module in xml_module_store.modules[course_key].itervalues():
                     if module.scope_ids.block_type == 'course':
                         # we've already saved the course module up at the top
@@ -299,18 +335,29 @@ def import_from_xml(
                             loc=module.location
                         ))
 
-                    _import_module_and_update_references(
+                    pending_modules.append(_import_module_and_update_references(
                         module, store,
                         user_id,
                         course_key,
                         dest_course_id,
                         do_import_static=do_import_static,
-                        runtime=course.runtime
-                    )
+                        runtime=course.runtime,
+                        persist=False
+                    ))
+                    if len(pending_modules) >= IMPORT_WRITE_BATCH_SIZE:
+                        store.update_items(pending_modules, user_id, allow_not_found=True)
+                        pending_modules = []
+
+                if pending_modules:
+                    store.update_items(pending_modules, user_id, allow_not_found=True)
+
+                timer.lap('modules')
 
                 # finally, publish the course
                 store.publish(course.location, user_id)
 
+                timer.lap('publish')
+
                 # now import any DRAFT items
                 _import_course_draft(
                     xml_module_store,
@@ -322,14 +369,26 @@ def import_from_xml(
                     course.runtime
                 )
 
+                timer.lap('drafts')
+
+            # leaving the bulk write operation refreshes the inheritance cache
+            timer.lap('inheritance cache refresh')
+            timer.log_timings()
+
     return xml_module_store, course_items
 
 
 def _import_module_and_update_references(
         module, store, user_id,
         source_course_id, dest_course_id,
-        do_import_static=True, runtime=None):
+        do_import_static=True, runtime=None, persist=True):
+    """
+    Creates a copy of module in dest_course_id, mapping the references which point into
+    source_course_id into dest_course_id.
 
+    If persist is False, the caller is responsible for saving the returned module (e.g., in bulk
+    via the store's update_items).
+    """
     logging.debug(u'processing import of module {}...'.format(module.location.to_deprecated_string()))
 
     if do_import_static and 'data' in module.fields and isinstance(module.fields['data'], xblock.fields.String):
@@ -389,7 +448,8 @@ def _import_module_and_update_references(
                 setattr(new_module, field_name, value)
             else:
                 setattr(new_module, field_name, getattr(module, field_name))
-    store.update_item(new_module, user_id, allow_not_found=True)
+    if persist:
+        store.update_item(new_module, user_id, allow_not_found=True)
     return new_module
 
 
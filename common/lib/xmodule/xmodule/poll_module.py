@@ -15,10 +15,12 @@ from collections import OrderedDict
 from lxml import etree
 from pkg_resources import resource_string
 
+from xmodule.aggregate_counters import get_aggregate_counters
 from xmodule.x_module import XModule
 from xmodule.stringify import stringify_children
 from xmodule.mako_module import MakoModuleDescriptor
 from xmodule.xml_module import XmlDescriptor
+from xblock.core import XBlock
 from xblock.fields import Scope, String, Dict, Boolean, List
 
 log = logging.getLogger(__name__)
@@ -30,6 +32,7 @@ class PollFields(object):
 
     voted = Boolean(help="Whether this student has voted on the poll", scope=Scope.user_state, default=False)
     poll_answer = String(help="Student answer", scope=Scope.user_state, default='')
+    # Only used by runtimes without the aggregate_counters service; the others count the votes there.
     poll_answers = Dict(help="All possible answers for the poll fro other students", scope=Scope.user_state_summary)
 
     # List of answers, in the form {'id': 'some id', 'text': 'the answer text'}
@@ -38,6 +41,7 @@ class PollFields(object):
     question = String(help="Poll question", scope=Scope.content, default='')
 
 
+@XBlock.wants('aggregate_counters')
 class PollModule(PollFields, XModule):
     """Poll Module"""
     js = {
@@ -58,39 +62,44 @@ class PollModule(PollFields, XModule):
         Returns:
             json string
         """
-        if dispatch in self.poll_answers and not self.voted:
-            # FIXME: fix this, when xblock will support mutable types.
-            # Now we use this hack.
-            temp_poll_answers = self.poll_answers
-            temp_poll_answers[dispatch] += 1
-            self.poll_answers = temp_poll_answers
+        counters = get_aggregate_counters(self)
+        poll_answers = self.get_poll_answers(counters)
+        if dispatch in poll_answers and not self.voted:
+            poll_answers.update(counters.increment(self, 'poll_answers', [dispatch]))
 
             self.voted = True
             self.poll_answer = dispatch
-            return json.dumps({'poll_answers': self.poll_answers,
-                               'total': sum(self.poll_answers.values()),
+            return json.dumps({'poll_answers': poll_answers,
+                               'total': sum(poll_answers.values()),
                                'callback': {'objectName': 'Conditional'}
                                })
         elif dispatch == 'get_state':
             return json.dumps({'poll_answer': self.poll_answer,
-                               'poll_answers': self.poll_answers,
-                               'total': sum(self.poll_answers.values())
+                               'poll_answers': poll_answers,
+                               'total': sum(poll_answers.values())
                                })
         elif dispatch == 'reset_poll' and self.voted and \
                 self.descriptor.xml_attributes.get('reset', 'True').lower() != 'false':
             self.voted = False
-
-            # FIXME: fix this, when xblock will support mutable types.
-            # Now we use this hack.
-            temp_poll_answers = self.poll_answers
-            temp_poll_answers[self.poll_answer] -= 1
-            self.poll_answers = temp_poll_answers
-
+            counters.increment(self, 'poll_answers', [self.poll_answer], delta=-1)
             self.poll_answer = ''
             return json.dumps({'status': 'success'})
         else:  # return error message
             return json.dumps({'error': 'Unknown Command!'})
 
+    def get_poll_answers(self, counters):
+        """Return the number of votes for each answer (0 for the answers nobody has chosen yet).
+
+        Args:
+            counters: the module's aggregate counters.
+
+        Returns:
+            dict - {answer id: number of votes}
+        """
+        poll_answers = {answer['id']: 0 for answer in self.answers}
+        poll_answers.update(counters.get_counts(self, 'poll_answers'))
+        return poll_answers
+
     def get_html(self):
         """Renders parameters to template."""
         params = {
@@ -108,31 +117,19 @@ class PollModule(PollFields, XModule):
         Returns:
             string - Serialize json.
         """
-        # FIXME: hack for resolving caching `default={}` during definition
-        # poll_answers field
-        if self.poll_answers is None:
-            self.poll_answers = {}
-
         answers_to_json = OrderedDict()
-
-        # FIXME: fix this, when xblock support mutable types.
-        # Now we use this hack.
-        temp_poll_answers = self.poll_answers
-
-         # Fill self.poll_answers, prepare data for template context.
         for answer in self.answers:
-            # Set default count for answer = 0.
-            if answer['id'] not in temp_poll_answers:
-                temp_poll_answers[answer['id']] = 0
             answers_to_json[answer['id']] = cgi.escape(answer['text'])
-        self.poll_answers = temp_poll_answers
+
+        # the counts are only shown to students who have voted
+        poll_answers = self.get_poll_answers(get_aggregate_counters(self)) if self.voted else {}
 
         return json.dumps({'answers': answers_to_json,
             'question': cgi.escape(self.question),
             # to show answered poll after reload:
             'poll_answer': self.poll_answer,
-            'poll_answers': self.poll_answers if self.voted else {},
-            'total': sum(self.poll_answers.values()) if self.voted else 0,
+            'poll_answers': poll_answers,
+            'total': sum(poll_answers.values()),
             'reset': str(self.descriptor.xml_attributes.get('reset', 'true')).lower()})
 
 
@@ -1,4 +1,5 @@
 """Grading tests"""
+import random
 import unittest
 
 from xmodule import graders
@@ -186,6 +187,38 @@ class GraderTest(unittest.TestCase):
         self.assertEqual(len(graded['section_breakdown']), 0)
         self.assertEqual(len(graded['grade_breakdown']), 0)
 
+    def test_grade_matrix(self):
+        """
+        grade_matrix gives each student exactly the percent grade gives their grade sheet
+        """
+        course_grader = graders.grader_from_conf([
+            {'type': "Homework", 'min_count': 4, 'drop_count': 2, 'weight': 0.3},
+            {'type': "Lab", 'min_count': 2, 'drop_count': 3, 'weight': 0.2},
+            {'type': "Quiz", 'min_count': 0, 'drop_count': 0, 'weight': 0.1},
+            {'type': "Midterm", 'name': "Midterm Exam", 'weight': 0.4},
+        ])
+        section_names = ["Midterm Exam", "Midterm Review", "Other"]
+        rand = random.Random(0)
+        grade_sheets = [self.test_gradesheet, self.empty_gradesheet, self.incomplete_gradesheet]
+        for __ in xrange(200):
+            grade_sheet = {}
+            for section_format in ("Homework", "Lab", "Quiz", "Midterm", "Final"):
+                if rand.random() < 0.8:
+                    # few distinct scores, so that there are ties among the dropped ones
+                    grade_sheet[section_format] = [
+                        Score(rand.randint(0, 4), rand.choice([4, 8.0]), True, rand.choice(section_names))
+                        for __ in xrange(rand.randint(0, 7))
+                    ]
+            grade_sheets.append(grade_sheet)
+
+        score_matrix = graders.ScoreMatrix.from_grade_sheets(grade_sheets)
+        subgraders = [subgrader for subgrader, __, __ in course_grader.sections]
+        for grader in [course_grader] + subgraders:
+            self.assertEqual(
+                list(grader.grade_matrix(score_matrix)),
+                [grader.grade(grade_sheet)['percent'] for grade_sheet in grade_sheets]
+            )
+
     def test_grader_from_conf(self):
 
         # Confs always produce a graders.WeightedSubsectionsGrader, so we test this by repeating the test
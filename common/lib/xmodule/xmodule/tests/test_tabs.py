@@ -572,6 +572,23 @@ class CourseTabListTestCase(TabListTestCase):
             list(tabs.CourseTabList.iterate_displayable_cms(self.course, self.settings)),
         )
 
+    def test_iterate_displayable_timings(self):
+        self.settings.FEATURES['ENABLE_TEXTBOOK'] = True
+        self.settings.FEATURES['ENABLE_DISCUSSION_SERVICE'] = True
+        self.settings.FEATURES['ENABLE_STUDENT_NOTES'] = True
+        self.settings.WIKI_ENABLED = False
+        self.course.hide_progress_tab = True
+        self.set_up_books(1)
+        self.course.tabs = self.all_valid_tab_list
+
+        timings = {}
+        # timing the checks doesn't change the displayable tabs
+        self.assertEqual(
+            list(tabs.CourseTabList.iterate_displayable(self.course, self.settings, True, False, timings=timings)),
+            list(tabs.CourseTabList.iterate_displayable(self.course, self.settings, True, False)),
+        )
+        self.assertEqual(set(timings), set(tab.type for tab in self.course.tabs) | {tabs.InstructorTab.type})
+
     def test_get_tab_by_methods(self):
         """Tests the get_tab methods in CourseTabList"""
         self.course.tabs = self.all_valid_tab_list
@@ -4,13 +4,21 @@ Utility functions for transcripts.
 """
 import os
 import copy
+import hashlib
 import json
 import requests
 import logging
+import threading
+from array import array
+from collections import OrderedDict
+
+import numpy
 from pysrt import SubRipTime, SubRipItem, SubRipFile
 from lxml import etree
 from HTMLParser import HTMLParser
 
+from django.core.cache import get_cache, InvalidCacheBackendError
+
 from xmodule.exceptions import NotFoundError
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
@@ -18,6 +26,13 @@ from xmodule.contentstore.django import contentstore
 
 log = logging.getLogger(__name__)
 
+# the array typecode and numpy dtype of the timestamp columns of TranscriptCues
+TIMESTAMP_TYPECODE = 'l'
+TIMESTAMP_DTYPE = numpy.dtype(TIMESTAMP_TYPECODE)
+
+# the characters of a transcript split into lines at a time
+SRT_CHUNK_SIZE = 64 * 1024
+
 
 class TranscriptException(Exception):  # pylint disable=C0111
     pass
@@ -52,18 +67,106 @@ def generate_subs(speed, source_speed, source_subs):
 
     coefficient = 1.0 * speed / source_speed
     subs = {
-        'start': [
-            int(round(timestamp * coefficient)) for
-            timestamp in source_subs['start']
-        ],
-        'end': [
-            int(round(timestamp * coefficient)) for
-            timestamp in source_subs['end']
-        ],
+        'start': round_timestamps(numpy.array(source_subs['start'], dtype=float) * coefficient).tolist(),
+        'end': round_timestamps(numpy.array(source_subs['end'], dtype=float) * coefficient).tolist(),
         'text': source_subs['text']}
     return subs
 
 
+def round_timestamps(timestamps):
+    """
+    Round the (numpy array of) scaled timestamps to whole milliseconds as int(round(timestamp)) would
+    (numpy rounds halves to even, python 2 away from zero).
+    """
+    magnitudes = numpy.abs(timestamps)
+    rounded = numpy.floor(magnitudes)
+    rounded += (magnitudes - rounded) >= 0.5
+    return numpy.copysign(rounded, timestamps).astype(TIMESTAMP_DTYPE)
+
+
+class TranscriptCues(object):
+    """
+    The cues of a transcript as columns: their start and end times (in milliseconds, as arrays of C longs)
+    and their texts.
+    """
+    def __init__(self, start=None, end=None, text=None):
+        self.start = start if start is not None else array(TIMESTAMP_TYPECODE)
+        self.end = end if end is not None else array(TIMESTAMP_TYPECODE)
+        self.text = text if text is not None else []
+
+    def __len__(self):
+        return len(self.text)
+
+    @classmethod
+    def from_srt(cls, srt_subs):
+        """
+        Parse the SubRip transcript `srt_subs` (unicode, or an iterable of consecutive unicode chunks of it, like
+        the decoded chunks of an uploaded file) a cue at a time, as SubRipFile.from_string would parse it.
+        """
+        cues = cls()
+        for sub in SubRipFile.stream(srt_lines(srt_subs)):
+            cues.start.append(sub.start.ordinal)
+            cues.end.append(sub.end.ordinal)
+            cues.text.append(sub.text.replace('\n', ' '))
+        return cues
+
+    def at_speed(self, speed, source_speed=1):
+        """
+        Return the cues for a video playing at `speed`, as generate_subs would compute them
+        """
+        if speed == source_speed:
+            return self
+        coefficient = 1.0 * speed / source_speed
+        return TranscriptCues(
+            self._scaled(self.start, coefficient), self._scaled(self.end, coefficient), self.text
+        )
+
+    @staticmethod
+    def _scaled(timestamps, coefficient):
+        """
+        Return the array of the timestamps multiplied by coefficient
+        """
+        scaled = array(TIMESTAMP_TYPECODE)
+        if timestamps:
+            scaled.fromstring(
+                round_timestamps(numpy.frombuffer(timestamps, dtype=TIMESTAMP_DTYPE) * coefficient).tostring()
+            )
+        return scaled
+
+    def to_sjson_subs(self):
+        """
+        Return the sjson subs (the dict of lists)
+        """
+        return {'start': self.start.tolist(), 'end': self.end.tolist(), 'text': self.text}
+
+
+def srt_lines(srt_subs):
+    """
+    Return an iterator over the lines of `srt_subs` (unicode, or an iterable of consecutive unicode chunks of it,
+    like the decoded chunks of an uploaded file), splitting them as unicode.splitlines(True) does, a chunk at a
+    time rather than making a list of all of them.
+    """
+    if isinstance(srt_subs, basestring):
+        text = unicode(srt_subs)
+        return _split_chunks(text[start:start + SRT_CHUNK_SIZE] for start in xrange(0, len(text), SRT_CHUNK_SIZE))
+    return _split_chunks(srt_subs)
+
+
+def _split_chunks(chunks):
+    """
+    Yield the lines of the concatenated unicode chunks, as unicode.splitlines(True) would split them
+    """
+    tail = u''
+    for chunk in chunks:
+        lines = (tail + chunk).splitlines(True)
+        # The last line may go on in the next chunk: even one ending with '\r' may be the first half of a '\r\n'
+        tail = lines.pop() if lines else u''
+        for line in lines:
+            yield line
+    if tail:
+        yield tail
+
+
 def save_to_store(content, name, mime_type, location):
     """
     Save named content to store by location.
@@ -172,47 +275,34 @@ def generate_subs_from_source(speed_subs, subs_type, subs_filedata, item, langua
 
     :param speed_subs: dictionary {speed: sub_id, ...}
     :param subs_type: type of source subs: "srt", ...
-    :param subs_filedata:unicode, content of source subs.
+    :param subs_filedata: unicode, content of source subs, or an iterable of consecutive unicode chunks of it
+        (e.g. an uploaded file's chunks decoded with `codecs.iterdecode`), which is parsed as it is read.
     :param item: module object.
     :param language: str, language of translation of transcripts
-    :returns: True, if all subs are generated and saved successfully.
+    :returns: the TranscriptCues of the subs at speed 1.0.
     """
     _ = item.runtime.service(item, "i18n").ugettext
     if subs_type.lower() != 'srt':
         raise TranscriptsGenerationException(_("We support only SubRip (*.srt) transcripts format."))
     try:
-        srt_subs_obj = SubRipFile.from_string(subs_filedata)
+        cues = TranscriptCues.from_srt(subs_filedata)
     except Exception as ex:
         msg = _("Something wrong with SubRip transcripts file during parsing. Inner message is {error_message}").format(
             error_message=ex.message
         )
         raise TranscriptsGenerationException(msg)
-    if not srt_subs_obj:
+    if not cues:
         raise TranscriptsGenerationException(_("Something wrong with SubRip transcripts file during parsing."))
 
-    sub_starts = []
-    sub_ends = []
-    sub_texts = []
-
-    for sub in srt_subs_obj:
-        sub_starts.append(sub.start.ordinal)
-        sub_ends.append(sub.end.ordinal)
-        sub_texts.append(sub.text.replace('\n', ' '))
-
-    subs = {
-        'start': sub_starts,
-        'end': sub_ends,
-        'text': sub_texts}
-
     for speed, subs_id in speed_subs.iteritems():
         save_subs_to_store(
-            generate_subs(speed, 1, subs),
+            cues.at_speed(speed).to_sjson_subs(),
             subs_id,
             item,
             language
         )
 
-    return subs
+    return cues
 
 
 def generate_srt_from_sjson(sjson_subs, speed):
@@ -231,16 +321,13 @@ def generate_srt_from_sjson(sjson_subs, speed):
 
     sjson_speed_1 = generate_subs(speed, 1, sjson_subs)
 
-    for i in range(len(sjson_speed_1['start'])):
-        item = SubRipItem(
-            index=i,
-            start=SubRipTime(milliseconds=sjson_speed_1['start'][i]),
-            end=SubRipTime(milliseconds=sjson_speed_1['end'][i]),
-            text=sjson_speed_1['text'][i]
+    return u''.join(
+        unicode(SubRipItem(index=i, start=SubRipTime(milliseconds=start), end=SubRipTime(milliseconds=end), text=text))
+        + u'\n'
+        for i, (start, end, text) in enumerate(
+            zip(sjson_speed_1['start'], sjson_speed_1['end'], sjson_speed_1['text'])
         )
-        output += (unicode(item))
-        output += '\n'
-    return output
+    )
 
 
 def copy_or_rename_transcript(new_name, old_name, item, delete_old=False, user=None):
@@ -296,7 +383,8 @@ def manage_video_subtitles_save(item, user, old_metadata=None, generate_translat
     # 3. Generate transcripts translation only  when user clicks `save` button, not while switching tabs.
     a) delete sjson translation for those languages, which were removed from `item.transcripts`.
         Note: we are not deleting old SRT files to give user more flexibility.
-    b) For all SRT files in`item.transcripts` regenerate new SJSON files.
+    b) Check that all SRT files in `item.transcripts` exist. New SJSON files are then regenerated
+        for them by a background task (see `generate_speed_variants`), rather than in this request.
         (To avoid confusing situation if you attempt to correct a translation by uploading
         a new version of the SRT file with same name).
     """
@@ -342,16 +430,15 @@ def manage_video_subtitles_save(item, user, old_metadata=None, generate_translat
 
         reraised_message = ''
         for lang in new_langs:  # 3b
+            user_filename = item.transcripts[lang]
             try:
-                generate_sjson_for_all_speeds(
-                    item,
-                    item.transcripts[lang],
-                    {speed: subs_id for subs_id, speed in youtube_speed_dict(item).iteritems()},
-                    lang,
-                )
-            except TranscriptException as ex:
+                contentstore().get_attrs(Transcript.asset_location(item.location, user_filename))
+            except NotFoundError as ex:
                 item.transcripts.pop(lang)  # remove key from transcripts because proper srt file does not exist in assets.
-                reraised_message += ' ' + ex.message
+                reraised_message += ' ' + _("{exception_message}: Can't find uploaded transcripts: {user_filename}").format(
+                    exception_message=ex.message,
+                    user_filename=user_filename
+                )
         if reraised_message:
             item.save_with_metadata(user)
             raise TranscriptException(reraised_message)
@@ -405,28 +492,143 @@ def generate_sjson_for_all_speeds(item, user_filename, result_subs_dict, lang):
     )
 
 
-def get_or_create_sjson(item):
+def get_translation_sjson(item, subs_id, speed=1.0):
     """
-    Get sjson if already exists, otherwise generate it.
+    Return the sjson of the item's transcript in item.transcript_language for the video `subs_id` playing at `speed`.
 
-    Generate sjson with subs_id name, from user uploaded srt.
-    Subs_id is extracted from srt filename, which was set by user.
+    That's the sjson which Studio generated for it when the transcript was uploaded, or if that hasn't been
+    generated (yet), the uploaded srt converted on the fly. Nothing is written to the contentstore.
 
     Raises:
-        TranscriptException: when srt subtitles do not exist,
-        and exceptions from generate_subs_from_source.
+        NotFoundError: when neither the sjson nor the srt subtitles exist.
+        TranscriptsGenerationException: when the srt subtitles can't be parsed.
 
     `item` is module object.
     """
-    user_filename = item.transcripts[item.transcript_language]
-    user_subs_id = os.path.splitext(user_filename)[0]
-    source_subs_id, result_subs_dict = user_subs_id, {1.0: user_subs_id}
+    lang = item.transcript_language
     try:
-        sjson_transcript = Transcript.asset(item.location, source_subs_id, item.transcript_language).data
-    except (NotFoundError):  # generating sjson from srt
-        generate_sjson_for_all_speeds(item, user_filename, result_subs_dict, item.transcript_language)
-    sjson_transcript = Transcript.asset(item.location, source_subs_id, item.transcript_language).data
-    return sjson_transcript
+        return get_converted_transcript(item.location, subs_filename(subs_id, lang), 'sjson', 'sjson')
+    except NotFoundError:
+        log.info("Can't find content in storage for %s transcript: converting the srt.", subs_id)
+    return get_converted_transcript(item.location, item.transcripts[lang], 'srt', 'sjson', speed)
+
+
+def generate_speed_variants(item, lang):
+    """
+    Generate and store the sjson of the item's `lang` srt transcript for every speed the item has a video for
+    (or for its html5 video, if it has no youtube ones), so that learners' requests find it ready.
+
+    `item` is module object.
+    """
+    user_filename = item.transcripts[lang]
+    speed_subs = {speed: subs_id for subs_id, speed in youtube_speed_dict(item).iteritems()}
+    if not speed_subs:
+        speed_subs = {1.0: os.path.splitext(user_filename)[0]}
+    generate_sjson_for_all_speeds(item, user_filename, speed_subs, lang)
+
+
+class TranscriptCache(object):
+    """
+    Converted transcripts, in a per-process LRU in front of the 'transcripts' cache (or the 'default' one).
+
+    Entries are keyed by the transcript asset's content hash along with the asset location, the output format,
+    and the speed, so uploading new content for a transcript makes its old conversions unreachable.
+    """
+    LOCAL_SIZE = 100
+    TIMEOUT = 24 * 60 * 60
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared = None
+
+    @property
+    def shared(self):
+        """
+        The django cache behind the local LRU
+        """
+        if self._shared is None:
+            try:
+                self._shared = get_cache('transcripts')
+            except InvalidCacheBackendError:
+                self._shared = get_cache('default')
+        return self._shared
+
+    @staticmethod
+    def make_key(asset_location, content_hash, output_format, speed):
+        """
+        Return the cache key of the conversion (hashed so that it's always a valid memcached key)
+        """
+        key = u'|'.join([unicode(asset_location), content_hash, output_format, repr(float(speed))])
+        return 'transcript.' + hashlib.md5(key.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Return the converted transcript stored under key, or None
+        """
+        with self._lock:
+            content = self._local.pop(key, None)
+            if content is not None:
+                self._local[key] = content
+                return content
+        content = self.shared.get(key)
+        if content is not None:
+            self._set_local(key, content)
+        return content
+
+    def set(self, key, content):
+        """
+        Store the converted transcript under key
+        """
+        self._set_local(key, content)
+        self.shared.set(key, content, self.TIMEOUT)
+
+    def _set_local(self, key, content):
+        """
+        Add the content to the local LRU, evicting its least recently used entry if it's full
+        """
+        with self._lock:
+            self._local.pop(key, None)
+            self._local[key] = content
+            while len(self._local) > self.LOCAL_SIZE:
+                self._local.popitem(last=False)
+
+
+TRANSCRIPT_CACHE = TranscriptCache()
+
+
+def get_converted_transcript(location, filename, input_format, output_format, speed=1.0):
+    """
+    Return the transcript asset `filename` of the module at `location`, converted from `input_format`
+    to `output_format` (and for sjson, to the timings of a video playing at `speed`).
+
+    Conversions are cached, so only the asset's content hash is read from the contentstore
+    once the transcript has been converted.
+
+    Raises:
+        NotFoundError: when the asset doesn't exist.
+        TranscriptsGenerationException: when an srt asset can't be parsed into sjson.
+        and the exceptions of Transcript.convert for malformed content.
+    """
+    asset_location = Transcript.asset_location(location, filename)
+    content_hash = contentstore().get_attrs(asset_location).get('md5', '')
+    key = TRANSCRIPT_CACHE.make_key(asset_location, content_hash, output_format, speed)
+    content = TRANSCRIPT_CACHE.get(key)
+    if content is None:
+        data = contentstore().find(asset_location).data
+        if input_format == 'srt' and output_format == 'sjson':
+            try:
+                cues = TranscriptCues.from_srt(data.decode('utf8'))
+            except Exception as ex:
+                raise TranscriptsGenerationException(
+                    u"Can't parse the SubRip transcript {}: {}".format(filename, ex.message)
+                )
+            content = json.dumps(cues.at_speed(speed).to_sjson_subs(), indent=2)
+        else:
+            content = Transcript.convert(data, input_format, output_format)
+        TRANSCRIPT_CACHE.set(key, content)
+    return content
+
 
 class Transcript(object):
     """
@@ -455,7 +657,7 @@ class Transcript(object):
         if input_format == 'srt':
 
             if output_format == 'txt':
-                text = SubRipFile.from_string(content.decode('utf8')).text
+                text = u'\n'.join(sub.text for sub in SubRipFile.stream(srt_lines(content.decode('utf8'))))
                 return HTMLParser().unescape(text)
 
             elif output_format == 'sjson':
@@ -16,7 +16,8 @@ from xmodule.exceptions import NotFoundError
 from xmodule.fields import RelativeTime
 
 from .transcripts_utils import (
-    get_or_create_sjson,
+    get_converted_transcript,
+    get_translation_sjson,
     TranscriptException,
     TranscriptsGenerationException,
     generate_sjson_for_all_speeds,
@@ -89,15 +90,17 @@ class VideoStudentViewHandlers(object):
             If english -> give back youtube_id subtitles:
                 Return what we have in contentstore for given youtube_id.
             If non-english:
-                a) extract youtube_id from srt file name.
-                b) try to find sjson by youtube_id and return if successful.
-                c) generate sjson from srt for all youtube speeds.
+                a) try to find the sjson which Studio generated for youtube_id and return if successful.
+                b) otherwise convert the srt to sjson at youtube_id's speed and return it.
         if non-youtube:
             If english -> give back `sub` subtitles:
                 Return what we have in contentstore for given subs_if that is stored in self.sub.
             If non-english:
                 a) try to find previously generated sjson.
-                b) otherwise generate sjson from srt and return it.
+                b) otherwise convert the srt to sjson and return it.
+
+        Transcripts are served from the transcript cache (see `get_converted_transcript`), and
+        learners' requests never write to the contentstore.
 
         Filenames naming:
             en: subs_videoid.srt.sjson
@@ -109,30 +112,19 @@ class VideoStudentViewHandlers(object):
         if youtube_id:
             # Youtube case:
             if self.transcript_language == 'en':
-                return Transcript.asset(self.location, youtube_id).data
+                return get_converted_transcript(self.location, subs_filename(youtube_id), 'sjson', 'sjson')
 
             youtube_ids = youtube_speed_dict(self)
             assert youtube_id in youtube_ids
 
-            try:
-                sjson_transcript = Transcript.asset(self.location, youtube_id, self.transcript_language).data
-            except (NotFoundError):
-                log.info("Can't find content in storage for %s transcript: generating.", youtube_id)
-                generate_sjson_for_all_speeds(
-                    self,
-                    self.transcripts[self.transcript_language],
-                    {speed: youtube_id for youtube_id, speed in youtube_ids.iteritems()},
-                    self.transcript_language
-                )
-                sjson_transcript = Transcript.asset(self.location, youtube_id, self.transcript_language).data
-
-            return sjson_transcript
+            return get_translation_sjson(self, youtube_id, youtube_ids[youtube_id])
         else:
             # HTML5 case
             if self.transcript_language == 'en':
-                return Transcript.asset(self.location, self.sub).data
+                return get_converted_transcript(self.location, subs_filename(self.sub), 'sjson', 'sjson')
             else:
-                return get_or_create_sjson(self)
+                user_subs_id = os.path.splitext(self.transcripts[self.transcript_language])[0]
+                return get_translation_sjson(self, user_subs_id)
 
     def get_transcript(self, transcript_format='srt'):
         """
@@ -159,13 +151,13 @@ class VideoStudentViewHandlers(object):
                 log.debug("No subtitles for 'en' language")
                 raise ValueError
 
-            data = Transcript.asset(self.location, transcript_name, lang).data
             filename = u'{}.{}'.format(transcript_name, transcript_format)
-            content = Transcript.convert(data, 'sjson', transcript_format)
+            content = get_converted_transcript(
+                self.location, subs_filename(transcript_name, lang), 'sjson', transcript_format
+            )
         else:
-            data = Transcript.asset(self.location, None, None, self.transcripts[lang]).data
             filename = u'{}.{}'.format(os.path.splitext(self.transcripts[lang])[0], transcript_format)
-            content = Transcript.convert(data, 'srt', transcript_format)
+            content = get_converted_transcript(self.location, self.transcripts[lang], 'srt', transcript_format)
 
         if not content:
             log.debug('no subtitles produced in get_transcript')
@@ -10,10 +10,12 @@ import json
 import logging
 
 from pkg_resources import resource_string
+from xmodule.aggregate_counters import get_aggregate_counters
 from xmodule.raw_module import EmptyDataRawDescriptor
 from xmodule.editing_module import MetadataOnlyEditingDescriptor
 from xmodule.x_module import XModule
 
+from xblock.core import XBlock
 from xblock.fields import Scope, Dict, Boolean, List, Integer, String
 
 log = logging.getLogger(__name__)
@@ -72,16 +74,19 @@ class WordCloudFields(object):
         scope=Scope.user_state,
         default=[]
     )
+    # Only used by runtimes without the aggregate_counters service; the others count the words there.
     all_words = Dict(
         help=_("All possible words from all students."),
         scope=Scope.user_state_summary
     )
+    # No longer maintained: the top words are computed from the word counts.
     top_words = Dict(
         help=_("Top num_top_words words for word cloud."),
         scope=Scope.user_state_summary
     )
 
 
+@XBlock.wants('aggregate_counters')
 class WordCloudModule(WordCloudFields, XModule):
     """WordCloud Xmodule"""
     js = {
@@ -97,18 +102,17 @@ class WordCloudModule(WordCloudFields, XModule):
     def get_state(self):
         """Return success json answer for client."""
         if self.submitted:
-            total_count = sum(self.all_words.itervalues())
+            counters = get_aggregate_counters(self)
+            top_words, total_count = counters.get_top(self, 'all_words', self.num_top_words)
             return json.dumps({
                 'status': 'success',
                 'submitted': True,
                 'display_student_percents': pretty_bool(
                     self.display_student_percents
                 ),
-                'student_words': {
-                    word: self.all_words[word] for word in self.student_words
-                },
+                'student_words': counters.get_counts(self, 'all_words', self.student_words),
                 'total_count': total_count,
-                'top_words': self.prepare_words(self.top_words, total_count)
+                'top_words': self.prepare_words(top_words, total_count)
             })
         else:
             return json.dumps({
@@ -158,24 +162,6 @@ class WordCloudModule(WordCloudFields, XModule):
             )
         return list_to_return
 
-    def top_dict(self, dict_obj, amount):
-        """Return top words from all words, filtered by number of
-        occurences
-
-        :param dict_obj: all words
-        :type dict_obj: dict
-        :param amount: number of words to be in top dict
-        :type amount: int
-        :rtype: dict
-        """
-        return dict(
-            sorted(
-                dict_obj.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:amount]
-        )
-
     def handle_ajax(self, dispatch, data):
         """Ajax handler.
 
@@ -199,26 +185,9 @@ class WordCloudModule(WordCloudFields, XModule):
             student_words = filter(None, map(self.good_word, raw_student_words))
 
             self.student_words = student_words
-
-            # FIXME: fix this, when xblock will support mutable types.
-            # Now we use this hack.
-            # speed issues
-            temp_all_words = self.all_words
-
             self.submitted = True
 
-            # Save in all_words.
-            for word in self.student_words:
-                temp_all_words[word] = temp_all_words.get(word, 0) + 1
-
-            # Update top_words.
-            self.top_words = self.top_dict(
-                temp_all_words,
-                self.num_top_words
-            )
-
-            # Save all_words in database.
-            self.all_words = temp_all_words
+            get_aggregate_counters(self).increment(self, 'all_words', self.student_words)
 
             return self.get_state()
         elif dispatch == 'get_state':
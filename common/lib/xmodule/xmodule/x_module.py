@@ -182,6 +182,11 @@ class XModuleMixin(XBlockMixin):
     # in the module
     icon_class = 'other'
 
+    # The views whose fragment is the same for every user viewing the block (no user state, anonymous ids,
+    # or context), and which the runtime may therefore render once and cache. Blocks whose answer depends on
+    # their content should override is_user_independent_view instead.
+    user_independent_views = ()
+
     display_name = String(
         display_name="Display Name",
         help="This name appears in the horizontal navigation at the top of the page.",
@@ -198,6 +203,12 @@ class XModuleMixin(XBlockMixin):
         """
         return self.runtime
 
+    def is_user_independent_view(self, view_name):
+        """
+        Return True if the view_name view renders the same fragment for every user (see user_independent_views).
+        """
+        return view_name in self.user_independent_views
+
     @property
     def course_id(self):
         return self.location.course_key
@@ -13,6 +13,32 @@ PROFILE_FEATURES = ('name', 'language', 'location', 'year_of_birth', 'gender',
                     'level_of_education', 'mailing_address', 'goals')
 AVAILABLE_FEATURES = STUDENT_FEATURES + PROFILE_FEATURES
 
+# The number of students iter_enrolled_students_features reads from the database at once
+ENROLLED_STUDENTS_CHUNK_SIZE = 1000
+
+
+def _enrolled_students(course_id):
+    """ The active students of the course, with their profiles """
+    return User.objects.filter(
+        courseenrollment__course_id=course_id,
+        courseenrollment__is_active=1,
+    ).select_related('profile')
+
+
+def _extract_student(student, features):
+    """ convert student to dictionary """
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+
+    student_dict = dict((feature, getattr(student, feature))
+                        for feature in student_features)
+    profile = student.profile
+    if profile is not None:
+        profile_dict = dict((feature, getattr(profile, feature))
+                            for feature in profile_features)
+        student_dict.update(profile_dict)
+    return student_dict
+
 
 def enrolled_students_features(course_id, features):
     """
@@ -24,27 +50,37 @@ def enrolled_students_features(course_id, features):
         {'username': 'username2', 'first_name': 'firstname2'}
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
+
+    This holds every enrolled student in memory; use iter_enrolled_students_features
+    for large courses.
     """
-    students = User.objects.filter(
-        courseenrollment__course_id=course_id,
-        courseenrollment__is_active=1,
-    ).order_by('username').select_related('profile')
-
-    def extract_student(student, features):
-        """ convert student to dictionary """
-        student_features = [x for x in STUDENT_FEATURES if x in features]
-        profile_features = [x for x in PROFILE_FEATURES if x in features]
-
-        student_dict = dict((feature, getattr(student, feature))
-                            for feature in student_features)
-        profile = student.profile
-        if profile is not None:
-            profile_dict = dict((feature, getattr(profile, feature))
-                                for feature in profile_features)
-            student_dict.update(profile_dict)
-        return student_dict
-
-    return [extract_student(student, features) for student in students]
+    students = _enrolled_students(course_id).order_by('username')
+    return [_extract_student(student, features) for student in students]
+
+
+def num_enrolled_students(course_id):
+    """ The number of students iter_enrolled_students_features will yield """
+    return _enrolled_students(course_id).count()
+
+
+def iter_enrolled_students_features(course_id, features, chunk_size=ENROLLED_STUDENTS_CHUNK_SIZE):
+    """
+    Yield the same student feature dictionaries as enrolled_students_features, in user id order.
+
+    Students are read chunk_size at a time, each chunk starting after the last id of the previous
+    one, so that neither this process nor the database holds more than a chunk of the course's
+    students at once (and no chunk pays for an ever growing OFFSET).
+    """
+    last_id = 0
+    while True:
+        chunk = _enrolled_students(course_id).filter(id__gt=last_id).order_by('id')[:chunk_size]
+        num_students = 0
+        for student in chunk.iterator():
+            num_students += 1
+            last_id = student.id
+            yield _extract_student(student, features)
+        if num_students < chunk_size:
+            return
 
 
 def dump_grading_context(course):
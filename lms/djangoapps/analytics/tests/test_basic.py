@@ -7,7 +7,10 @@ from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
-from analytics.basic import enrolled_students_features, AVAILABLE_FEATURES, STUDENT_FEATURES, PROFILE_FEATURES
+from analytics.basic import (
+    enrolled_students_features, iter_enrolled_students_features, num_enrolled_students,
+    AVAILABLE_FEATURES, STUDENT_FEATURES, PROFILE_FEATURES,
+)
 
 
 class TestAnalyticsBasic(TestCase):
@@ -39,6 +42,13 @@ class TestAnalyticsBasic(TestCase):
             self.assertIn(userreport['email'], [user.email for user in self.users])
             self.assertIn(userreport['name'], [user.profile.name for user in self.users])
 
+    def test_iter_enrolled_students_features(self):
+        query_features = ('id', 'username', 'name')
+        userreports = list(iter_enrolled_students_features(self.course_key, query_features, chunk_size=7))
+        self.assertEqual(len(userreports), num_enrolled_students(self.course_key))
+        self.assertEqual([userreport['id'] for userreport in userreports], sorted(user.id for user in self.users))
+        self.assertItemsEqual(userreports, enrolled_students_features(self.course_key, query_features))
+
     def test_available_features(self):
         self.assertEqual(len(AVAILABLE_FEATURES), len(STUDENT_FEATURES + PROFILE_FEATURES))
         self.assertEqual(set(AVAILABLE_FEATURES), set(STUDENT_FEATURES + PROFILE_FEATURES))
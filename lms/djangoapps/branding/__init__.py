@@ -5,16 +5,12 @@ from django.conf import settings
 from microsite_configuration import microsite
 
 
-def get_visible_courses():
+def get_visible_course_summaries():
     """
-    Return the set of CourseDescriptors that should be visible in this branded instance
+    Return the CourseSummaries of the courses that should be visible in this branded instance,
+    sorted by course number. No course descriptor gets loaded; a microsite's org filter is applied
+    by the modulestore query.
     """
-    _courses = modulestore().get_courses()
-
-    courses = [c for c in _courses
-               if isinstance(c, CourseDescriptor)]
-    courses = sorted(courses, key=lambda course: course.number)
-
     subdomain = microsite.get_value('subdomain', 'default')
 
     # See if we have filtered course listings in this domain
@@ -26,15 +22,32 @@ def get_visible_courses():
 
     filtered_by_org = microsite.get_value('course_org_filter')
 
+    summaries = modulestore().get_course_summaries(org=filtered_by_org or None)
+    summaries = sorted(summaries, key=lambda summary: summary.number)
+
     if filtered_by_org:
-        return [course for course in courses if course.location.org == filtered_by_org]
+        return summaries
     if filtered_visible_ids:
-        return [course for course in courses if course.id in filtered_visible_ids]
+        return [summary for summary in summaries if summary.id in filtered_visible_ids]
     else:
         # Let's filter out any courses in an "org" that has been declared to be
         # in a Microsite
         org_filter_out_set = microsite.get_all_orgs()
-        return [course for course in courses if course.location.org not in org_filter_out_set]
+        return [summary for summary in summaries if summary.org not in org_filter_out_set]
+
+
+def get_visible_courses():
+    """
+    Return the set of CourseDescriptors that should be visible in this branded instance
+
+    The visible courses are determined from their summaries, then loaded with a single bulk query.
+    """
+    visible_ids = set(summary.id for summary in get_visible_course_summaries())
+    courses = [
+        course for course in modulestore().get_courses()
+        if isinstance(course, CourseDescriptor) and course.id in visible_ids
+    ]
+    return sorted(courses, key=lambda course: course.number)
 
 
 def get_university_for_request():
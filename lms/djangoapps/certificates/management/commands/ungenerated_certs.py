@@ -3,9 +3,12 @@ Management command to find all students that need certificates for
 courses that have finished, and put their cert requests on the queue.
 """
 from django.core.management.base import BaseCommand, CommandError
+from django.test.client import RequestFactory
 from certificates.models import certificate_status_for_student
 from certificates.queue import XQueueCertInterface
 from django.contrib.auth.models import User
+from instructor_task.api import submit_generate_certificates
+from instructor_task.api_helper import AlreadyRunningError
 from optparse import make_option
 from django.conf import settings
 from opaque_keys import InvalidKeyError
@@ -28,6 +31,10 @@ class Command(BaseCommand):
 
     Use the --noop option to test without actually putting certificates on the
     queue to be generated.
+
+    Use the --background option to generate the certificates with an instructor
+    task instead, which grades the students in parallel on the celery workers.
+    Running it again after an interruption resumes the generation.
     """
 
     option_list = BaseCommand.option_list + (
@@ -55,6 +62,12 @@ class Command(BaseCommand):
                     'whose entry in the certificate table matches STATUS. '
                     'STATUS can be generating, unavailable, deleted, error '
                     'or notpassing.'),
+        make_option('-b', '--background',
+                    metavar='USERNAME',
+                    dest='background',
+                    default=False,
+                    help='Generate the certificates with a background instructor '
+                    'task requested by USERNAME, rather than one by one here'),
     )
 
     def handle(self, *args, **options):
@@ -64,7 +77,7 @@ class Command(BaseCommand):
         # to something else with the force flag
 
         if options['force']:
-            valid_statuses = getattr(CertificateStatuses, options['force'])
+            valid_statuses = [getattr(CertificateStatuses, options['force'])]
         else:
             valid_statuses = [CertificateStatuses.unavailable]
 
@@ -83,6 +96,18 @@ class Command(BaseCommand):
         else:
             raise CommandError("You must specify a course")
 
+        if options['background']:
+            requester = User.objects.get(username=options['background'])
+            request = RequestFactory().get('/', SERVER_NAME=settings.SITE_NAME)
+            request.user = requester
+            for course_key in ended_courses:
+                try:
+                    submit_generate_certificates(request, course_key, valid_statuses, insecure=options['insecure'])
+                except AlreadyRunningError:
+                    raise CommandError("The certificates of {} are already being generated".format(course_key))
+                print "Queued the generation of the certificates of {0}".format(course_key.to_deprecated_string())
+            return
+
         for course_key in ended_courses:
             # prefetch all chapters/sequentials by saying depth=2
             course = modulestore().get_course(course_key, depth=2)
@@ -149,14 +149,35 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(
             user=student, course_id=course_id)
-        d = {'status': generated_certificate.status,
-             'mode': generated_certificate.mode}
-        if generated_certificate.grade:
-            d['grade'] = generated_certificate.grade
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            d['download_url'] = generated_certificate.download_url
-
-        return d
+        return _certificate_status(generated_certificate)
     except GeneratedCertificate.DoesNotExist:
         pass
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+
+
+def certificate_statuses_for_students(students, course_id):
+    """
+    Returns {student id: certificate_status_for_student(student, course_id)} for each of
+    students, with a single query.
+    """
+    statuses = dict(
+        (student.id, {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor})
+        for student in students
+    )
+    generated_certificates = GeneratedCertificate.objects.filter(user__in=statuses.keys(), course_id=course_id)
+    for generated_certificate in generated_certificates:
+        statuses[generated_certificate.user_id] = _certificate_status(generated_certificate)
+    return statuses
+
+
+def _certificate_status(generated_certificate):
+    """
+    The certificate_status_for_student dictionary of an existing GeneratedCertificate
+    """
+    d = {'status': generated_certificate.status,
+         'mode': generated_certificate.mode}
+    if generated_certificate.grade:
+        d['grade'] = generated_certificate.grade
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        d['download_url'] = generated_certificate.download_url
+    return d
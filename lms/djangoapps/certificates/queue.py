@@ -74,6 +74,8 @@ class XQueueCertInterface(object):
             settings.XQUEUE_INTERFACE['url'],
             settings.XQUEUE_INTERFACE['django_auth'],
             requests_auth,
+            pool_size=settings.XQUEUE_POOL_SIZE,
+            timeout=settings.XQUEUE_REQUEST_TIMEOUT,
         )
         self.whitelist = CertificateWhitelist.objects.all()
         self.restricted = UserProfile.objects.filter(allow_certificate=False)
@@ -125,7 +127,8 @@ class XQueueCertInterface(object):
 
         raise NotImplementedError
 
-    def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, title='None'):
+    def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, title='None',
+                 cert_status=None):
         """
         Request a new certificate for a student.
 
@@ -135,6 +138,9 @@ class XQueueCertInterface(object):
           forced_grade - a string indicating a grade parameter to pass with
                          the certificate request. If this is given, grading
                          will be skipped.
+          cert_status - the student's current certificate status, if the
+                        caller already fetched it (e.g., in bulk with
+                        certificate_statuses_for_students)
 
         Will change the certificate status to 'generating'.
 
@@ -159,7 +165,8 @@ class XQueueCertInterface(object):
                           status.error,
                           status.notpassing]
 
-        cert_status = certificate_status_for_student(student, course_id)['status']
+        if cert_status is None:
+            cert_status = certificate_status_for_student(student, course_id)['status']
 
         new_status = cert_status
 
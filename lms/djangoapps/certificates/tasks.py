@@ -0,0 +1,137 @@
+"""
+Background generation of a course's certificates, as an instructor task.
+
+The parent task queues one subtask per settings.CERT_GENERATION_STUDENTS_PER_TASK students who
+still need a certificate, so that the students are graded in parallel by all the celery workers.
+Each subtask fetches the certificate statuses of its students with a single query, and submits
+their certificate requests over one xqueue session.
+
+Only the students whose certificate status is still one of the requested statuses are queued, so
+submitting the task again after a failure resumes where the first run stopped, rather than
+regrading the students it already handled.
+"""
+import json
+import logging
+
+from celery import task
+from celery.states import SUCCESS, FAILURE
+from django.conf import settings
+from django.contrib.auth.models import User
+from dogapi import dog_stats_api
+
+from certificates.models import CertificateStatuses, GeneratedCertificate, certificate_statuses_for_students
+from certificates.queue import XQueueCertInterface
+from instructor_task.models import InstructorTask
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    queue_subtasks_for_query,
+    check_subtask_is_valid,
+    update_subtask_status,
+)
+from xmodule.modulestore.django import modulestore
+
+log = logging.getLogger(__name__)
+
+
+def students_needing_certificates(course_id, valid_statuses):
+    """
+    The students enrolled in the course whose certificate status is one of valid_statuses
+    """
+    students = User.objects.filter(courseenrollment__course_id=course_id)
+    # students without a GeneratedCertificate are unavailable
+    other_statuses = GeneratedCertificate.objects.filter(course_id=course_id).exclude(status__in=valid_statuses)
+    students = students.exclude(id__in=other_statuses.values('user_id'))
+    if CertificateStatuses.unavailable not in valid_statuses:
+        students = students.filter(
+            id__in=GeneratedCertificate.objects.filter(course_id=course_id).values('user_id')
+        )
+    return students
+
+
+def perform_delegate_certificate_generation(entry_id, course_id, task_input, action_name):
+    """
+    Queues subtasks generating the certificates of the course's students whose certificate status
+    is one of `task_input['statuses']`, in chunks of settings.CERT_GENERATION_STUDENTS_PER_TASK.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    task_id = entry.task_id
+
+    # As for bulk email, a parent task which already queued its subtasks must have been requeued
+    # by Celery, and must not queue them again.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        log.warning(u"Task %s has already queued its certificate generation subtasks!", task_id)
+        return json.loads(entry.task_output)
+
+    def _create_generate_certificates_subtask(student_list, initial_subtask_status):
+        """Creates a subtask to generate the certificates of the given students."""
+        return generate_certificates.subtask(
+            (entry_id, student_list, task_input, initial_subtask_status.to_dict()),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    log.info(u"Task %s: Preparing to queue subtasks generating the certificates of %s", task_id, course_id)
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_generate_certificates_subtask,
+        students_needing_certificates(course_id, task_input['statuses']),
+        ['username'],
+        settings.CERT_GENERATION_STUDENTS_PER_TASK,
+    )
+
+
+@task()  # pylint: disable=not-callable
+def generate_certificates(entry_id, student_list, task_input, subtask_status_dict):
+    """
+    Grades the students of student_list (dicts with their 'pk') and requests the certificates of
+    those who qualify. Records the number of certificate requests made (succeeded), of students
+    whose certificate status changed since the subtask was queued (skipped), and of students who
+    couldn't be handled (failed) in the parent InstructorTask.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    course_id = InstructorTask.objects.get(pk=entry_id).course_id
+    try:
+        with dog_stats_api.timer('certificates.generation.subtask.time', tags=[u'course_id:{}'.format(course_id)]):
+            _generate_certificates(course_id, [item['pk'] for item in student_list], task_input, subtask_status)
+    except Exception:
+        log.exception(u"Certificate generation subtask %s failed unexpectedly!", current_task_id)
+        num_left = len(student_list) - subtask_status.attempted - subtask_status.skipped
+        subtask_status.increment(failed=num_left, state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    subtask_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    return subtask_status.to_dict()
+
+
+def _generate_certificates(course_id, student_ids, task_input, subtask_status):
+    """
+    Request the certificates of the students, updating subtask_status as they're handled
+    """
+    # prefetch all chapters/sequentials by saying depth=2
+    course = modulestore().get_course(course_id, depth=2)
+    students = list(User.objects.filter(id__in=student_ids).order_by('id'))
+    statuses = certificate_statuses_for_students(students, course_id)
+
+    xq = XQueueCertInterface()
+    if task_input.get('insecure'):
+        xq.use_https = False
+
+    for student in students:
+        cert_status = statuses[student.id]['status']
+        if cert_status not in task_input['statuses']:
+            subtask_status.increment(skipped=1)
+            continue
+        try:
+            new_status = xq.add_cert(student, course_id, course=course, cert_status=cert_status)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u"Couldn't generate the certificate of %s in %s", student.username, course_id)
+            subtask_status.increment(failed=1)
+        else:
+            dog_stats_api.increment('certificates.generation.student', tags=[u'status:{}'.format(new_status)])
+            subtask_status.increment(succeeded=1)
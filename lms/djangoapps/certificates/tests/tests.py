@@ -3,11 +3,18 @@ Tests for the certificates models.
 """
 
 from django.test import TestCase
+from mock import Mock, patch
 
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.modulestore.tests.factories import CourseFactory
 
-from student.tests.factories import UserFactory
-from certificates.models import CertificateStatuses, GeneratedCertificate, certificate_status_for_student
+from instructor_task.subtasks import SubtaskStatus
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from certificates.models import (
+    CertificateStatuses, GeneratedCertificate, certificate_status_for_student, certificate_statuses_for_students
+)
+from certificates.tasks import students_needing_certificates, _generate_certificates
+from certificates.tests.factories import GeneratedCertificateFactory
 
 
 class CertificatesModelTest(TestCase):
@@ -22,3 +29,56 @@ class CertificatesModelTest(TestCase):
         certificate_status = certificate_status_for_student(student, course.id)
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
+
+
+class CertificateGenerationTest(TestCase):
+    """
+    Tests for the background generation of certificates
+    """
+
+    def setUp(self):
+        self.course_id = SlashSeparatedCourseKey('edx', 'certs', 'run')
+        self.students = [UserFactory() for __ in xrange(4)]
+        for student in self.students:
+            CourseEnrollmentFactory.create(user=student, course_id=self.course_id)
+        GeneratedCertificateFactory.create(
+            user=self.students[1], course_id=self.course_id, status=CertificateStatuses.downloadable
+        )
+        GeneratedCertificateFactory.create(
+            user=self.students[2], course_id=self.course_id, status=CertificateStatuses.notpassing
+        )
+
+    def test_certificate_statuses_for_students(self):
+        with self.assertNumQueries(1):
+            statuses = certificate_statuses_for_students(self.students, self.course_id)
+        for student in self.students:
+            self.assertEqual(statuses[student.id], certificate_status_for_student(student, self.course_id))
+
+    def test_students_needing_certificates(self):
+        self.assertItemsEqual(
+            students_needing_certificates(self.course_id, [CertificateStatuses.unavailable]),
+            [self.students[0], self.students[3]]
+        )
+        self.assertItemsEqual(
+            students_needing_certificates(self.course_id, [CertificateStatuses.notpassing]),
+            [self.students[2]]
+        )
+
+    @patch('certificates.tasks.modulestore', Mock())
+    @patch('certificates.tasks.XQueueCertInterface')
+    def test_generate_certificates(self, mock_interface):
+        mock_interface.return_value.add_cert.side_effect = [CertificateStatuses.generating, Exception('xqueue')]
+        subtask_status = SubtaskStatus.create('subtask')
+
+        _generate_certificates(
+            self.course_id,
+            [student.id for student in self.students],
+            {'statuses': [CertificateStatuses.unavailable]},
+            subtask_status,
+        )
+        # the students who have certificates are skipped, the others' certificates requested
+        self.assertEqual((subtask_status.succeeded, subtask_status.failed, subtask_status.skipped), (1, 1, 2))
+        self.assertEqual(
+            [call[0][0] for call in mock_interface.return_value.add_cert.call_args_list],
+            [self.students[0], self.students[3]]
+        )
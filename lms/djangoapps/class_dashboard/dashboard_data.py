@@ -5,7 +5,7 @@ from util.json_request import JsonResponse
 import json
 
 from courseware import models
-from django.db.models import Count
+from django.db.models import Sum
 from django.utils.translation import ugettext as _
 
 from xmodule.modulestore.django import modulestore
@@ -31,12 +31,10 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
+    # Read the grade data for all problems in course from their rollups
+    db_query = models.ProblemGradeRollup.objects.filter(
         course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Sum('count')).filter(count_grade__gt=0)
 
     prob_grade_distrib = {}
     total_student_count = {}
@@ -74,11 +72,10 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
+    # Read the "opening a subsection" data from the rollups
+    db_query = models.SequentialOpenRollup.objects.filter(
         course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    ).values('module_state_key').annotate(count_sequential=Sum('count')).filter(count_sequential__gt=0)
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
@@ -104,17 +101,15 @@ def get_problem_set_grade_distrib(course_id, problem_set):
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
+    # Read the grade data for set of problems in course from their rollups
+    db_query = models.ProblemGradeRollup.objects.filter(
         course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
         module_state_key__in=problem_set,
     ).values(
         'module_state_key',
         'grade',
         'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+    ).annotate(count_grade=Sum('count')).filter(count_grade__gt=0).order_by('module_state_key', 'grade')
 
     prob_grade_distrib = {}
 
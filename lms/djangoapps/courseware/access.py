@@ -21,11 +21,19 @@ from django.utils.timezone import UTC
 from student.models import CourseEnrollment
 from student.roles import (
     GlobalStaff, CourseStaffRole, CourseInstructorRole,
-    OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole
+    OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole, RoleCache
 )
 from opaque_keys.edx.keys import CourseKey, UsageKey
+from request_cache.middleware import RequestCache
 DEBUG_ACCESS = False
 
+# request cache names for the memoized has_access results and the access check counters
+ACCESS_MEMO_CACHE_NAME = 'courseware.access.has_access'
+ACCESS_COUNTS_CACHE_NAME = 'courseware.access.counts'
+
+# actions whose answer depends on state which may change during the request (e.g., enrollments)
+UNMEMOIZED_ACTIONS = frozenset(['enroll', 'load_forum'])
+
 log = logging.getLogger(__name__)
 
 
@@ -63,11 +71,62 @@ def has_access(user, action, obj, course_key=None):
 
     Returns a bool.  It is up to the caller to actually deny access in a way
     that makes sense in context.
+
+    While handling a request, the results are memoized for the rest of the request.
     """
     # Just in case user is passed in as None, make them anonymous
     if not user:
         user = AnonymousUser()
 
+    if not RequestCache.is_request_active() or action in UNMEMOIZED_ACTIONS:
+        return _has_access(user, action, obj, course_key)
+
+    counts = RequestCache.get_cache(ACCESS_COUNTS_CACHE_NAME)
+    counts['checks'] = counts.get('checks', 0) + 1
+
+    memo = RequestCache.get_cache(ACCESS_MEMO_CACHE_NAME)
+    memo_key = _access_memo_key(user, action, obj, course_key)
+    if memo_key in memo:
+        counts['memoized'] = counts.get('memoized', 0) + 1
+        return memo[memo_key]
+
+    result = memo[memo_key] = _has_access(user, action, obj, course_key)
+    return result
+
+
+def get_access_check_counts():
+    """
+    Returns a dict of the number of has_access 'checks' made so far in the current request
+    and how many of those were answered from the request's memo ('memoized').
+    """
+    counts = RequestCache.get_cache(ACCESS_COUNTS_CACHE_NAME)
+    return {'checks': counts.get('checks', 0), 'memoized': counts.get('memoized', 0)}
+
+
+def _access_memo_key(user, action, obj, course_key):
+    """
+    Returns the key under which has_access memoizes its result for the current request.
+
+    XBlocks are identified by their class and usage id. The user's RoleCache is part of the key so that
+    changing the user's roles (which replaces the RoleCache) invalidates the memoized results.
+    """
+    if isinstance(obj, XBlock):
+        obj_key = (obj.__class__, obj.scope_ids.usage_id)
+    else:
+        obj_key = obj
+
+    if user.is_authenticated():
+        user_key = (user.id, user.is_staff, is_masquerading_as_student(user), RoleCache.for_user(user))
+    else:
+        user_key = None
+
+    return (user_key, action, obj_key, course_key)
+
+
+def _has_access(user, action, obj, course_key=None):
+    """
+    The actual (unmemoized) access check. See has_access.
+    """
     # delegate the work to type-specific functions.
     # (start with more specific types, then get more general)
     if isinstance(obj, CourseDescriptor):
@@ -0,0 +1,126 @@
+"""
+Counters aggregated over all the users of a module, stored as XModuleAggregateCounter rows.
+
+Each counter is spread over settings.AGGREGATE_COUNTER_SHARDS rows, and every increment is a single
+`UPDATE ... SET count = count + delta` of a randomly chosen shard, so concurrent increments neither
+lose updates nor queue up on the same row. The largest counters of a module (e.g., the words in a
+word cloud) are computed in the database and cached; increments keep the cached list up to date
+instead of recomputing it.
+"""
+import hashlib
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+
+from courseware.models import XModuleAggregateCounter
+from util.query import increment_sharded_count
+
+
+def _counters(usage_id, counter_name):
+    """
+    The rows of the usage's counter_name counters
+    """
+    return XModuleAggregateCounter.objects.filter(usage_id=usage_id, counter_name=counter_name)
+
+
+def _top_cache_key(usage_id, counter_name):
+    """
+    The cache key of the usage's cached top counters
+    """
+    return 'courseware.aggregate_counters.top.{}'.format(
+        hashlib.md5(u'{}|{}'.format(usage_id, counter_name).encode('utf-8')).hexdigest()
+    )
+
+
+def _increment_shard(usage_id, counter_name, key, delta):
+    """
+    Atomically add delta to a random shard of the counter, creating the shard if needed
+    """
+    increment_sharded_count(
+        XModuleAggregateCounter, delta, settings.AGGREGATE_COUNTER_SHARDS,
+        usage_id=usage_id, counter_name=counter_name, key=key,
+    )
+
+
+def increment(usage_id, counter_name, keys, delta=1):
+    """
+    Add delta to the counter of each of keys (a key listed twice is incremented twice).
+
+    Returns:
+        {key: count} of the incremented keys, after the increment
+    """
+    deltas = Counter(keys)
+    for key, count in deltas.iteritems():
+        _increment_shard(usage_id, counter_name, key, count * delta)
+
+    counts = get_counts(usage_id, counter_name, deltas.keys())
+    _update_cached_top(usage_id, counter_name, counts, sum(deltas.values()) * delta)
+    return counts
+
+
+def get_counts(usage_id, counter_name, keys=None):
+    """
+    Returns {key: count} of keys (all the counted keys if keys is None); keys never counted are 0.
+    """
+    rows = _counters(usage_id, counter_name)
+    if keys is not None:
+        keys = set(keys)
+        rows = rows.filter(key__in=keys)
+    counts = dict(rows.values_list('key').annotate(total=Sum('count')))
+    if keys is not None:
+        for key in keys:
+            counts.setdefault(key, 0)
+    return counts
+
+
+def get_top(usage_id, counter_name, size):
+    """
+    Returns the size largest (positive) counters as {key: count}, and the sum of all of the counters.
+    Read from the cache when possible.
+    """
+    cache_key = _top_cache_key(usage_id, counter_name)
+    cached = cache.get(cache_key)
+    if cached is not None and cached['size'] == size:
+        return cached['top'], cached['total']
+
+    rows = _counters(usage_id, counter_name)
+    top = dict(
+        rows.values_list('key').annotate(total=Sum('count')).filter(total__gt=0).order_by('-total')[:size]
+    )
+    total = rows.aggregate(total=Sum('count'))['total'] or 0
+    cache.set(
+        cache_key, {'size': size, 'top': top, 'total': total}, settings.AGGREGATE_COUNTER_TOP_CACHE_TIMEOUT
+    )
+    return top, total
+
+
+def _update_cached_top(usage_id, counter_name, counts, total_delta):
+    """
+    Fold the new counts of just incremented keys into the cached top counters, if they're cached.
+
+    Increments only ever move keys up, so the new top is the old one with the incremented keys
+    rising into it (and pushing out its smallest counters). Decrements could bring up keys which
+    aren't in the cached top at all, so they just drop the cached top. Concurrent updates of the
+    cached value may lose one another's changes; the cache timeout bounds how long that shows.
+    """
+    cache_key = _top_cache_key(usage_id, counter_name)
+    cached = cache.get(cache_key)
+    if cached is None:
+        return
+    if total_delta < 0:
+        cache.delete(cache_key)
+        return
+
+    top = cached['top']
+    for key, count in counts.iteritems():
+        if key in top or len(top) < cached['size']:
+            top[key] = count
+        else:
+            smallest = min(top, key=top.get)
+            if count > top[smallest]:
+                del top[smallest]
+                top[key] = count
+    cached['total'] += total_delta
+    cache.set(cache_key, cached, settings.AGGREGATE_COUNTER_TOP_CACHE_TIMEOUT)
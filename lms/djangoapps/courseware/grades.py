@@ -6,6 +6,7 @@ import random
 import logging
 
 from contextlib import contextmanager
+import numpy
 from django.conf import settings
 from django.db import transaction
 from django.test.client import RequestFactory
@@ -301,6 +302,30 @@ def grade_for_percentage(grade_cutoffs, percentage):
     return letter_grade
 
 
+def round_percentages(percentages):
+    """
+    Rounds an array of the course grader's percents as grade() rounds its percent: up (from x.5%) to whole
+    percentages. Python 2's round() rounds halves away from zero (unlike numpy's), so the rounding is spelled out.
+    """
+    scaled = percentages * 100 + 0.05
+    rounded = numpy.floor(scaled)
+    rounded += (scaled - rounded) >= 0.5
+    return rounded / 100
+
+
+def grades_for_percentages(grade_cutoffs, percentages):
+    """
+    Returns an (object) array of the letter grades (or None) of an array of percentages, as grade_for_percentage
+    """
+    letter_grades = numpy.empty(len(percentages), dtype=object)
+    ungraded = numpy.ones(len(percentages), dtype=bool)
+    for possible_grade in sorted(grade_cutoffs, key=lambda x: grade_cutoffs[x], reverse=True):
+        earned = ungraded & (percentages >= grade_cutoffs[possible_grade])
+        letter_grades[earned] = possible_grade
+        ungraded &= ~earned
+    return letter_grades
+
+
 @transaction.commit_manually
 def progress_summary(student, request, course):
     """
@@ -0,0 +1,37 @@
+"""
+Recompute the class dashboard's grade and subsection opening rollups from the StudentModule table.
+
+Run it once to backfill the rollups of the existing courses, and whenever StudentModules were changed
+without going through their model's save and delete (e.g., queryset updates or raw SQL), which don't
+update the rollups.
+"""
+import logging
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courseware.models import StudentModule, rebuild_rollups
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+
+LOG = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Recompute the class dashboard rollups of the given courses (of every course, if none are given).
+    """
+    args = "[<course_id> ...]"
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        if not args:
+            args = StudentModule.objects.values_list('course_id', flat=True).distinct()
+        try:
+            course_ids = [SlashSeparatedCourseKey.from_deprecated_string(arg) for arg in args]
+        except InvalidKeyError as ex:
+            raise CommandError("Invalid course_id: {}".format(ex))
+
+        for course_id in course_ids:
+            LOG.info(u"Rebuilding the rollups of %s", course_id)
+            rebuild_rollups(course_id)
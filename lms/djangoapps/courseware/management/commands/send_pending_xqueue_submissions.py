@@ -0,0 +1,37 @@
+"""
+Queue again the delivery of the learners' Xqueue submissions which have been pending for more than the given
+number of minutes (60 by default): those whose task gave up retrying, or was lost with its celery worker.
+"""
+import datetime
+import logging
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from courseware.models import PendingXQueueSubmission
+from courseware.tasks import send_pending_xqueue_submission
+
+LOG = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Queue the send_pending_xqueue_submission tasks of the submissions pending for too long.
+    """
+    args = "[<minutes>]"
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        if len(args) > 1:
+            raise CommandError("Expected at most one argument: the number of minutes")
+        try:
+            minutes = int(args[0]) if args else 60
+        except ValueError:
+            raise CommandError("Invalid number of minutes: {}".format(args[0]))
+
+        cutoff = timezone.now() - datetime.timedelta(minutes=minutes)
+        submission_ids = PendingXQueueSubmission.objects.filter(created__lt=cutoff).values_list('id', flat=True)
+        for submission_id in submission_ids:
+            send_pending_xqueue_submission.delay(submission_id)
+        LOG.info(u"Queued %d pending Xqueue submissions", len(submission_ids))
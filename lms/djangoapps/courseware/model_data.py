@@ -44,8 +44,14 @@ class FieldDataCache(object):
     """
     A cache of django model objects needed to supply the data
     for a module and its decendants
+
+    In lazy mode, the user_state and user_state_summary of the descriptors
+    are only loaded when first looked up, together with those of the
+    descriptor's siblings (see `prefetch` to load some up front). The
+    prefetch_hits and prefetch_misses count the descriptors whose data was,
+    and wasn't, already loaded when first looked up.
     """
-    def __init__(self, descriptors, course_id, user, select_for_update=False):
+    def __init__(self, descriptors, course_id, user, select_for_update=False, children=None):
         '''
         Find any courseware.models objects that are needed by any descriptor
         in descriptors. Attempts to minimize the number of queries to the database.
@@ -57,6 +63,8 @@ class FieldDataCache(object):
         course_id: The id of the current course
         user: The user for which to cache data
         select_for_update: True if rows should be locked until end of transaction
+        children: For lazy mode, a dict mapping the usage id of each descriptor
+            to the list of its children in descriptors (its siblings' group)
         '''
         self.cache = {}
         self.descriptors = descriptors
@@ -66,15 +74,32 @@ class FieldDataCache(object):
         self.course_id = course_id
         self.user = user
 
-        if user.is_authenticated():
-            for scope, fields in self._fields_to_cache().items():
-                for field_object in self._retrieve_fields(scope, fields):
-                    self.cache[self._cache_key_from_field_object(scope, field_object)] = field_object
+        self.lazy = children is not None
+        self._children = children or {}
+        # lazy mode: usage id -> the descriptors loaded along with it, and the usage ids loaded or looked up so far
+        self._groups = {}
+        self._loaded = set()
+        self._looked_up = set()
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+
+        if not user.is_authenticated():
+            return
+        if self.lazy:
+            for descriptor in descriptors:
+                self._groups[descriptor.scope_ids.usage_id] = [descriptor]
+            for group in self._children.itervalues():
+                for descriptor in group:
+                    self._groups[descriptor.scope_ids.usage_id] = group
+            # preferences and user_info aren't per block: load them up front
+            self._load(descriptors, (Scope.preferences, Scope.user_info))
+        else:
+            self._load(descriptors)
 
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
                                          descriptor_filter=lambda descriptor: True,
-                                         select_for_update=False):
+                                         select_for_update=False, lazy=False):
         """
         course_id: the course in the context of which we want StudentModules.
         user: the django user for whom to load modules.
@@ -84,7 +109,11 @@ class FieldDataCache(object):
         descriptor_filter is a function that accepts a descriptor and return wether the StudentModule
             should be cached
         select_for_update: Flag indicating whether the rows should be locked until end of transaction
+        lazy: Flag indicating whether to load the descriptors' state when they are first looked up, a
+            group of siblings at a time (see FieldDataCache.prefetch)
         """
+        # usage id -> the (filtered) children of the descriptor
+        children = {}
 
         def get_child_descriptors(descriptor, depth, descriptor_filter):
             """
@@ -104,14 +133,72 @@ class FieldDataCache(object):
             if depth is None or depth > 0:
                 new_depth = depth - 1 if depth is not None else depth
 
+                child_descriptors = children[descriptor.scope_ids.usage_id] = []
                 for child in descriptor.get_children() + descriptor.get_required_module_descriptors():
+                    if descriptor_filter(child):
+                        child_descriptors.append(child)
                     descriptors.extend(get_child_descriptors(child, new_depth, descriptor_filter))
 
             return descriptors
 
         descriptors = get_child_descriptors(descriptor, depth, descriptor_filter)
 
-        return FieldDataCache(descriptors, course_id, user, select_for_update)
+        return FieldDataCache(descriptors, course_id, user, select_for_update, children if lazy else None)
+
+    def prefetch(self, descriptor):
+        """
+        In lazy mode, load the state of descriptor and of its descendants (e.g. the active
+        position of a sequence, which is about to be rendered) now, in one query per scope.
+        """
+        if not self.lazy or not self.user.is_authenticated():
+            return
+        descendants = []
+        to_visit = [descriptor]
+        while to_visit:
+            current = to_visit.pop()
+            descendants.append(current)
+            to_visit.extend(self._children.get(current.scope_ids.usage_id, []))
+        self._load(descendants)
+
+    def _load(self, descriptors, scopes=None):
+        """
+        Query the descriptors' fields (in `scopes`, if given) into the cache. In lazy mode, loads
+        the per block scopes of the descriptors which aren't loaded yet, unless given `scopes`.
+        """
+        if self.lazy and scopes is None:
+            descriptors = [
+                descriptor for descriptor in descriptors if descriptor.scope_ids.usage_id not in self._loaded
+            ]
+            self._loaded.update(descriptor.scope_ids.usage_id for descriptor in descriptors)
+            scopes = (Scope.user_state, Scope.user_state_summary)
+        for scope, fields in self._fields_to_cache(descriptors).items():
+            if scopes is not None and scope not in scopes:
+                continue
+            for field_object in self._retrieve_fields(scope, fields, descriptors):
+                self.cache[self._cache_key_from_field_object(scope, field_object)] = field_object
+
+    def _load_on_lookup(self, key):
+        """
+        In lazy mode, load the state of the key's block with its siblings on the block's first lookup
+        """
+        if key.scope not in (Scope.user_state, Scope.user_state_summary):
+            return
+        usage_id = key.block_scope_id
+        if usage_id in self._looked_up or usage_id not in self._groups:
+            return
+        self._looked_up.add(usage_id)
+        if usage_id in self._loaded:
+            self.prefetch_hits += 1
+        else:
+            self.prefetch_misses += 1
+            self._load(self._groups[usage_id])
+
+    def prefetch_hit_ratio(self):
+        """
+        The fraction of the descriptors looked up whose state was already loaded, or None if none was looked up
+        """
+        looked_up = self.prefetch_hits + self.prefetch_misses
+        return float(self.prefetch_hits) / looked_up if looked_up else None
 
     def _query(self, model_class, **kwargs):
         """
@@ -138,15 +225,15 @@ class FieldDataCache(object):
         )
         return res
 
-    def _retrieve_fields(self, scope, fields):
+    def _retrieve_fields(self, scope, fields, descriptors):
         """
-        Queries the database for all of the fields in the specified scope
+        Queries the database for all of the fields in the specified scope of the descriptors
         """
         if scope == Scope.user_state:
             return self._chunked_query(
                 StudentModule,
                 'module_state_key__in',
-                (descriptor.scope_ids.usage_id for descriptor in self.descriptors),
+                (descriptor.scope_ids.usage_id for descriptor in descriptors),
                 course_id=self.course_id,
                 student=self.user.pk,
             )
@@ -154,14 +241,14 @@ class FieldDataCache(object):
             return self._chunked_query(
                 XModuleUserStateSummaryField,
                 'usage_id__in',
-                (descriptor.scope_ids.usage_id for descriptor in self.descriptors),
+                (descriptor.scope_ids.usage_id for descriptor in descriptors),
                 field_name__in=set(field.name for field in fields),
             )
         elif scope == Scope.preferences:
             return self._chunked_query(
                 XModuleStudentPrefsField,
                 'module_type__in',
-                set(descriptor.scope_ids.block_type for descriptor in self.descriptors),
+                set(descriptor.scope_ids.block_type for descriptor in descriptors),
                 student=self.user.pk,
                 field_name__in=set(field.name for field in fields),
             )
@@ -174,12 +261,12 @@ class FieldDataCache(object):
         else:
             return []
 
-    def _fields_to_cache(self):
+    def _fields_to_cache(self, descriptors):
         """
-        Returns a map of scopes to fields in that scope that should be cached
+        Returns a map of scopes to fields in that scope that should be cached for the descriptors
         """
         scope_map = defaultdict(set)
-        for descriptor in self.descriptors:
+        for descriptor in descriptors:
             for field in descriptor.fields.values():
                 scope_map[field.scope].add(field)
         return scope_map
@@ -224,6 +311,8 @@ class FieldDataCache(object):
             # user we were constructed for.
             assert key.user_id == self.user.id
 
+        if self.lazy:
+            self._load_on_lookup(key)
         return self.cache.get(self._cache_key_from_kvs_key(key))
 
     def find_or_create(self, key):
@@ -14,10 +14,11 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 """
 from django.contrib.auth.models import User
 from django.conf import settings
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 
+from util.query import increment_sharded_count
 from xmodule_django.models import CourseKeyField, LocationKeyField
 
 
@@ -129,6 +130,155 @@ class StudentModuleHistory(models.Model):
             history_entry.save()
 
 
+class ProblemGradeRollup(models.Model):
+    """
+    The number of students with each grade on a problem: the StudentModule rows of a problem grouped
+    by (grade, max_grade). Kept up to date as StudentModules are saved and deleted, so that the class
+    dashboard doesn't have to group the whole StudentModule table of the course.
+
+    Like the XModuleAggregateCounters, each count is spread over several shard rows, so that concurrent
+    increments rarely contend for the same row; the count is the sum of its shards.
+    """
+
+    class Meta:
+        unique_together = (('course_id', 'module_state_key', 'grade', 'max_grade', 'shard'),)
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255)
+    grade = models.FloatField()
+    max_grade = models.FloatField(null=True, blank=True)
+    shard = models.PositiveSmallIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    def __repr__(self):
+        return 'ProblemGradeRollup<%r>' % ({
+            'course_id': self.course_id,
+            'module_state_key': self.module_state_key,
+            'grade': self.grade,
+            'max_grade': self.max_grade,
+            'shard': self.shard,
+            'count': self.count,
+        },)
+
+    def __unicode__(self):
+        return unicode(repr(self))
+
+
+class SequentialOpenRollup(models.Model):
+    """
+    The number of students who opened a sequential: the number of its StudentModule rows. Kept up to
+    date as StudentModules are saved and deleted, in shards like the ProblemGradeRollups.
+    """
+
+    class Meta:
+        unique_together = (('course_id', 'module_state_key', 'shard'),)
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255)
+    shard = models.PositiveSmallIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    def __repr__(self):
+        return 'SequentialOpenRollup<%r>' % ({
+            'course_id': self.course_id,
+            'module_state_key': self.module_state_key,
+            'shard': self.shard,
+            'count': self.count,
+        },)
+
+    def __unicode__(self):
+        return unicode(repr(self))
+
+
+def _rolled_up_grade(instance):
+    """
+    The (grade, max_grade) bucket of ProblemGradeRollup which counts the StudentModule, or None
+    """
+    if instance.module_type != 'problem' or instance.grade is None:
+        return None
+    return (instance.grade, instance.max_grade)
+
+
+def _increment_rollups(instance, grade_bucket, delta):
+    """
+    Add delta to a shard of the rollups counting the StudentModule in grade_bucket
+    """
+    if instance.module_type == 'sequential':
+        increment_sharded_count(
+            SequentialOpenRollup, delta, settings.AGGREGATE_COUNTER_SHARDS,
+            course_id=instance.course_id, module_state_key=instance.module_state_key,
+        )
+    elif grade_bucket is not None:
+        increment_sharded_count(
+            ProblemGradeRollup, delta, settings.AGGREGATE_COUNTER_SHARDS,
+            course_id=instance.course_id, module_state_key=instance.module_state_key,
+            grade=grade_bucket[0], max_grade=grade_bucket[1],
+        )
+
+
+@receiver(post_init, sender=StudentModule)
+def remember_rolled_up_grade(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remember the grade bucket the StudentModule was loaded with, to move it out of it when it's saved
+    """
+    instance._rolled_up_grade = _rolled_up_grade(instance)  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=StudentModule)
+def update_rollups(sender, instance, created, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """
+    Count a new StudentModule in the rollups, or move a regraded one to its new grade bucket
+    """
+    # pylint: disable=protected-access
+    if raw:
+        return
+    grade_bucket = _rolled_up_grade(instance)
+    if created:
+        _increment_rollups(instance, grade_bucket, 1)
+    elif grade_bucket != instance._rolled_up_grade:
+        _increment_rollups(instance, instance._rolled_up_grade, -1)
+        _increment_rollups(instance, grade_bucket, 1)
+    instance._rolled_up_grade = grade_bucket
+
+
+@receiver(post_delete, sender=StudentModule)
+def remove_from_rollups(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Stop counting a deleted StudentModule in the rollups
+    """
+    _increment_rollups(instance, instance._rolled_up_grade, -1)  # pylint: disable=protected-access
+
+
+def rebuild_rollups(course_id):
+    """
+    Recompute the rollups of the course from its StudentModules. Needed to backfill the rollups, and to
+    repair them after StudentModules were changed without signals (e.g., by queryset updates).
+    """
+    grades = StudentModule.objects.filter(
+        course_id=course_id, module_type='problem', grade__isnull=False,
+    ).values('module_state_key', 'grade', 'max_grade').annotate(total=models.Count('id'))
+    opens = StudentModule.objects.filter(
+        course_id=course_id, module_type='sequential',
+    ).values('module_state_key').annotate(total=models.Count('id'))
+
+    with transaction.commit_on_success():
+        ProblemGradeRollup.objects.filter(course_id=course_id).delete()
+        ProblemGradeRollup.objects.bulk_create([
+            ProblemGradeRollup(
+                course_id=course_id, module_state_key=row['module_state_key'],
+                grade=row['grade'], max_grade=row['max_grade'], count=row['total'],
+            )
+            for row in grades
+        ])
+        SequentialOpenRollup.objects.filter(course_id=course_id).delete()
+        SequentialOpenRollup.objects.bulk_create([
+            SequentialOpenRollup(
+                course_id=course_id, module_state_key=row['module_state_key'], count=row['total']
+            )
+            for row in opens
+        ])
+
+
 class XModuleUserStateSummaryField(models.Model):
     """
     Stores data set in the Scope.user_state_summary scope by an xmodule field
@@ -160,6 +310,42 @@ class XModuleUserStateSummaryField(models.Model):
         return unicode(repr(self))
 
 
+class XModuleAggregateCounter(models.Model):
+    """
+    One shard of a counter aggregated over all the users of a module (e.g., the number of
+    students who entered a word in a word cloud). Each counter is spread over several rows so
+    that concurrent increments rarely contend for the same row; its value is the sum of its shards.
+    """
+
+    class Meta:
+        unique_together = (('usage_id', 'counter_name', 'key', 'shard'),)
+
+    # The name of the set of counters (e.g., the name of the field they replace)
+    counter_name = models.CharField(max_length=64)
+
+    # The usage id of the module
+    usage_id = LocationKeyField(max_length=255, db_index=True)
+
+    # The thing being counted
+    key = models.CharField(max_length=255)
+
+    shard = models.PositiveSmallIntegerField(default=0)
+
+    count = models.IntegerField(default=0)
+
+    def __repr__(self):
+        return 'XModuleAggregateCounter<%r>' % ({
+            'usage_id': self.usage_id,
+            'counter_name': self.counter_name,
+            'key': self.key,
+            'shard': self.shard,
+            'count': self.count,
+        },)
+
+    def __unicode__(self):
+        return unicode(repr(self))
+
+
 class XModuleStudentPrefsField(models.Model):
     """
     Stores data set in the Scope.preferences scope by an xmodule field
@@ -259,3 +445,17 @@ class OfflineComputedGradeLog(models.Model):
 
     def __unicode__(self):
         return "[OCGLog] %s: %s" % (self.course_id.to_deprecated_string(), self.created)  # pylint: disable=no-member
+
+
+class PendingXQueueSubmission(models.Model):
+    """
+    A learner's submission to Xqueue which wasn't delivered yet. Written in the transaction of the request
+    which submitted it, delivered by the courseware.tasks.send_pending_xqueue_submission task, and deleted
+    once Xqueue accepted (or refused) it.
+    """
+    header = models.TextField()
+    body = models.TextField()
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __unicode__(self):
+        return u"[PendingXQueueSubmission] %s: %s" % (self.created, self.header)
@@ -1,3 +1,4 @@
+import copy
 import json
 import logging
 import mimetypes
@@ -20,11 +21,13 @@ from capa.xqueue_interface import XQueueInterface
 from courseware.access import has_access, get_user_role
 from courseware.masquerade import setup_masquerade
 from courseware.model_data import FieldDataCache, DjangoKeyValueStore
+from courseware.tasks import PendingSubmissionSender
 from lms.lib.xblock.field_data import LmsFieldData
 from lms.lib.xblock.runtime import LmsModuleSystem, unquote_slashes, quote_slashes
 from edxmako.shortcuts import render_to_string
 from eventtracking import tracker
 from psychometrics.psychoanalyze import make_psychometrics_data_update_handler
+from request_cache.middleware import RequestCache
 from student.models import anonymous_id_for_user, user_by_anonymous_id
 from xblock.core import XBlock
 from xblock.fields import Scope
@@ -47,6 +50,9 @@ from util.sandboxing import can_execute_unsafe_code
 
 log = logging.getLogger(__name__)
 
+# the request cache of the SharedModuleSystems built during the request
+MODULE_SYSTEM_CACHE_NAME = 'courseware.module_render.module_systems'
+
 
 if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
     REQUESTS_AUTH = HTTPBasicAuth(*settings.XQUEUE_INTERFACE['basic_auth'])
@@ -57,6 +63,9 @@ XQUEUE_INTERFACE = XQueueInterface(
     settings.XQUEUE_INTERFACE['url'],
     settings.XQUEUE_INTERFACE['django_auth'],
     REQUESTS_AUTH,
+    pool_size=settings.XQUEUE_POOL_SIZE,
+    timeout=settings.XQUEUE_REQUEST_TIMEOUT,
+    sender=PendingSubmissionSender() if settings.FEATURES.get('ENABLE_ASYNC_XQUEUE_SUBMISSIONS') else None,
 )
 
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
@@ -241,13 +250,20 @@ def get_module_system_for_user(user, field_data_cache,
     are all the other arguments.  Ultimately, this isn't too different than how get_module_for_descriptor_internal
     was before refactoring.
 
+    The parts of the module system which only depend on the user and the course are built once per request
+    (see _get_shared_module_system_for_user); each module gets a shallow copy of that system with just its
+    own pieces bound.
+
     Arguments:
         see arguments for get_module()
 
     Returns:
         (LmsModuleSystem, KvsFieldData):  (module system, student_data) bound to, primarily, the user and descriptor
     """
-    student_data = KvsFieldData(DjangoKeyValueStore(field_data_cache))
+    shared = _get_shared_module_system_for_user(
+        user, field_data_cache, descriptor, course_id, xqueue_callback_url_prefix,
+        position, wrap_xmodule_display, grade_bucket_type, static_asset_path, user_location, track_function
+    )
 
     def make_xqueue_callback(dispatch='score_update'):
         # Fully qualified callback URL for external queueing system
@@ -299,19 +315,6 @@ def get_module_system_for_user(user, field_data_cache,
             'storage_bucket_name': getattr(settings, 'AWS_STORAGE_BUCKET_NAME', 'openended')
         }
 
-    def inner_get_module(descriptor):
-        """
-        Delegate to get_module_for_descriptor_internal() with all values except `descriptor` set.
-
-        Because it does an access check, it may return None.
-        """
-        # TODO: fix this so that make_xqueue_callback uses the descriptor passed into
-        # inner_get_module, not the parent's callback.  Add it as an argument....
-        return get_module_for_descriptor_internal(user, descriptor, field_data_cache, course_id,
-                                                  track_function, make_xqueue_callback,
-                                                  position, wrap_xmodule_display, grade_bucket_type,
-                                                  static_asset_path, user_location)
-
     def handle_grade_event(block, event_type, event):
         user_id = event.get('user_id', user.id)
 
@@ -351,6 +354,144 @@ def get_module_system_for_user(user, field_data_cache,
         else:
             track_function(event_type, event)
 
+    # TODO (cpennington): When modules are shared between courses, the static
+    # prefix is going to have to be specific to the module, not the directory
+    # that the xml was loaded from
+
+    # Rewrite urls beginning in /static to point to course-specific content
+    replace_static_urls_wrapper = partial(
+        replace_static_urls,
+        getattr(descriptor, 'data_dir', None),
+        course_id=course_id,
+        static_asset_path=static_asset_path or descriptor.static_asset_path
+    )
+
+    # These modules store data using the anonymous_student_id as a key.
+    # To prevent loss of data, we will continue to provide old modules with
+    # the per-student anonymized id (as we have in the past),
+    # while giving selected modules a per-course anonymized id.
+    # As we have the time to manually test more modules, we can add to the list
+    # of modules that get the per-course anonymized id.
+    is_pure_xblock = isinstance(descriptor, XBlock) and not isinstance(descriptor, XModuleDescriptor)
+    module_class = getattr(descriptor, 'module_class', None)
+    is_lti_module = not is_pure_xblock and issubclass(module_class, LTIModule)
+
+    system = copy.copy(shared.system)
+    system.xmodule_instance = None
+    system.track_function = track_function
+    system.xqueue = xqueue
+    system.publish = publish
+    system.open_ended_grading_interface = open_ended_grading_interface
+    system.s3_interface = s3_interface
+    # TODO (cpennington): Figure out how to share info between systems
+    system.filestore = descriptor.runtime.resources_fs
+    system.descriptor_runtime = descriptor.runtime
+    # TODO (cpennington): This should be removed when all html from
+    # a module is coming through get_html and is therefore covered
+    # by the replace_static_urls code below
+    system.replace_urls = partial(
+        static_replace.replace_static_urls,
+        data_directory=getattr(descriptor, 'data_dir', None),
+        course_id=course_id,
+        static_asset_path=static_asset_path or descriptor.static_asset_path,
+    )
+    # The static urls have to be rewritten after the module is wrapped but before any of the other urls are
+    system.wrappers = shared.leading_wrappers + [replace_static_urls_wrapper] + shared.trailing_wrappers
+    system.anonymous_student_id = shared.anonymous_student_id(course_specific=is_pure_xblock or is_lti_module)
+
+    # pass position specified in URL to module through ModuleSystem
+    if position is not None:
+        try:
+            position = int(position)
+        except (ValueError, TypeError):
+            log.exception('Non-integer %r passed as position.', position)
+            position = None
+
+    system.set('position', position)
+
+    if settings.FEATURES.get('ENABLE_PSYCHOMETRICS'):
+        system.set(
+            'psychometrics_handler',  # set callback for updating PsychometricsData
+            make_psychometrics_data_update_handler(course_id, user, descriptor.location)
+        )
+
+    return system, shared.student_data
+
+
+class SharedModuleSystem(object):
+    """
+    The parts of a user's module system which are the same for every module in the course:
+    the LmsModuleSystem to copy for each module, the student_data, and the wrappers which go
+    around the module's static url rewriting.
+    """
+    def __init__(self, system, student_data, leading_wrappers, trailing_wrappers, user, course_id):
+        self.system = system
+        self.student_data = student_data
+        self.leading_wrappers = leading_wrappers
+        self.trailing_wrappers = trailing_wrappers
+        self._user = user
+        self._course_id = course_id
+        self._anonymous_student_ids = {}
+
+    def anonymous_student_id(self, course_specific):
+        """
+        Returns the user's anonymous id, either the per-course one or the per-student one
+        """
+        if course_specific not in self._anonymous_student_ids:
+            self._anonymous_student_ids[course_specific] = anonymous_id_for_user(
+                self._user, self._course_id if course_specific else None
+            )
+        return self._anonymous_student_ids[course_specific]
+
+
+def _get_shared_module_system_for_user(user, field_data_cache, descriptor, course_id, xqueue_callback_url_prefix,
+                                       position, wrap_xmodule_display, grade_bucket_type, static_asset_path,
+                                       user_location, track_function):
+    """
+    Returns the SharedModuleSystem for the user and course. While a request is in progress, it's built only
+    once for all the modules rendered with the same arguments (other than the descriptor and track_function,
+    which, within one request, only ever log to that request).
+    """
+    if not RequestCache.is_request_active():
+        return _create_shared_module_system(
+            user, field_data_cache, descriptor, course_id, xqueue_callback_url_prefix,
+            position, wrap_xmodule_display, grade_bucket_type, static_asset_path, user_location, track_function
+        )
+
+    shared_systems = RequestCache.get_cache(MODULE_SYSTEM_CACHE_NAME)
+    shared_key = (
+        user.id, getattr(user, 'known', True), field_data_cache, course_id, xqueue_callback_url_prefix,
+        position, wrap_xmodule_display, grade_bucket_type, static_asset_path, user_location,
+    )
+    shared = shared_systems.get(shared_key)
+    if shared is None:
+        shared = shared_systems[shared_key] = _create_shared_module_system(
+            user, field_data_cache, descriptor, course_id, xqueue_callback_url_prefix,
+            position, wrap_xmodule_display, grade_bucket_type, static_asset_path, user_location, track_function
+        )
+    return shared
+
+
+def _create_shared_module_system(user, field_data_cache, descriptor, course_id, xqueue_callback_url_prefix,
+                                 position, wrap_xmodule_display, grade_bucket_type, static_asset_path,
+                                 user_location, track_function):
+    """
+    Build the SharedModuleSystem for the user and course. descriptor is only used for its course-wide
+    properties (its runtime's mixins and the user's staff access to it).
+    """
+    student_data = KvsFieldData(DjangoKeyValueStore(field_data_cache))
+
+    def inner_get_module(descriptor):
+        """
+        Delegate to get_module_for_descriptor_internal() with all values except `descriptor` set.
+
+        Because it does an access check, it may return None.
+        """
+        return get_module_for_descriptor_internal(user, descriptor, field_data_cache, course_id,
+                                                  track_function, xqueue_callback_url_prefix,
+                                                  position, wrap_xmodule_display, grade_bucket_type,
+                                                  static_asset_path, user_location)
+
     def rebind_noauth_module_to_user(module, real_user):
         """
         A function that allows a module to get re-bound to a real user if it was previously bound to an AnonymousUser.
@@ -394,85 +535,54 @@ def get_module_system_for_user(user, field_data_cache,
         module.runtime = inner_system
         inner_system.xmodule_instance = module
 
-    # Build a list of wrapping functions that will be applied in order
+    # Build the lists of wrapping functions that will be applied in order
     # to the Fragment content coming out of the xblocks that are about to be rendered.
-    block_wrappers = []
+    # (Each module's static url rewriting goes between the two.)
+    leading_wrappers = []
+    trailing_wrappers = []
 
     # Wrap the output display in a single div to allow for the XModule
     # javascript to be bound correctly
     if wrap_xmodule_display is True:
-        block_wrappers.append(partial(
+        leading_wrappers.append(partial(
             wrap_xblock, 'LmsRuntime',
             extra_data={'course-id': course_id.to_deprecated_string()},
             usage_id_serializer=lambda usage_id: quote_slashes(usage_id.to_deprecated_string())
         ))
 
-    # TODO (cpennington): When modules are shared between courses, the static
-    # prefix is going to have to be specific to the module, not the directory
-    # that the xml was loaded from
-
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
     # Allow URLs of the form '/course/' refer to the root of multicourse directory
     #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
+    trailing_wrappers.append(partial(replace_course_urls, course_id))
 
     # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
     # is an improvement over the /course/... format for studio authored courses,
     # because it is agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
-    block_wrappers.append(partial(
+    jump_to_id_base_url = reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''})
+    trailing_wrappers.append(partial(
         replace_jump_to_id_urls,
         course_id,
-        reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''}),
+        jump_to_id_base_url,
     ))
 
+    # staff access to any of the course's modules is staff access to the course
+    user_is_course_staff = has_access(user, u'staff', descriptor.location, course_id)
+
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
-        if has_access(user, 'staff', descriptor, course_id):
+        if user_is_course_staff:
             has_instructor_access = has_access(user, 'instructor', descriptor, course_id)
-            block_wrappers.append(partial(add_staff_markup, user, has_instructor_access))
-
-    # These modules store data using the anonymous_student_id as a key.
-    # To prevent loss of data, we will continue to provide old modules with
-    # the per-student anonymized id (as we have in the past),
-    # while giving selected modules a per-course anonymized id.
-    # As we have the time to manually test more modules, we can add to the list
-    # of modules that get the per-course anonymized id.
-    is_pure_xblock = isinstance(descriptor, XBlock) and not isinstance(descriptor, XModuleDescriptor)
-    module_class = getattr(descriptor, 'module_class', None)
-    is_lti_module = not is_pure_xblock and issubclass(module_class, LTIModule)
-    if is_pure_xblock or is_lti_module:
-        anonymous_student_id = anonymous_id_for_user(user, course_id)
-    else:
-        anonymous_student_id = anonymous_id_for_user(user, None)
+            trailing_wrappers.append(partial(add_staff_markup, user, has_instructor_access))
 
     system = LmsModuleSystem(
         track_function=track_function,
         render_template=render_to_string,
         static_url=settings.STATIC_URL,
-        xqueue=xqueue,
-        # TODO (cpennington): Figure out how to share info between systems
-        filestore=descriptor.runtime.resources_fs,
         get_module=inner_get_module,
         user=user,
         debug=settings.DEBUG,
         hostname=settings.SITE_NAME,
-        # TODO (cpennington): This should be removed when all html from
-        # a module is coming through get_html and is therefore covered
-        # by the replace_static_urls code below
-        replace_urls=partial(
-            static_replace.replace_static_urls,
-            data_directory=getattr(descriptor, 'data_dir', None),
-            course_id=course_id,
-            static_asset_path=static_asset_path or descriptor.static_asset_path,
-        ),
+        replace_urls=None,
         replace_course_urls=partial(
             static_replace.replace_course_urls,
             course_key=course_id
@@ -480,19 +590,14 @@ def get_module_system_for_user(user, field_data_cache,
         replace_jump_to_id_urls=partial(
             static_replace.replace_jump_to_id_urls,
             course_id=course_id,
-            jump_to_id_base_url=reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''})
+            jump_to_id_base_url=jump_to_id_base_url
         ),
         node_path=settings.NODE_PATH,
-        publish=publish,
-        anonymous_student_id=anonymous_student_id,
         course_id=course_id,
-        open_ended_grading_interface=open_ended_grading_interface,
-        s3_interface=s3_interface,
         cache=cache,
         can_execute_unsafe_code=(lambda: can_execute_unsafe_code(course_id)),
         # TODO: When we merge the descriptor and module systems, we can stop reaching into the mixologist (cpennington)
         mixins=descriptor.runtime.mixologist._mixins,  # pylint: disable=protected-access
-        wrappers=block_wrappers,
         get_real_user=user_by_anonymous_id,
         services={
             'i18n': ModuleI18nService(),
@@ -503,32 +608,19 @@ def get_module_system_for_user(user, field_data_cache,
         user_location=user_location,
     )
 
-    # pass position specified in URL to module through ModuleSystem
-    if position is not None:
-        try:
-            position = int(position)
-        except (ValueError, TypeError):
-            log.exception('Non-integer %r passed as position.', position)
-            position = None
-
-    system.set('position', position)
-
-    if settings.FEATURES.get('ENABLE_PSYCHOMETRICS'):
-        system.set(
-            'psychometrics_handler',  # set callback for updating PsychometricsData
-            make_psychometrics_data_update_handler(course_id, user, descriptor.location)
-        )
-
-    system.set(u'user_is_staff', has_access(user, u'staff', descriptor.location, course_id))
+    system.set(u'user_is_staff', user_is_course_staff)
     system.set(u'user_is_admin', has_access(user, u'staff', 'global'))
 
     # make an ErrorDescriptor -- assuming that the descriptor's system is ok
-    if has_access(user, u'staff', descriptor.location, course_id):
+    if user_is_course_staff:
         system.error_descriptor_class = ErrorDescriptor
     else:
         system.error_descriptor_class = NonStaffErrorDescriptor
 
-    return system, student_data
+    shared = SharedModuleSystem(system, student_data, leading_wrappers, trailing_wrappers, user, course_id)
+    # the shared services (e.g. user_tags) find the real user from the shared system's anonymous id
+    system.anonymous_student_id = shared.anonymous_student_id(course_specific=False)
+    return shared
 
 
 def get_module_for_descriptor_internal(user, descriptor, field_data_cache, course_id,  # pylint: disable=invalid-name
@@ -0,0 +1,78 @@
+"""
+The course tabs displayed to users, computed once per request.
+
+Which of a course's tabs can be displayed only depends on the course, the settings, and on whether the user is
+authenticated and has staff access, and each tab's can_display is a cheap check of those, so the displayable tabs
+are only memoized for the request (several templates render the tabs). The notifications shown on the open ended
+grading tabs are per-user, and computed once per request.
+"""
+import time
+
+from django.conf import settings
+from dogapi import dog_stats_api
+
+from courseware.access import has_access
+from open_ended_grading import open_ended_notifications
+from request_cache.middleware import RequestCache
+from xmodule.tabs import CourseTabList, StaffGradingTab, PeerGradingTab, OpenEndedGradingTab
+
+DISPLAYABLE_TABS_REQUEST_CACHE_NAME = 'courseware.displayable_tabs'
+TAB_NOTIFICATIONS_REQUEST_CACHE_NAME = 'courseware.tab_notifications'
+
+TAB_NOTIFICATION_HANDLERS = {
+    StaffGradingTab.type: open_ended_notifications.staff_grading_notifications,
+    PeerGradingTab.type: open_ended_notifications.peer_grading_notifications,
+    OpenEndedGradingTab.type: open_ended_notifications.combined_notifications,
+}
+
+
+def _report_timings(timings):
+    """
+    Report the seconds spent computing each type of tab
+    """
+    for tab_type, seconds in timings.iteritems():
+        dog_stats_api.histogram('lms.courseware.tabs.time', seconds, tags=[u'tab_type:{}'.format(tab_type)])
+
+
+def get_displayable_tabs(course, user):
+    """
+    Returns the list of the course's tabs which can be displayed to the user
+    """
+    is_user_authenticated = user.is_authenticated()
+    is_user_staff = bool(has_access(user, 'staff', course, course.id))
+
+    request_tabs = RequestCache.get_cache(DISPLAYABLE_TABS_REQUEST_CACHE_NAME)
+    request_key = (course.id, is_user_authenticated, is_user_staff)
+    if RequestCache.is_request_active() and request_key in request_tabs:
+        return request_tabs[request_key]
+
+    timings = {}
+    displayable_tabs = list(
+        CourseTabList.iterate_displayable(course, settings, is_user_authenticated, is_user_staff, timings=timings)
+    )
+    _report_timings(timings)
+    if RequestCache.is_request_active():
+        request_tabs[request_key] = displayable_tabs
+    return displayable_tabs
+
+
+def notification_image_for_tab(course_tab, user, course):
+    """
+    Returns the notification image path for the given course_tab if applicable, otherwise None.
+    """
+    if course_tab.type not in TAB_NOTIFICATION_HANDLERS:
+        return None
+
+    request_images = RequestCache.get_cache(TAB_NOTIFICATIONS_REQUEST_CACHE_NAME)
+    request_key = (course.id, user.id, course_tab.type)
+    if RequestCache.is_request_active() and request_key in request_images:
+        return request_images[request_key]
+
+    start = time.time()
+    notifications = TAB_NOTIFICATION_HANDLERS[course_tab.type](course, user)
+    _report_timings({u'{}_notifications'.format(course_tab.type): time.time() - start})
+
+    image = notifications['img_path'] if notifications and notifications['pending_grading'] else None
+    if RequestCache.is_request_active():
+        request_images[request_key] = image
+    return image
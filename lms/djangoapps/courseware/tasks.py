@@ -0,0 +1,114 @@
+"""
+Background delivery of learners' Xqueue submissions.
+
+With the ENABLE_ASYNC_XQUEUE_SUBMISSIONS feature, the courseware's XQueueInterface hands its submissions without
+files to a PendingSubmissionSender, which stores each of them as a PendingXQueueSubmission in the transaction of the
+request, and queues a send_pending_xqueue_submission task to deliver it once the request finished (and so the
+submission was committed). The task retries the submissions which couldn't reach Xqueue with exponential backoff.
+The submissions it gave up on, and those whose task was lost, stay pending, and the
+send_pending_xqueue_submissions management command queues their tasks again.
+"""
+import logging
+import threading
+
+from celery import task, current_task
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from capa.xqueue_interface import is_transient_error
+from courseware.models import PendingXQueueSubmission
+from request_cache.middleware import RequestCache
+
+log = logging.getLogger(__name__)
+
+# The most pending submissions PendingSubmissionSender reports a submission to be queued behind, so that
+# submitting doesn't count the whole table
+QUEUED_BEHIND_LIMIT = 100
+
+_uncommitted_submissions = threading.local()
+
+
+def _uncommitted_submission_ids():
+    """
+    The ids of the submissions this thread stored in a transaction not committed yet
+    """
+    if not hasattr(_uncommitted_submissions, 'ids'):
+        _uncommitted_submissions.ids = []
+    return _uncommitted_submissions.ids
+
+
+def queue_submission_delivery(submission_id):
+    """
+    Queue the task delivering the pending submission. In a request under transaction management (where the
+    TransactionMiddleware commits at the end), the task is only queued once the request finished, so that it
+    doesn't look for the submission before it is committed. Outside of requests, no request finishes, so it is
+    queued right away.
+    """
+    if RequestCache.is_request_active() and transaction.is_managed():
+        _uncommitted_submission_ids().append(submission_id)
+    else:
+        send_pending_xqueue_submission.delay(submission_id)
+
+
+@receiver(request_finished)
+def queue_committed_submissions(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Queue the tasks delivering the submissions stored by the finished request
+    """
+    submission_ids = _uncommitted_submission_ids()
+    for submission_id in submission_ids:
+        send_pending_xqueue_submission.delay(submission_id)
+    del submission_ids[:]
+
+
+class PendingSubmissionSender(object):
+    """
+    The sender of the courseware's XQueueInterface: stores the submissions, for celery tasks to deliver
+    """
+    def submit(self, header, body):
+        """
+        Store the submission and queue its delivery. Returns the number of submissions still pending before it,
+        up to QUEUED_BEHIND_LIMIT.
+        """
+        pending_before = PendingXQueueSubmission.objects.filter(created__lt=timezone.now())
+        queued_behind = len(pending_before.values_list('id', flat=True)[:QUEUED_BEHIND_LIMIT])
+        submission = PendingXQueueSubmission.objects.create(header=header, body=body)
+        queue_submission_delivery(submission.id)
+        return queued_behind
+
+
+@task(  # pylint: disable=not-callable
+    default_retry_delay=settings.XQUEUE_SUBMISSION_RETRY_DELAY,
+    max_retries=settings.XQUEUE_SUBMISSION_MAX_RETRIES,
+)
+def send_pending_xqueue_submission(submission_id):
+    """
+    Deliver the pending submission to Xqueue, and delete it once Xqueue accepted or refused it. If Xqueue couldn't
+    be reached, the task is retried after default_retry_delay seconds, doubling for each further retry.
+    """
+    # module_render imports this module for the sender
+    from courseware.module_render import XQUEUE_INTERFACE
+
+    try:
+        submission = PendingXQueueSubmission.objects.get(id=submission_id)
+    except PendingXQueueSubmission.DoesNotExist:
+        # rolled back with its request, or already delivered by an earlier task
+        log.info("Xqueue submission %d is no longer pending", submission_id)
+        return
+
+    (error, msg) = XQUEUE_INTERFACE.deliver(submission.header, submission.body)
+    if error and is_transient_error(msg):
+        retries = current_task.request.retries
+        if retries >= send_pending_xqueue_submission.max_retries:
+            log.error("Giving up sending Xqueue submission %d after %d attempts: %s", submission_id, retries + 1, msg)
+            return
+        raise send_pending_xqueue_submission.retry(
+            countdown=send_pending_xqueue_submission.default_retry_delay * (2 ** retries)
+        )
+
+    if error:
+        log.error("Xqueue refused submission %d with header %s: %s", submission_id, submission.header, msg)
+    submission.delete()
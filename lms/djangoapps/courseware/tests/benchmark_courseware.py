@@ -0,0 +1,259 @@
+"""
+Benchmarks of the courseware request hot paths, on a synthetic course built with the modulestore factories:
+
+    * courseware.views.index rendering a sequential
+    * courseware.views.progress
+    * module_render.handle_xblock_callback checking a problem (problem_check)
+    * grades.grade
+    * FieldDataCache.cache_for_descriptor_descendents of the whole course
+
+For each, records the wall time of BENCHMARK_REPEATS runs, and the SQL queries, mongo round trips and allocated
+objects of one more run, and writes them as json to BENCHMARK_REPORT (reports/benchmarks/courseware.json by default)
+so that successive releases can be compared.
+
+The course's size is set by BENCHMARK_CHAPTERS, BENCHMARK_SEQUENTIALS (per chapter), BENCHMARK_VERTICALS (per
+sequential) and BENCHMARK_PROBLEMS (per vertical). Not collected by the test runner; needs a local mongod, and runs
+against the test settings' database (point DATABASES at MySQL to benchmark it instead of SQLite):
+
+    BENCHMARK_CHAPTERS=10 ./manage.py lms --settings test test courseware.tests.benchmark_courseware
+"""
+import gc
+import json
+import os
+import resource
+import subprocess
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.urlresolvers import reverse
+from django.db import connections
+from django.test.utils import override_settings
+from mock import patch
+from pymongo.mongo_client import MongoClient
+from pytz import UTC
+
+from capa.tests.response_xml_factory import OptionResponseXMLFactory
+from courseware import grades
+from courseware.model_data import FieldDataCache
+from courseware.tests.helpers import LoginEnrollmentTestCase, get_request_for_user
+from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
+from lms.lib.xblock.runtime import quote_slashes
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+CHAPTERS = int(os.environ.get('BENCHMARK_CHAPTERS', 2))
+SEQUENTIALS = int(os.environ.get('BENCHMARK_SEQUENTIALS', 3))
+VERTICALS = int(os.environ.get('BENCHMARK_VERTICALS', 4))
+PROBLEMS = int(os.environ.get('BENCHMARK_PROBLEMS', 3))
+REPEATS = int(os.environ.get('BENCHMARK_REPEATS', 5))
+REPORT = os.environ.get('BENCHMARK_REPORT', settings.REPO_ROOT / 'reports' / 'benchmarks' / 'courseware.json')
+
+
+class QueryCounter(object):
+    """
+    Counts the SQL queries of every database, and the messages pymongo sends to mongod, while active
+    """
+    def __enter__(self):
+        self.sql_queries = 0
+        self._debug_cursors = []
+        self._starting_queries = []
+        for connection in connections.all():
+            self._debug_cursors.append(connection.use_debug_cursor)
+            connection.use_debug_cursor = True
+            self._starting_queries.append(len(connection.queries))
+
+        # queries and getmores wait for a response, writes (and their getLastError) don't
+        self._mongo_patchers = [
+            patch.object(MongoClient, name, autospec=True, side_effect=getattr(MongoClient, name))
+            for name in ('_send_message_with_response', '_send_message')
+        ]
+        self._mongo_mocks = [patcher.start() for patcher in self._mongo_patchers]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for patcher in self._mongo_patchers:
+            patcher.stop()
+        self.mongo_queries, self.mongo_writes = [mock.call_count for mock in self._mongo_mocks]
+
+        for connection, debug_cursor, starting_queries in zip(
+            connections.all(), self._debug_cursors, self._starting_queries
+        ):
+            self.sql_queries += len(connection.queries) - starting_queries
+            connection.use_debug_cursor = debug_cursor
+
+
+def allocated_objects(scenario):
+    """
+    Runs scenario with the garbage collector off, and returns the number of objects it left tracked by the garbage
+    collector (the objects it kept, and its garbage cycles). Python 2.7 can't trace the allocations themselves.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        before = len(gc.get_objects())
+        scenario()
+        return len(gc.get_objects()) - before
+    finally:
+        gc.enable()
+
+
+def git_revision():
+    """
+    The commit being benchmarked, if known
+    """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=settings.REPO_ROOT).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
+class BenchmarkCourseware(ModuleStoreTestCase, LoginEnrollmentTestCase):
+    """
+    Times the courseware hot paths and writes the report
+    """
+    def setUp(self):
+        self.course = CourseFactory.create()
+        self.problems = []
+        for chapter_index in xrange(CHAPTERS):
+            chapter = ItemFactory.create(parent_location=self.course.location, category='chapter')
+            for sequential_index in xrange(SEQUENTIALS):
+                sequential = ItemFactory.create(
+                    parent_location=chapter.location,
+                    category='sequential',
+                    metadata={'graded': True, 'format': 'Homework'},
+                )
+                for __ in xrange(VERTICALS):
+                    vertical = ItemFactory.create(parent_location=sequential.location, category='vertical')
+                    for __ in xrange(PROBLEMS):
+                        self.problems.append(ItemFactory.create(
+                            parent_location=vertical.location,
+                            category='problem',
+                            data=OptionResponseXMLFactory().build_xml(
+                                question_text='The correct answer is Correct',
+                                options=['Correct', 'Incorrect'],
+                                correct_option='Correct',
+                            ),
+                        ))
+                if chapter_index == sequential_index == 0:
+                    self.chapter, self.sequential = chapter, sequential
+        self.num_blocks = 1 + CHAPTERS * (1 + SEQUENTIALS * (1 + VERTICALS * (1 + PROBLEMS)))
+
+        self.setup_user()
+        self.enroll(self.course, verify=True)
+
+    def client_get(self, url):
+        """
+        Returns a scenario getting url
+        """
+        def scenario():
+            """ Get the page """
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        return scenario
+
+    def problem_check(self, problem):
+        """
+        Returns a scenario checking an answer to problem
+        """
+        url = reverse('xblock_handler', kwargs={
+            'course_id': self.course.id.to_deprecated_string(),
+            'usage_id': quote_slashes(problem.location.to_deprecated_string()),
+            'handler': 'xmodule_handler',
+            'suffix': 'problem_check',
+        })
+        answers = {'input_{}_2_1'.format(problem.location.html_id()): 'Correct'}
+
+        def scenario():
+            """ Check the answer """
+            response = self.client.post(url, answers)
+            self.assertEqual(response.status_code, 200)
+        return scenario
+
+    def measure(self, scenario):
+        """
+        Returns the wall times, query counts and allocations of the scenario
+        """
+        # warm the template, modulestore and course caches
+        scenario()
+
+        times = []
+        for __ in xrange(REPEATS):
+            start = time.time()
+            scenario()
+            times.append(time.time() - start)
+        times.sort()
+
+        with QueryCounter() as queries:
+            scenario()
+
+        return {
+            'wall_time': {
+                'best': times[0],
+                'median': times[len(times) // 2],
+                'mean': sum(times) / len(times),
+            },
+            'sql_queries': queries.sql_queries,
+            'mongo_queries': queries.mongo_queries,
+            'mongo_writes': queries.mongo_writes,
+            'allocated_objects': allocated_objects(scenario),
+        }
+
+    def test_courseware_benchmark(self):
+        course_id = self.course.id.to_deprecated_string()
+        # most of the course's problems have state, as they would midway through it
+        for problem in self.problems[::2]:
+            self.problem_check(problem)()
+        student_request = get_request_for_user(self.user)
+
+        scenarios = [
+            ('courseware.views.index', self.client_get(reverse('courseware_section', kwargs={
+                'course_id': course_id,
+                'chapter': self.chapter.location.name,
+                'section': self.sequential.location.name,
+            }))),
+            ('courseware.views.progress', self.client_get(reverse('progress', kwargs={'course_id': course_id}))),
+            ('module_render.handle_xblock_callback problem_check', self.problem_check(self.problems[-1])),
+            ('grades.grade', lambda: grades.grade(
+                self.user, student_request, modulestore().get_course(self.course.id, depth=None)
+            )),
+            ('FieldDataCache.cache_for_descriptor_descendents', lambda: FieldDataCache.cache_for_descriptor_descendents(
+                self.course.id, self.user, modulestore().get_course(self.course.id, depth=None), depth=None
+            )),
+        ]
+        results = {}
+        for name, scenario in scenarios:
+            results[name] = self.measure(scenario)
+
+        report = {
+            'benchmark': 'courseware',
+            'revision': git_revision(),
+            'timestamp': datetime.now(UTC).isoformat(),
+            'course': {
+                'chapters': CHAPTERS,
+                'sequentials_per_chapter': SEQUENTIALS,
+                'verticals_per_sequential': VERTICALS,
+                'problems_per_vertical': PROBLEMS,
+                'blocks': self.num_blocks,
+            },
+            'repeats': REPEATS,
+            'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            'results': results,
+        }
+        report_dir = os.path.dirname(REPORT)
+        if not os.path.isdir(report_dir):
+            os.makedirs(report_dir)
+        with open(REPORT, 'w') as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+
+        print
+        print '{} blocks, report written to {}'.format(self.num_blocks, REPORT)
+        print '{:<52} {:>9} {:>6} {:>6} {:>9}'.format('scenario', 'best (s)', 'sql', 'mongo', 'objects')
+        for name, __ in scenarios:
+            result = results[name]
+            print '{:<52} {:>9.3f} {:>6} {:>6} {:>9}'.format(
+                name, result['wall_time']['best'], result['sql_queries'],
+                result['mongo_queries'] + result['mongo_writes'], result['allocated_objects'],
+            )
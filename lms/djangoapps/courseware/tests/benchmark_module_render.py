@@ -0,0 +1,85 @@
+"""
+Benchmark of courseware.views.index rendering a sequence of 50 blocks (10 verticals of 4 html components),
+with one module system built per module and with the module system shared for the request.
+
+Not collected by the test runner; run it explicitly with:
+
+    ./manage.py lms --settings test test courseware.tests.benchmark_module_render
+"""
+import time
+
+from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+from mock import patch
+
+from courseware import module_render as render
+from courseware.tests.helpers import LoginEnrollmentTestCase
+from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+VERTICALS = 10
+HTML_PER_VERTICAL = 4
+REPEATS = 5
+
+
+@override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
+class BenchmarkIndexRender(ModuleStoreTestCase, LoginEnrollmentTestCase):
+    """
+    Times the rendering of the courseware page for a 50 block sequence
+    """
+    def setUp(self):
+        self.course = CourseFactory.create()
+        self.chapter = ItemFactory.create(parent_location=self.course.location, category='chapter')
+        self.section = ItemFactory.create(parent_location=self.chapter.location, category='sequential')
+        for vertical_index in xrange(VERTICALS):
+            vertical = ItemFactory.create(parent_location=self.section.location, category='vertical')
+            for html_index in xrange(HTML_PER_VERTICAL):
+                ItemFactory.create(
+                    parent_location=vertical.location,
+                    category='html',
+                    data='<p>Block {} of vertical {}, see <a href="/static/handout.pdf">the handout</a></p>'.format(
+                        html_index, vertical_index
+                    ),
+                )
+        self.setup_user()
+        self.enroll(self.course, verify=True)
+        self.url = reverse('courseware_section', kwargs={
+            'course_id': self.course.id.to_deprecated_string(),
+            'chapter': self.chapter.location.name,
+            'section': self.section.location.name,
+        })
+
+    def time_index(self):
+        """
+        Returns the best wall time of REPEATS renders of the page
+        """
+        best = None
+        for __ in xrange(REPEATS):
+            start = time.time()
+            response = self.client.get(self.url)
+            elapsed = time.time() - start
+            self.assertEqual(response.status_code, 200)
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def test_index_render_benchmark(self):
+        # warm the template and modulestore caches
+        self.client.get(self.url)
+
+        # every module gets a module system of its own
+        with patch(
+            'courseware.module_render._get_shared_module_system_for_user',
+            render._create_shared_module_system  # pylint: disable=protected-access
+        ):
+            with patch('courseware.module_render.LmsModuleSystem', wraps=render.LmsModuleSystem) as before_systems:
+                before = self.time_index()
+
+        with patch('courseware.module_render.LmsModuleSystem', wraps=render.LmsModuleSystem) as after_systems:
+            after = self.time_index()
+
+        print
+        print '{:<28} {:>10} {:>22}'.format('index() of 50 blocks', 'best (s)', 'module systems/render')
+        print '{:<28} {:>10.3f} {:>22}'.format('per-module system', before, before_systems.call_count / REPEATS)
+        print '{:<28} {:>10.3f} {:>22}'.format('shared system', after, after_systems.call_count / REPEATS)
+        self.assertLess(after_systems.call_count, before_systems.call_count)
@@ -12,6 +12,8 @@ from student.tests.factories import AnonymousUserFactory, CourseEnrollmentAllowe
 from courseware.tests.tests import TEST_DATA_MIXED_MODULESTORE
 import pytz
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
+from student.roles import CourseStaffRole
 
 
 # pylint: disable=protected-access
@@ -74,6 +76,24 @@ class AccessTestCase(TestCase):
             self.student, 'instructor', self.course.course_key
         ))
 
+    def test_has_access_memoized_within_request(self):
+        request_cache = RequestCache()
+        request_cache.process_request(None)
+        try:
+            self.assertTrue(access.has_access(self.course_staff, 'staff', self.course.course_key))
+            with mock.patch('courseware.access._has_access_course_key') as mock_check:
+                self.assertTrue(access.has_access(self.course_staff, 'staff', self.course.course_key))
+                self.assertFalse(mock_check.called)
+            self.assertEqual(access.get_access_check_counts(), {'checks': 2, 'memoized': 1})
+
+            # changing the user's roles invalidates the memoized results
+            CourseStaffRole(self.course.course_key).remove_users(self.course_staff)
+            self.assertFalse(access.has_access(self.course_staff, 'staff', self.course.course_key))
+        finally:
+            request_cache.process_response(None, None)
+
+        self.assertEqual(access.get_access_check_counts(), {'checks': 0, 'memoized': 0})
+
     def test__has_access_string(self):
         user = Mock(is_staff=True)
         self.assertFalse(access._has_access_string(user, 'staff', 'not_global', self.course.course_key))
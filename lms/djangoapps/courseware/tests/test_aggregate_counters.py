@@ -0,0 +1,57 @@
+"""
+Tests of the sharded aggregate counters
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from courseware import aggregate_counters
+from courseware.models import XModuleAggregateCounter
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+
+
+@override_settings(AGGREGATE_COUNTER_SHARDS=4)
+class TestAggregateCounters(TestCase):
+    """
+    Test increments, reads and the cached top counters
+    """
+    def setUp(self):
+        cache.clear()
+        self.usage_id = SlashSeparatedCourseKey('org', 'course', 'run').make_usage_key('word_cloud', 'cloud')
+
+    def test_increment(self):
+        counts = aggregate_counters.increment(self.usage_id, 'all_words', ['cat', 'cat', 'dog'])
+        self.assertEqual(counts, {'cat': 2, 'dog': 1})
+
+        for __ in xrange(20):
+            aggregate_counters.increment(self.usage_id, 'all_words', ['cat'])
+        self.assertEqual(
+            aggregate_counters.get_counts(self.usage_id, 'all_words', ['cat', 'sun']), {'cat': 22, 'sun': 0}
+        )
+        self.assertEqual(aggregate_counters.get_counts(self.usage_id, 'all_words'), {'cat': 22, 'dog': 1})
+
+        # each key is spread over at most AGGREGATE_COUNTER_SHARDS rows
+        self.assertLessEqual(XModuleAggregateCounter.objects.filter(key='cat').count(), 4)
+        # and other counters are kept apart
+        self.assertEqual(aggregate_counters.get_counts(self.usage_id, 'poll_answers'), {})
+
+    def test_existing_shard(self):
+        with patch('util.query.random.randrange', return_value=1):
+            aggregate_counters.increment(self.usage_id, 'poll_answers', ['Yes'])
+            aggregate_counters.increment(self.usage_id, 'poll_answers', ['Yes'])
+        self.assertEqual(XModuleAggregateCounter.objects.get(key='Yes').count, 2)
+
+    def test_top(self):
+        aggregate_counters.increment(self.usage_id, 'all_words', ['cat', 'cat', 'cat', 'dog', 'dog', 'sun'])
+        self.assertEqual(aggregate_counters.get_top(self.usage_id, 'all_words', 2), ({'cat': 3, 'dog': 2}, 6))
+
+        # increments update the cached top without recomputing it
+        aggregate_counters.increment(self.usage_id, 'all_words', ['sun', 'sun'])
+        with self.assertNumQueries(0):
+            self.assertEqual(aggregate_counters.get_top(self.usage_id, 'all_words', 2), ({'cat': 3, 'sun': 3}, 8))
+
+        # decrements drop it
+        aggregate_counters.increment(self.usage_id, 'all_words', ['dog'], delta=-1)
+        with self.assertNumQueries(2):
+            self.assertEqual(aggregate_counters.get_top(self.usage_id, 'all_words', 2), ({'cat': 3, 'sun': 3}, 7))
@@ -1,6 +1,10 @@
 """
 Test grade calculation.
 """
+import random
+import unittest
+
+import numpy
 from django.http import Http404
 from django.test.utils import override_settings
 from mock import patch
@@ -11,7 +15,9 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
-from courseware.grades import grade, iterate_grades_for
+from courseware.grades import (
+    grade, iterate_grades_for, grade_for_percentage, grades_for_percentages, round_percentages
+)
 
 
 def _grade_with_errors(student, request, course, keep_raw_scores=False):
@@ -121,3 +127,24 @@ class TestGradeIteration(ModuleStoreTestCase):
                 students_to_errors[student] = err_msg
 
         return students_to_gradesets, students_to_errors
+
+
+class TestPercentageArrays(unittest.TestCase):
+    """
+    Test the array versions of grade's rounding and letter grades
+    """
+    def test_round_percentages(self):
+        rand = random.Random(0)
+        percents = [0.0, 1.0, 0.005, 0.015, 0.845, 0.6449999999999999] + [rand.random() for __ in xrange(1000)]
+        self.assertEqual(
+            list(round_percentages(numpy.array(percents))),
+            [round(percent * 100 + 0.05) / 100 for percent in percents]
+        )
+
+    def test_grades_for_percentages(self):
+        grade_cutoffs = {'A': 0.9, 'B': 0.8, 'Pass': 0.5}
+        percents = [0.0, 0.49, 0.5, 0.79, 0.8, 0.95, 1.0]
+        self.assertEqual(
+            list(grades_for_percentages(grade_cutoffs, numpy.array(percents))),
+            [grade_for_percentage(grade_cutoffs, percent) for percent in percents]
+        )
@@ -212,6 +212,64 @@ class TestMissingStudentModule(TestCase):
         self.assertFalse(self.kvs.has(user_state_key('a_field')))
 
 
+class TestLazyFieldDataCache(TestCase):
+    """
+    Tests of loading the user state of siblings when one of them is first looked up
+    """
+    def setUp(self):
+        self.user = UserFactory.create(username='user')
+        self.descriptors = {}
+        for name in ('root', 'a', 'b', 'c'):
+            descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+            descriptor.scope_ids = ScopeIds(self.user.id, 'mock_problem', location('def_id'), location(name))
+            self.descriptors[name] = descriptor
+            StudentModuleFactory(
+                student=self.user, module_state_key=location(name), state=json.dumps({'a_field': name})
+            )
+        # root has the children a and b, and a has the child c
+        children = {
+            location('root'): [self.descriptors['a'], self.descriptors['b']],
+            location('a'): [self.descriptors['c']],
+            location('b'): [],
+            location('c'): [],
+        }
+        with self.assertNumQueries(0):
+            self.field_data_cache = FieldDataCache(self.descriptors.values(), course_id, self.user, children=children)
+        self.kvs = DjangoKeyValueStore(self.field_data_cache)
+
+    def get_state(self, name):
+        """ Look up the block's a_field """
+        return self.kvs.get(DjangoKeyValueStore.Key(Scope.user_state, self.user.id, location(name), 'a_field'))
+
+    def test_load_siblings(self):
+        with self.assertNumQueries(1):
+            self.assertEquals(self.get_state('a'), 'a')
+        with self.assertNumQueries(0):
+            self.assertEquals(self.get_state('b'), 'b')
+        with self.assertNumQueries(1):
+            self.assertEquals(self.get_state('c'), 'c')
+        self.assertEquals((self.field_data_cache.prefetch_hits, self.field_data_cache.prefetch_misses), (1, 2))
+        self.assertAlmostEqual(self.field_data_cache.prefetch_hit_ratio(), 1.0 / 3)
+
+    def test_prefetch(self):
+        self.assertIsNone(self.field_data_cache.prefetch_hit_ratio())
+        with self.assertNumQueries(1):
+            self.field_data_cache.prefetch(self.descriptors['a'])
+        with self.assertNumQueries(0):
+            self.assertEquals(self.get_state('a'), 'a')
+            self.assertEquals(self.get_state('c'), 'c')
+        # b is loaded on lookup, but not a again
+        with self.assertNumQueries(1):
+            self.assertEquals(self.get_state('b'), 'b')
+        self.assertEquals(self.field_data_cache.prefetch_hit_ratio(), 2.0 / 3)
+
+    def test_create_missing(self):
+        StudentModule.objects.filter(module_state_key=location('b')).delete()
+        self.kvs.set(DjangoKeyValueStore.Key(Scope.user_state, self.user.id, location('b'), 'a_field'), 'new')
+        self.assertEquals(self.get_state('b'), 'new')
+        self.assertEquals(StudentModule.objects.filter(student=self.user).count(), 4)
+
+
 class StorageTestBase(object):
     """
     A base class for that gets subclassed when testing each of the scopes.
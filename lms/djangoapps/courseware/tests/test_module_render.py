@@ -9,6 +9,7 @@ import json
 from django.http import Http404, HttpResponse
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from django.core.cache import get_cache
 from django.test import TestCase
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
@@ -38,7 +39,10 @@ from courseware.tests.modulestore_config import TEST_DATA_XML_MODULESTORE
 from courseware.tests.test_submitting_problems import TestSubmittingProblems
 
 from student.models import anonymous_id_for_user
-from lms.lib.xblock.runtime import quote_slashes
+from lms.lib.xblock import fragment_cache
+from lms.lib.xblock.fragment_cache import FragmentCache
+from lms.lib.xblock.runtime import quote_slashes, LmsModuleSystem
+from request_cache.middleware import RequestCache
 
 
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
@@ -99,6 +103,34 @@ class ModuleRenderTestCase(ModuleStoreTestCase, LoginEnrollmentTestCase):
         # note if the URL mapping changes then this assertion will break
         self.assertIn('/courses/' + self.course_key.to_deprecated_string() + '/jump_to_id/vertical_test', html)
 
+    def test_module_system_shared_within_request(self):
+        """
+        Modules rendered for a user during a request share one module system, but each gets its own copy of it
+        """
+        request = self.request_factory.get('/')
+        request.user = self.mock_user
+        course = get_course_with_access(self.mock_user, 'load', self.course_key)
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.course_key, self.mock_user, course, depth=2)
+
+        RequestCache().process_request(request)
+        self.addCleanup(RequestCache().process_response, request, None)
+        with patch('courseware.module_render.LmsModuleSystem', wraps=LmsModuleSystem) as mock_module_system:
+            modules = [
+                render.get_module(self.mock_user, request, self.course_key.make_usage_key('html', name), field_data_cache)
+                for name in ('toyjumpto', 'toyhtml')
+            ]
+        self.assertEqual(mock_module_system.call_count, 1)
+
+        systems = [module.xmodule_runtime for module in modules]
+        self.assertIsNot(systems[0], systems[1])
+        self.assertIsNot(systems[0].xqueue, systems[1].xqueue)
+        self.assertEqual(systems[0].anonymous_student_id, systems[1].anonymous_student_id)
+        self.assertIn(
+            '/courses/' + self.course_key.to_deprecated_string() + '/jump_to_id/vertical_test',
+            modules[0].render(STUDENT_VIEW).content
+        )
+
     def test_xqueue_callback_success(self):
         """
         Test for happy-path xqueue_callback
@@ -755,6 +787,37 @@ class TestStaffDebugInfo(ModuleStoreTestCase):
             module.render(STUDENT_VIEW)
             self.assertTrue(mock_grade_histogram.called)
 
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_XBLOCK_FRAGMENT_CACHE': True})
+    @patch('lms.lib.xblock.fragment_cache._course_version', Mock(return_value=u'v1'))
+    def test_staff_markup_not_shared_through_fragment_cache(self):
+        """Each staff user gets their own debug info, even on blocks whose fragments are cached."""
+        html_descriptor = ItemFactory.create(category='html', data='Here are some course details.')
+        instructor = UserFactory.create(username='instructor_user')
+        staff = UserFactory.create(username='staff_user')
+
+        def mock_has_access(user, action, *args, **kwargs):  # pylint: disable=unused-argument
+            """ Both users are course staff, and only one of them an instructor """
+            return action != 'instructor' or user == instructor
+
+        shared_cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='test_staff_fragments')
+        shared_cache.clear()
+        contents = {}
+        with patch('courseware.module_render.has_access', Mock(side_effect=mock_has_access)), \
+                patch.object(fragment_cache, '_FRAGMENT_CACHE', FragmentCache(shared_cache, 10, 60)):
+            for user in (instructor, staff):
+                RequestCache().clear_request_cache()
+                field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+                    self.course.id, user, html_descriptor
+                )
+                module = render.get_module(user, self.request, html_descriptor.location, field_data_cache)
+                contents[user.username] = module.render(STUDENT_VIEW).content
+
+        self.assertIn('instructor_user', contents['instructor_user'])
+        self.assertIn('Delete Student State', contents['instructor_user'])
+        self.assertIn('staff_user', contents['staff_user'])
+        self.assertNotIn('instructor_user', contents['staff_user'])
+        self.assertNotIn('Delete Student State', contents['staff_user'])
+
 
 PER_COURSE_ANONYMIZED_DESCRIPTORS = (LTIDescriptor, )
 
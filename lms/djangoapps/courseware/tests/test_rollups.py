@@ -0,0 +1,87 @@
+"""
+Tests of the class dashboard rollups of the StudentModule table
+"""
+from django.db.models import Sum
+from mock import patch
+from django.test import TestCase
+
+from courseware.models import ProblemGradeRollup, SequentialOpenRollup, StudentModule, rebuild_rollups
+from courseware.tests.factories import StudentModuleFactory
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+
+
+class TestRollups(TestCase):
+    """
+    Test that saving and deleting StudentModules keeps the rollups up to date
+    """
+    def setUp(self):
+        self.course_id = SlashSeparatedCourseKey("MITx", "999", "Robot_Super_Course")
+        self.problem = self.course_id.make_usage_key('problem', 'p1')
+        self.sequential = self.course_id.make_usage_key('sequential', 's1')
+
+    def grade_counts(self):
+        """
+        {(grade, max_grade): count} of the problem's nonzero rollups
+        """
+        return {
+            (row['grade'], row['max_grade']): row['total']
+            for row in ProblemGradeRollup.objects.filter(module_state_key=self.problem).values(
+                'grade', 'max_grade'
+            ).annotate(total=Sum('count')).filter(total__gt=0)
+        }
+
+    def open_count(self):
+        """
+        The number of students who opened the sequential, according to its rollup
+        """
+        return SequentialOpenRollup.objects.filter(
+            module_state_key=self.sequential
+        ).aggregate(total=Sum('count'))['total']
+
+    def test_incremental_updates(self):
+        StudentModuleFactory.create(module_state_key=self.problem)
+        self.assertEqual(self.grade_counts(), {})
+
+        first = StudentModuleFactory.create(module_state_key=self.problem, grade=1, max_grade=2)
+        StudentModuleFactory.create(module_state_key=self.problem, grade=1, max_grade=2)
+        self.assertEqual(self.grade_counts(), {(1, 2): 2})
+
+        # a regraded module moves to its new grade
+        first = StudentModule.objects.get(pk=first.pk)
+        first.grade = 2
+        first.save()
+        self.assertEqual(self.grade_counts(), {(1, 2): 1, (2, 2): 1})
+
+        # saving it without regrading it changes nothing
+        first.state = '{}'
+        first.save()
+        self.assertEqual(self.grade_counts(), {(1, 2): 1, (2, 2): 1})
+
+        StudentModule.objects.get(pk=first.pk).delete()
+        self.assertEqual(self.grade_counts(), {(1, 2): 1})
+
+        opened = StudentModuleFactory.create(module_type='sequential', module_state_key=self.sequential)
+        StudentModuleFactory.create(module_type='sequential', module_state_key=self.sequential)
+        self.assertEqual(self.open_count(), 2)
+        opened.delete()
+        self.assertEqual(self.open_count(), 1)
+
+    def test_shards(self):
+        for shard in (0, 3, 3):
+            with patch('util.query.random.randrange', return_value=shard):
+                StudentModuleFactory.create(module_type='sequential', module_state_key=self.sequential)
+                StudentModuleFactory.create(module_state_key=self.problem, grade=1, max_grade=2)
+        self.assertEqual(SequentialOpenRollup.objects.filter(module_state_key=self.sequential).count(), 2)
+        self.assertEqual(self.open_count(), 3)
+        self.assertEqual(self.grade_counts(), {(1, 2): 3})
+
+    def test_rebuild(self):
+        StudentModuleFactory.create(module_state_key=self.problem, grade=1, max_grade=2)
+        StudentModuleFactory.create(module_type='sequential', module_state_key=self.sequential)
+        # queryset updates bypass the rollups
+        StudentModule.objects.filter(module_state_key=self.problem).update(grade=0)
+        self.assertEqual(self.grade_counts(), {(1, 2): 1})
+
+        rebuild_rollups(self.course_id)
+        self.assertEqual(self.grade_counts(), {(0, 2): 1})
+        self.assertEqual(self.open_count(), 1)
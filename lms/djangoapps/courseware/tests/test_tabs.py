@@ -4,13 +4,16 @@ Test cases for tabs.
 from mock import MagicMock, Mock, patch
 
 from courseware.courses import get_course_by_id
+from courseware.tabs import get_displayable_tabs, notification_image_for_tab
 from courseware.views import get_static_tab_contents
 
+from django.conf import settings
 from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
 
+from request_cache.middleware import RequestCache
 from student.tests.factories import UserFactory
-from xmodule.tabs import CourseTabList
+from xmodule.tabs import CourseTabList, CoursewareTab, InstructorTab, PeerGradingTab
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from courseware.tests.helpers import get_request_for_user, LoginEnrollmentTestCase
@@ -90,3 +93,41 @@ class StaticTabDateTestCaseXML(LoginEnrollmentTestCase, ModuleStoreTestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertIn(self.xml_data, resp.content)
 
+
+
+@override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
+class DisplayableTabsTestCase(ModuleStoreTestCase):
+    """Test cases for the displayable tabs and their memoization."""
+
+    def setUp(self):
+        self.course = CourseFactory.create()
+        self.course.tabs = self.course.tabs + [PeerGradingTab()]
+        self.user = UserFactory.create()
+        self.staff = UserFactory.create(is_staff=True)
+        self.addCleanup(RequestCache().clear_request_cache)
+
+    def test_displayable_tabs(self):
+        self.assertEqual(
+            get_displayable_tabs(self.course, self.user),
+            list(CourseTabList.iterate_displayable(self.course, settings, True, False))
+        )
+        self.assertIn(InstructorTab(), get_displayable_tabs(self.course, self.staff))
+        self.assertNotIn(InstructorTab(), get_displayable_tabs(self.course, self.user))
+
+    @patch('courseware.tabs.RequestCache.is_request_active', return_value=True)
+    def test_memoized_per_request(self, _is_request_active):
+        with patch.object(CourseTabList, 'iterate_displayable', wraps=CourseTabList.iterate_displayable) \
+                as iterate_displayable:
+            get_displayable_tabs(self.course, self.user)
+            get_displayable_tabs(self.course, self.user)
+            self.assertEqual(iterate_displayable.call_count, 1)
+
+        handler = Mock(return_value={'pending_grading': True, 'img_path': '/static/images/grading_notification.png'})
+        with patch.dict('courseware.tabs.TAB_NOTIFICATION_HANDLERS', {PeerGradingTab.type: handler}):
+            for __ in range(2):
+                self.assertEqual(
+                    notification_image_for_tab(PeerGradingTab(), self.user, self.course),
+                    '/static/images/grading_notification.png'
+                )
+            self.assertIsNone(notification_image_for_tab(CoursewareTab(), self.user, self.course))
+        handler.assert_called_once_with(self.course, self.user)
@@ -0,0 +1,83 @@
+"""
+Tests of the background delivery of learners' Xqueue submissions
+"""
+import datetime
+
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.test import TestCase
+from mock import Mock, patch
+
+from capa.xqueue_interface import CONNECTION_ERROR_MSG
+from courseware.models import PendingXQueueSubmission
+from courseware.module_render import XQUEUE_INTERFACE
+from courseware.tasks import PendingSubmissionSender, send_pending_xqueue_submission
+
+
+@patch('courseware.tasks.RequestCache.is_request_active', Mock(return_value=True))
+class PendingXQueueSubmissionTest(TestCase):
+    """
+    Test that the pending submissions are stored, then delivered by the (eagerly run) celery tasks
+    """
+    def setUp(self):
+        patcher = patch.object(XQUEUE_INTERFACE, 'deliver', return_value=(0, ''))
+        self.deliver = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self):
+        """
+        Submit a submission through the sender, and finish the request (which queues the delivery)
+        """
+        queued_behind = PendingSubmissionSender().submit('header', 'body')
+        # the test runs in a transaction (of a request), so nothing is delivered before the request finished
+        self.assertFalse(self.deliver.called)
+        self.assertEqual(PendingXQueueSubmission.objects.filter(header='header').count(), 1)
+        request_finished.send(sender=self.__class__)
+        return queued_behind
+
+    def test_delivered(self):
+        PendingXQueueSubmission.objects.create(header='earlier', body='body')
+        self.assertEqual(self.submit(), 1)
+        self.deliver.assert_called_once_with('header', 'body')
+        self.assertFalse(PendingXQueueSubmission.objects.filter(header='header').exists())
+
+    @patch('courseware.tasks.QUEUED_BEHIND_LIMIT', 2)
+    def test_queued_behind_limit(self):
+        for _ in range(3):
+            PendingXQueueSubmission.objects.create(header='earlier', body='body')
+        self.assertEqual(self.submit(), 2)
+
+    def test_delivered_outside_request(self):
+        with patch('courseware.tasks.RequestCache.is_request_active', return_value=False):
+            PendingSubmissionSender().submit('header', 'body')
+        self.deliver.assert_called_once_with('header', 'body')
+
+    def test_refused(self):
+        self.deliver.return_value = (1, 'invalid header')
+        self.submit()
+        self.assertEqual(self.deliver.call_count, 1)
+        self.assertFalse(PendingXQueueSubmission.objects.exists())
+
+    def test_retry(self):
+        self.deliver.side_effect = [(1, CONNECTION_ERROR_MSG), (1, CONNECTION_ERROR_MSG), (0, '')]
+        self.submit()
+        self.assertEqual(self.deliver.call_count, 3)
+        self.assertFalse(PendingXQueueSubmission.objects.exists())
+
+    def test_gives_up(self):
+        self.deliver.return_value = (1, CONNECTION_ERROR_MSG)
+        self.submit()
+        self.assertEqual(self.deliver.call_count, send_pending_xqueue_submission.max_retries + 1)
+        # it stays pending, for the management command to queue again
+        self.assertTrue(PendingXQueueSubmission.objects.exists())
+
+    def test_resend_command(self):
+        old = PendingXQueueSubmission.objects.create(header='old', body='body')
+        PendingXQueueSubmission.objects.filter(id=old.id).update(
+            created=old.created - datetime.timedelta(minutes=90)
+        )
+        PendingXQueueSubmission.objects.create(header='recent', body='body')
+
+        call_command('send_pending_xqueue_submissions')
+        self.deliver.assert_called_once_with('old', 'body')
+        self.assertEqual(list(PendingXQueueSubmission.objects.values_list('header', flat=True)), ['recent'])
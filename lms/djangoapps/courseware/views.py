@@ -22,6 +22,7 @@ from edxmako.shortcuts import render_to_response, render_to_string
 from django_future.csrf import ensure_csrf_cookie
 from django.views.decorators.cache import cache_control
 from django.db import transaction
+from dogapi import dog_stats_api
 from markupsafe import escape
 
 from courseware import grades
@@ -33,7 +34,6 @@ from .module_render import toc_for_course, get_module_for_descriptor, get_module
 from courseware.models import StudentModule, StudentModuleHistory
 from course_modes.models import CourseMode
 
-from open_ended_grading import open_ended_notifications
 from student.models import UserTestGroup, CourseEnrollment
 from student.views import single_course_reverification_info
 from util.cache import cache, cache_if_anonymous
@@ -41,7 +41,7 @@ from xblock.fragment import Fragment
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError, NoPathToItem
 from xmodule.modulestore.search import path_to_location
-from xmodule.tabs import CourseTabList, StaffGradingTab, PeerGradingTab, OpenEndedGradingTab
+from xmodule.tabs import CourseTabList
 from xmodule.x_module import STUDENT_VIEW
 import shoppingcart
 from opaque_keys import InvalidKeyError
@@ -195,6 +195,17 @@ def redirect_to_course_position(course_module, content_depth):
     return redirect(reverse('courseware_section', kwargs=urlargs))
 
 
+def prefetch_active_position(field_data_cache, seq_descriptor, seq_module):
+    """
+    Load the field data of seq_module's child at its position (the one its student view
+    shows), and of the child's descendants, in one go (see FieldDataCache.prefetch)
+    """
+    children = seq_descriptor.get_children()
+    position = seq_module.position or 1
+    if 1 <= position <= len(children):
+        field_data_cache.prefetch(children[position - 1])
+
+
 def save_child_position(seq_module, child_name):
     """
     child_name: url_name of the child
@@ -367,7 +378,9 @@ def index(request, course_id, chapter=None, section=None,
             # Load all descendants of the section, because we're going to display its
             # html, which in general will need all of its children
             section_field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-                course_key, user, section_descriptor, depth=None)
+                course_key, user, section_descriptor, depth=None,
+                lazy=settings.FEATURES.get('ENABLE_LAZY_FIELD_DATA_CACHE', False)
+            )
 
             # Verify that position a string is in fact an int
             if position is not None:
@@ -390,9 +403,20 @@ def index(request, course_id, chapter=None, section=None,
                 # they don't have access to.
                 raise Http404
 
+            prefetch_active_position(section_field_data_cache, section_descriptor, section_module)
+
             # Save where we are in the chapter
             save_child_position(chapter_module, section)
             context['fragment'] = section_module.render(STUDENT_VIEW)
+
+            hit_ratio = section_field_data_cache.prefetch_hit_ratio()
+            if hit_ratio is not None:
+                dog_stats_api.histogram('lms.courseware.field_data_cache.prefetch_hit_ratio', hit_ratio)
+                log.debug(
+                    u"Field data of %s: %d blocks prefetched, %d loaded on lookup",
+                    section_descriptor.location, section_field_data_cache.prefetch_hits,
+                    section_field_data_cache.prefetch_misses
+                )
             context['section_title'] = section_descriptor.display_name_with_default
         else:
             # section is none, so display a message
@@ -855,25 +879,6 @@ def submission_history(request, course_id, student_username, location):
     return render_to_response('courseware/submission_history.html', context)
 
 
-def notification_image_for_tab(course_tab, user, course):
-    """
-    Returns the notification image path for the given course_tab if applicable, otherwise None.
-    """
-
-    tab_notification_handlers = {
-        StaffGradingTab.type: open_ended_notifications.staff_grading_notifications,
-        PeerGradingTab.type: open_ended_notifications.peer_grading_notifications,
-        OpenEndedGradingTab.type: open_ended_notifications.combined_notifications
-    }
-
-    if course_tab.type in tab_notification_handlers:
-        notifications = tab_notification_handlers[course_tab.type](course, user)
-        if notifications and notifications['pending_grading']:
-            return notifications['img_path']
-
-    return None
-
-
 def get_static_tab_contents(request, course, tab):
     """
     Returns the contents for the given static tab
@@ -1413,6 +1413,68 @@ class TestInstructorAPILevelsDataDump(ModuleStoreTestCase, LoginEnrollmentTestCa
         already_running_status = "A grade report generation task is already in progress. Check the 'Pending Instructor Tasks' table for the status of the task. When completed, the report will be available for download in the table below."
         self.assertIn(already_running_status, response.content)
 
+    def test_calculate_students_features_csv_success(self):
+        url = reverse('calculate_students_features_csv', kwargs={'course_id': self.course.id.to_deprecated_string()})
+
+        with patch('instructor_task.api.submit_calculate_students_features_csv') as mock_submit:
+            mock_submit.return_value = True
+            response = self.client.get(url, {})
+        success_status = "Your student profile information report is being generated! You can view the status of the generation task in the 'Pending Instructor Tasks' section."
+        self.assertIn(success_status, response.content)
+
+    def test_calculate_students_features_csv_already_running(self):
+        url = reverse('calculate_students_features_csv', kwargs={'course_id': self.course.id.to_deprecated_string()})
+
+        with patch('instructor_task.api.submit_calculate_students_features_csv') as mock_submit:
+            mock_submit.side_effect = AlreadyRunningError()
+            response = self.client.get(url, {})
+        already_running_status = "A student profile information report generation task is already in progress. Check the 'Pending Instructor Tasks' table for the status of the task. When completed, the report will be available for download in the table below."
+        self.assertIn(already_running_status, response.content)
+
+    def test_preview_grading_policy_success(self):
+        url = reverse('preview_grading_policy', kwargs={'course_id': self.course.id.to_deprecated_string()})
+        grading_policy = {
+            'GRADER': [{'type': 'Homework', 'min_count': 2, 'drop_count': 1, 'weight': 1.0}],
+            'GRADE_CUTOFFS': {'Pass': 0.6},
+        }
+
+        with patch('instructor_task.api.submit_preview_grading_policy') as mock_submit:
+            mock_submit.return_value = True
+            response = self.client.post(url, {'grading_policy': json.dumps(grading_policy)})
+        success_status = "Your grading policy preview is being generated! You can view the status of the generation task in the 'Pending Instructor Tasks' section."
+        self.assertIn(success_status, response.content)
+        self.assertEqual(mock_submit.call_args[0][2], grading_policy)
+
+    def test_preview_grading_policy_already_running(self):
+        url = reverse('preview_grading_policy', kwargs={'course_id': self.course.id.to_deprecated_string()})
+
+        with patch('instructor_task.api.submit_preview_grading_policy') as mock_submit:
+            mock_submit.side_effect = AlreadyRunningError()
+            response = self.client.post(url, {'grading_policy': json.dumps({'GRADER': []})})
+        already_running_status = "A preview of this grading policy is already being generated. Check the 'Pending Instructor Tasks' table for the status of the task. When completed, the report will be available for download in the table below."
+        self.assertIn(already_running_status, response.content)
+
+    def test_preview_grading_policy_invalid(self):
+        url = reverse('preview_grading_policy', kwargs={'course_id': self.course.id.to_deprecated_string()})
+
+        with patch('instructor_task.api.submit_preview_grading_policy') as mock_submit:
+            for grading_policy in ('not json', json.dumps({}), json.dumps({'GRADER': [{'weight': 1.0}]})):
+                response = self.client.post(url, {'grading_policy': grading_policy})
+                self.assertEqual(response.status_code, 400)
+            response = self.client.post(url, {})
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(mock_submit.called)
+
+    @patch.dict(settings.FEATURES, {'ENABLE_S3_GRADE_DOWNLOADS': True, 'MAX_ENROLLMENT_INSTR_BUTTONS': 1})
+    def test_get_students_features_large_course(self):
+        """
+        Test that the students of courses with more than MAX_ENROLLMENT_INSTR_BUTTONS students
+        aren't listed within the request.
+        """
+        url = reverse('get_students_features', kwargs={'course_id': self.course.id.to_deprecated_string()})
+        response = self.client.get(url + '/csv', {})
+        self.assertEqual(response.status_code, 400)
+
     def test_get_students_features_csv(self):
         """
         Test that some minimum of information is formatted
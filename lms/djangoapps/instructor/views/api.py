@@ -38,6 +38,7 @@ import instructor_task.api
 from instructor_task.api_helper import AlreadyRunningError
 from instructor_task.views import get_task_completion_info
 from instructor_task.models import ReportStore
+from xmodule.graders import grader_from_conf
 import instructor.enrollment as enrollment
 from instructor.enrollment import (
     enroll_email,
@@ -547,6 +548,26 @@ def get_grading_config(request, course_id):
     return JsonResponse(response_payload)
 
 
+# The profile information listed by get_students_features and calculate_students_features_csv
+STUDENT_PROFILE_QUERY_FEATURES = [
+    'id', 'username', 'name', 'email', 'language', 'location',
+    'year_of_birth', 'gender', 'level_of_education', 'mailing_address',
+    'goals',
+]
+
+
+def _can_list_students_synchronously(course_id):
+    """
+    Whether the course is small enough for get_students_features to list its students within the
+    request. Larger courses must use the background profile information report, when reports are
+    enabled.
+    """
+    if not settings.FEATURES.get('ENABLE_S3_GRADE_DOWNLOADS'):
+        return True
+    max_enrollment = settings.FEATURES.get("MAX_ENROLLMENT_INSTR_BUTTONS")
+    return max_enrollment is None or CourseEnrollment.num_enrolled_in(course_id) <= max_enrollment
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('staff')
@@ -561,12 +582,14 @@ def get_students_features(request, course_id, csv=False):  # pylint: disable=W06
     """
     course_id = SlashSeparatedCourseKey.from_deprecated_string(course_id)
 
+    if not _can_list_students_synchronously(course_id):
+        return HttpResponseBadRequest(_(
+            "This course has too many students to list them here. "
+            "Generate a profile information report instead."
+        ))
+
     available_features = analytics.basic.AVAILABLE_FEATURES
-    query_features = [
-        'id', 'username', 'name', 'email', 'language', 'location',
-        'year_of_birth', 'gender', 'level_of_education', 'mailing_address',
-        'goals',
-    ]
+    query_features = STUDENT_PROFILE_QUERY_FEATURES
 
     student_data = analytics.basic.enrolled_students_features(course_id, query_features)
 
@@ -990,6 +1013,62 @@ def calculate_grades_csv(request, course_id):
         })
 
 
+@ensure_csrf_cookie
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('staff')
+def calculate_students_features_csv(request, course_id):
+    """
+    Submit a background task generating a CSV of the enrolled students' profile information.
+
+    AlreadyRunningError is raised if the report is already being generated.
+    """
+    course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
+    try:
+        instructor_task.api.submit_calculate_students_features_csv(
+            request, course_key, STUDENT_PROFILE_QUERY_FEATURES
+        )
+        success_status = _("Your student profile information report is being generated! You can view the status of the generation task in the 'Pending Instructor Tasks' section.")
+        return JsonResponse({"status": success_status})
+    except AlreadyRunningError:
+        already_running_status = _("A student profile information report generation task is already in progress. Check the 'Pending Instructor Tasks' table for the status of the task. When completed, the report will be available for download in the table below.")
+        return JsonResponse({
+            "status": already_running_status
+        })
+
+
+@ensure_csrf_cookie
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('staff')
+@require_post_params(grading_policy="JSON grading policy with a GRADER list and optionally GRADE_CUTOFFS")
+def preview_grading_policy(request, course_id):
+    """
+    Submit a background task generating CSVs of the grades the enrolled students would get under
+    a proposed grading policy, next to their current grades.
+
+    AlreadyRunningError is raised if the same policy is already being previewed.
+    """
+    course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
+    try:
+        grading_policy = json.loads(request.POST['grading_policy'])
+        grader_from_conf(grading_policy['GRADER'])
+        if not isinstance(grading_policy.get('GRADE_CUTOFFS', {}), dict):
+            raise ValueError("GRADE_CUTOFFS must map letter grades to cutoffs")
+    except (ValueError, TypeError, KeyError) as error:
+        return HttpResponseBadRequest(strip_tags(
+            _("Invalid grading policy: {error}").format(error=error)
+        ))
+
+    try:
+        instructor_task.api.submit_preview_grading_policy(request, course_key, grading_policy)
+        success_status = _("Your grading policy preview is being generated! You can view the status of the generation task in the 'Pending Instructor Tasks' section.")
+        return JsonResponse({"status": success_status})
+    except AlreadyRunningError:
+        already_running_status = _("A preview of this grading policy is already being generated. Check the 'Pending Instructor Tasks' table for the status of the task. When completed, the report will be available for download in the table below.")
+        return JsonResponse({
+            "status": already_running_status
+        })
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('staff')
@@ -53,6 +53,10 @@ urlpatterns = patterns('',  # nopep8
         'instructor.views.api.list_report_downloads', name="list_report_downloads"),
     url(r'calculate_grades_csv$',
         'instructor.views.api.calculate_grades_csv', name="calculate_grades_csv"),
+    url(r'calculate_students_features_csv$',
+        'instructor.views.api.calculate_students_features_csv', name="calculate_students_features_csv"),
+    url(r'preview_grading_policy$',
+        'instructor.views.api.preview_grading_policy', name="preview_grading_policy"),
 
     # spoc gradebook
     url(r'^gradebook$',
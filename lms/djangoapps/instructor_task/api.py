@@ -7,6 +7,7 @@ arguments.
 
 """
 import hashlib
+import json
 
 from celery.states import READY_STATES
 
@@ -17,7 +18,10 @@ from instructor_task.tasks import (rescore_problem,
                                    reset_problem_attempts,
                                    delete_problem_state,
                                    send_bulk_course_email,
-                                   calculate_grades_csv)
+                                   calculate_grades_csv,
+                                   calculate_students_features_csv,
+                                   preview_grading_policy,
+                                   generate_certificates)
 
 from instructor_task.api_helper import (check_arguments_for_rescoring,
                                         encode_problem_and_student_input,
@@ -218,3 +222,51 @@ def submit_calculate_grades_csv(request, course_key):
     task_key = ""
 
     return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
+def submit_calculate_students_features_csv(request, course_key, features):
+    """
+    Submits a task to generate a CSV containing student profile info.
+
+    Raises AlreadyRunningError if said CSV is already being updated.
+    """
+    task_type = 'profile_info_csv'
+    task_class = calculate_students_features_csv
+    task_input = {'features': features}
+    task_key = ""
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
+def submit_generate_certificates(request, course_key, statuses, insecure=False):
+    """
+    Request to have the certificates of the course's students whose certificate status is one of
+    `statuses` generated as a background task.
+
+    Raises AlreadyRunningError if the certificates of these students are already being generated.
+    Students already handled by an earlier run of the task no longer have one of `statuses`, so
+    submitting the task again resumes an interrupted run.
+    """
+    task_type = 'generate_certificates'
+    task_class = generate_certificates
+    statuses = sorted(statuses)
+    task_input = {'statuses': statuses, 'insecure': insecure}
+    task_key = hashlib.md5(u','.join(statuses)).hexdigest()
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
+def submit_preview_grading_policy(request, course_key, grading_policy):
+    """
+    Submits a task to grade the course's students under `grading_policy` (a dict with a 'GRADER'
+    list and optionally 'GRADE_CUTOFFS') and generate CSVs comparing the result with their current
+    grades.
+
+    Raises AlreadyRunningError if the same policy is already being previewed.
+    """
+    task_type = 'preview_grading_policy'
+    task_class = preview_grading_policy
+    task_input = {'grading_policy': grading_policy}
+    task_key = hashlib.md5(json.dumps(grading_policy, sort_keys=True)).hexdigest()
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key)
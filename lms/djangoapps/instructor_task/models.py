@@ -12,8 +12,8 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
-from cStringIO import StringIO
 from gzip import GzipFile
+from tempfile import NamedTemporaryFile, TemporaryFile
 from uuid import uuid4
 import csv
 import json
@@ -193,9 +193,9 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. `store_rows` consumes its rows lazily and spools them to disk, so
+    a report's rows can be streamed from a generator rather than built up as a
+    list in memory.
     """
     @classmethod
     def from_config(cls):
@@ -298,18 +298,30 @@ class S3ReportStore(ReportStore):
     def store_rows(self, course_id, filename, rows):
         """
         Given a `course_id`, `filename`, and `rows` (each row is an iterable of
-        strings), create a buffer that is a gzip'd csv file, and then `store()`
-        that buffer.
+        strings), write a gzip'd csv file to a temporary file, and then upload
+        it. `rows` is only iterated once, so it can be a generator.
 
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
         """
-        output_buffer = StringIO()
-        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
-        csv.writer(gzip_file).writerows(rows)
-        gzip_file.close()
-
-        self.store(course_id, filename, output_buffer)
+        with TemporaryFile() as temp_file:
+            gzip_file = GzipFile(fileobj=temp_file, mode="wb")
+            csv.writer(gzip_file).writerows(rows)
+            gzip_file.close()
+
+            key = self.key_for(course_id, filename)
+            key.size = temp_file.tell()
+            key.content_encoding = "gzip"
+            key.content_type = "text/csv"
+            key.set_contents_from_file(
+                temp_file,
+                headers={
+                    "Content-Encoding": "gzip",
+                    "Content-Length": key.size,
+                    "Content-Type": "text/csv",
+                },
+                rewind=True,
+            )
 
     def links_for(self, course_id):
         """
@@ -381,11 +393,18 @@ class LocalFSReportStore(ReportStore):
     def store_rows(self, course_id, filename, rows):
         """
         Given a course_id, filename, and rows (each row is an iterable of strings),
-        write this data out.
+        write this data out. The rows are written to a temporary file which is
+        only moved into place once complete, so `rows` can be a generator and
+        partial files are never listed.
         """
-        output_buffer = StringIO()
-        csv.writer(output_buffer).writerows(rows)
-        self.store(course_id, filename, output_buffer)
+        full_path = self.path_to(course_id, filename)
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.mkdir(directory)
+
+        with NamedTemporaryFile(dir=self.root_path, delete=False) as temp_file:
+            csv.writer(temp_file).writerows(rows)
+        os.rename(temp_file.name, full_path)
 
     def links_for(self, course_id):
         """
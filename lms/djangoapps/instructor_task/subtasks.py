@@ -501,6 +501,13 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
             for statname in ['attempted', 'succeeded', 'failed', 'skipped']:
                 task_progress[statname] += getattr(new_subtask_status, statname)
 
+            # Report the throughput so far, and how long the remaining items should take at that rate.
+            num_done = task_progress['attempted'] + task_progress['skipped']
+            if num_done > 0 and task_progress['duration_ms'] > 0:
+                items_per_second = num_done * 1000.0 / task_progress['duration_ms']
+                task_progress['items_per_second'] = round(items_per_second, 2)
+                task_progress['eta_ms'] = int(max(task_progress['total'] - num_done, 0) * 1000 / items_per_second)
+
         # Figure out if we're actually done (i.e. this is the last task to complete).
         # This is easier if we just maintain a counter, rather than scanning the
         # entire new_subtask_status dict.
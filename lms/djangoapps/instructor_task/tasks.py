@@ -31,8 +31,11 @@ from instructor_task.tasks_helper import (
     reset_attempts_module_state,
     delete_problem_module_state,
     push_grades_to_s3,
+    push_students_csv_to_s3,
+    push_grading_policy_preview_to_s3,
 )
 from bulk_email.tasks import perform_delegate_email_batches
+from certificates.tasks import perform_delegate_certificate_generation
 
 
 @task(base=BaseInstructorTask)  # pylint: disable=E1102
@@ -139,3 +142,49 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     action_name = ugettext_noop('graded')
     task_fn = partial(push_grades_to_s3, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
+
+
+@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=E1102
+def calculate_students_features_csv(entry_id, xmodule_instance_args):
+    """
+    Compute the enrolled students' profile information and push the results to an S3 bucket
+    for download.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('generated')
+    task_fn = partial(push_students_csv_to_s3, xmodule_instance_args)
+    return run_main_task(entry_id, task_fn, action_name)
+
+
+@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=E1102
+def preview_grading_policy(entry_id, xmodule_instance_args):
+    """
+    Grade the course's students under a proposed grading policy and push the comparison with
+    their current grades to an S3 bucket for download.
+
+    The task_input should be a dict with the following entries:
+
+      'grading_policy': the proposed policy, with a 'GRADER' list and optionally 'GRADE_CUTOFFS',
+          as in a course's grading_policy. (required)
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('previewed')
+    task_fn = partial(push_grading_policy_preview_to_s3, xmodule_instance_args)
+    return run_main_task(entry_id, task_fn, action_name)
+
+
+@task(base=BaseInstructorTask)  # pylint: disable=E1102
+def generate_certificates(entry_id, _xmodule_instance_args):
+    """
+    Grade the course's students and request the certificates of those who qualify.
+
+    The task_input should be a dict with the following entries:
+
+      'statuses': the certificate statuses of the students to handle. (required)
+      'insecure': whether the xqueue should call back the LMS over http rather than https.
+
+    The students are split into chunks, each handled by a subtask.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('certified')
+    return run_main_task(entry_id, perform_delegate_certificate_generation, action_name)
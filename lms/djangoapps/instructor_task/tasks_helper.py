@@ -16,10 +16,13 @@ from django.db import transaction, reset_queries
 from dogapi import dog_stats_api
 from pytz import UTC
 
+from xmodule.graders import grader_from_conf, ScoreMatrix
 from xmodule.modulestore.django import modulestore
 from track.views import task_track
 
-from courseware.grades import iterate_grades_for
+from analytics.basic import iter_enrolled_students_features, num_enrolled_students
+
+from courseware.grades import iterate_grades_for, round_percentages, grades_for_percentages
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
@@ -571,3 +574,166 @@ def push_grades_to_s3(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
     # One last update before we close out...
     return update_task_progress()
+
+
+def push_students_csv_to_s3(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
+    """
+    For a given `course_id`, generate a CSV file of the profile information
+    (`task_input['features']`) of all the enrolled students, and store it using
+    a `ReportStore`.
+
+    Students are read from the database a chunk at a time and their rows are
+    streamed into the `ReportStore`, so the report never has to be held in
+    memory, however large the course.
+    """
+    start_time = datetime.now(UTC)
+    status_interval = 1000
+
+    features = task_input['features']
+    num_total = num_enrolled_students(course_id)
+    progress = {'attempted': 0}
+
+    def update_task_progress():
+        """Return a dict containing info about current task"""
+        current_time = datetime.now(UTC)
+        task_progress = {
+            'action_name': action_name,
+            'attempted': progress['attempted'],
+            'succeeded': progress['attempted'],
+            'failed': 0,
+            'total': num_total,
+            'duration_ms': int((current_time - start_time).total_seconds() * 1000),
+        }
+        _get_current_task().update_state(state=PROGRESS, meta=task_progress)
+        return task_progress
+
+    def rows():
+        """The header, then one row per enrolled student"""
+        yield features
+        for student_dict in iter_enrolled_students_features(course_id, features):
+            # Periodically update task status (this is a cache write)
+            if progress['attempted'] % status_interval == 0:
+                update_task_progress()
+            progress['attempted'] += 1
+            yield [unicode(student_dict.get(feature, u'')).encode('utf-8') for feature in features]
+
+    timestamp_str = start_time.strftime("%Y-%m-%d-%H%M")
+    course_id_prefix = urllib.quote(course_id.to_deprecated_string().replace("/", "_"))
+    ReportStore.from_config().store_rows(
+        course_id,
+        u"{}_student_profile_info_{}.csv".format(course_id_prefix, timestamp_str),
+        rows()
+    )
+
+    # One last update before we close out...
+    return update_task_progress()
+
+
+def push_grading_policy_preview_to_s3(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
+    """
+    For a given `course_id`, grade all the enrolled students under the course's
+    grading policy and under the proposed `task_input['grading_policy']` (with
+    the course's grade cutoffs unless it has its own `GRADE_CUTOFFS`), and store
+    a CSV of each student's current and previewed grades, and a CSV of how many
+    students get each letter grade under each, using a `ReportStore`.
+
+    Students' scores are only computed once: the proposed policy grades all of
+    them at once from their section scores (`ScoreMatrix`), which gives exactly
+    the percents its graders' `grade()` would.
+    """
+    start_time = datetime.now(UTC)
+    status_interval = 100
+
+    grading_policy = task_input['grading_policy']
+    grader = grader_from_conf(grading_policy['GRADER'])
+    grade_cutoffs = grading_policy.get('GRADE_CUTOFFS') or modulestore().get_course(course_id).grade_cutoffs
+
+    enrolled_students = CourseEnrollment.users_enrolled_in(course_id)
+    num_total = enrolled_students.count()
+    num_attempted = 0
+    num_succeeded = 0
+    num_failed = 0
+    curr_step = "Calculating Grades"
+
+    def update_task_progress():
+        """Return a dict containing info about current task"""
+        current_time = datetime.now(UTC)
+        progress = {
+            'action_name': action_name,
+            'attempted': num_attempted,
+            'succeeded': num_succeeded,
+            'failed': num_failed,
+            'total': num_total,
+            'duration_ms': int((current_time - start_time).total_seconds() * 1000),
+            'step': curr_step,
+        }
+        _get_current_task().update_state(state=PROGRESS, meta=progress)
+
+        return progress
+
+    graded_students = []
+    grade_sheets = []
+    err_rows = [["id", "username", "error_msg"]]
+    for student, gradeset, err_msg in iterate_grades_for(course_id, enrolled_students):
+        # Periodically update task status (this is a cache write)
+        if num_attempted % status_interval == 0:
+            update_task_progress()
+        num_attempted += 1
+
+        if gradeset:
+            num_succeeded += 1
+            graded_students.append((student, gradeset['percent'], gradeset['grade']))
+            grade_sheets.append(gradeset['totaled_scores'])
+        else:
+            # An empty gradeset means we failed to grade a student.
+            num_failed += 1
+            err_rows.append([student.id, student.username, err_msg])
+
+    curr_step = "Applying Grading Policy"
+    update_task_progress()
+    preview_percents = round_percentages(grader.grade_matrix(ScoreMatrix.from_grade_sheets(grade_sheets)))
+    preview_grades = grades_for_percentages(grade_cutoffs, preview_percents)
+
+    rows = [["id", "username", "grade", "percent", "preview_grade", "preview_percent"]]
+    grade_counts = {}
+    for (student, percent, letter_grade), preview_percent, preview_grade in zip(
+            graded_students, preview_percents, preview_grades
+    ):
+        rows.append([student.id, student.username, letter_grade, percent, preview_grade, float(preview_percent)])
+        grade_counts.setdefault(letter_grade, [0, 0])[0] += 1
+        grade_counts.setdefault(preview_grade, [0, 0])[1] += 1
+
+    # the letter grades from the highest cutoff down, then the students without a letter grade
+    summary_rows = [["grade", "students", "preview_students"]]
+    for letter_grade in sorted(grade_counts, key=lambda x: grade_cutoffs.get(x, -1), reverse=True):
+        summary_rows.append([letter_grade] + grade_counts[letter_grade])
+
+    curr_step = "Uploading CSVs"
+    update_task_progress()
+
+    # Generate parts of the file name
+    timestamp_str = start_time.strftime("%Y-%m-%d-%H%M")
+    course_id_prefix = urllib.quote(course_id.to_deprecated_string().replace("/", "_"))
+
+    report_store = ReportStore.from_config()
+    report_store.store_rows(
+        course_id,
+        u"{}_grading_policy_preview_{}.csv".format(course_id_prefix, timestamp_str),
+        rows
+    )
+    report_store.store_rows(
+        course_id,
+        u"{}_grading_policy_preview_{}_summary.csv".format(course_id_prefix, timestamp_str),
+        summary_rows
+    )
+
+    # If there are any error rows (don't count the header), write them out as well
+    if len(err_rows) > 1:
+        report_store.store_rows(
+            course_id,
+            u"{}_grading_policy_preview_{}_err.csv".format(course_id_prefix, timestamp_str),
+            err_rows
+        )
+
+    # One last update before we close out...
+    return update_task_progress()
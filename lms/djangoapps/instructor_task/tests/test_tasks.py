@@ -5,25 +5,31 @@ Runs tasks on answers to course problems to validate that code
 paths actually work.
 
 """
+import csv
 import json
+import os
+import shutil
+import tempfile
 from uuid import uuid4
 
 from mock import Mock, MagicMock, patch
 
 from celery.states import SUCCESS, FAILURE
+from django.test import TestCase
+from django.test.utils import override_settings
 
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from opaque_keys.edx.locations import i4xEncoder
+from opaque_keys.edx.locations import i4xEncoder, SlashSeparatedCourseKey
 
 from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 
-from instructor_task.models import InstructorTask
+from instructor_task.models import InstructorTask, LocalFSReportStore
 from instructor_task.tests.test_base import InstructorTaskModuleTestCase
 from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tasks import rescore_problem, reset_problem_attempts, delete_problem_state
-from instructor_task.tasks_helper import UpdateProblemModuleStateError
+from instructor_task.tasks_helper import UpdateProblemModuleStateError, push_students_csv_to_s3
 
 PROBLEM_URL_NAME = "test_urlname"
 
@@ -438,3 +444,33 @@ class TestDeleteStateInstructorTask(TestInstructorTasks):
                 StudentModule.objects.get(course_id=self.course.id,
                                           student=student,
                                           module_state_key=self.location)
+
+
+class TestPushStudentsCsv(TestCase):
+    """
+    Test the background student profile information report
+    """
+    def setUp(self):
+        self.course_id = SlashSeparatedCourseKey('robot', 'course', 'id')
+        self.users = [UserFactory() for __ in xrange(3)]
+        for user in self.users:
+            CourseEnrollmentFactory.create(user=user, course_id=self.course_id)
+        self.root_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_path)
+
+    def test_push_students_csv(self):
+        with override_settings(GRADES_DOWNLOAD={'STORAGE_TYPE': 'localfs', 'ROOT_PATH': self.root_path}):
+            with patch('instructor_task.tasks_helper._get_current_task'):
+                progress = push_students_csv_to_s3(
+                    None, None, self.course_id, {'features': ['id', 'username']}, 'generated'
+                )
+            self.assertEqual((progress['attempted'], progress['total']), (3, 3))
+
+            report_store = LocalFSReportStore.from_config()
+            [(filename, __)] = report_store.links_for(self.course_id)
+            with open(report_store.path_to(self.course_id, filename)) as report:
+                rows = list(csv.reader(report))
+        self.assertEqual(rows[0], ['id', 'username'])
+        self.assertEqual(rows[1:], [[str(user.id), user.username] for user in self.users])
+        # no temporary file is left behind next to the course's directory
+        self.assertEqual(len(os.listdir(self.root_path)), 1)
@@ -54,6 +54,9 @@ DISCUSSION_SETTINGS = {
 
 # Features
 FEATURES = {
+    # Compile all the mako templates at startup, rather than on their first render
+    'PRECOMPILE_MAKO_TEMPLATES': False,
+
     'SAMPLE': False,
     'USE_DJANGO_PIPELINE': True,
 
@@ -214,6 +217,18 @@ FEATURES = {
     # grades CSV files to S3 and give links for downloads.
     'ENABLE_S3_GRADE_DOWNLOADS': False,
 
+    # Load the field data of a courseware section's blocks (beyond the active unit) as they are
+    # rendered, a group of siblings at a time, rather than all up front
+    'ENABLE_LAZY_FIELD_DATA_CACHE': False,
+
+    # Store learners' XQueue submissions (without files) in the database, for celery tasks to deliver
+    # (see courseware.tasks), rather than sending them during the problem_check request
+    'ENABLE_ASYNC_XQUEUE_SUBMISSIONS': False,
+
+    # Record the modulestore and contentstore queries of each request (see monitoring.middleware), at
+    # some cost to every query
+    'RECORD_MODULESTORE_QUERIES': False,
+
     # whether to use password policy enforcement or not
     'ENFORCE_PASSWORD_POLICY': False,
 
@@ -264,6 +279,9 @@ FEATURES = {
     # Default to false here b/c dev environments won't have the api, will override in aws.py
     'ENABLE_ANALYTICS_ACTIVE_COUNT': False,
 
+    # Cache the rendered fragments of user independent blocks (see lms.lib.xblock.fragment_cache)
+    'ENABLE_XBLOCK_FRAGMENT_CACHE': False,
+
 }
 
 # Ignore static asset files on import which match this pattern
@@ -277,6 +295,25 @@ GENERATE_PROFILE_SCORES = False
 
 # Used with XQueue
 XQUEUE_WAITTIME_BETWEEN_REQUESTS = 5  # seconds
+# The connections each process keeps open to XQueue, and how long (in seconds) to wait for XQueue to
+# accept a submission
+XQUEUE_POOL_SIZE = 10
+XQUEUE_REQUEST_TIMEOUT = 10
+# With ENABLE_ASYNC_XQUEUE_SUBMISSIONS, the seconds before retrying a submission which couldn't reach
+# XQueue (doubling for each further retry), and the number of retries
+XQUEUE_SUBMISSION_RETRY_DELAY = 5
+XQUEUE_SUBMISSION_MAX_RETRIES = 6
+
+# Used with the xblock fragment cache: the number of fragments each process keeps in memory, and
+# how long (in seconds) fragments stay in the 'xblock_fragments' cache
+XBLOCK_FRAGMENT_CACHE_LOCAL_SIZE = 1000
+XBLOCK_FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+# Used with the aggregate counters of word clouds and polls, and the class dashboard rollups: the number of
+# rows each counter is spread over (more rows mean less contention between concurrent increments, but more
+# rows to sum on reads), and how long (in seconds) a block's largest counters are cached
+AGGREGATE_COUNTER_SHARDS = 8
+AGGREGATE_COUNTER_TOP_CACHE_TIMEOUT = 60
 
 
 ############################# SET PATH INFORMATION #############################
@@ -320,6 +357,9 @@ OPENID_PROVIDER_TRUSTED_ROOTS = ['cs50.net', '*.cs50.net']
 # templates
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_lms')
+# Whether mako checks the template files for changes on each lookup (off in production, where
+# the templates only change with a deploy)
+MAKO_FILESYSTEM_CHECKS = True
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [PROJECT_ROOT / 'templates',
                           COMMON_ROOT / 'templates',
@@ -809,8 +849,13 @@ TEMPLATE_LOADERS = (
 
 )
 
+# When recording them (FEATURES['RECORD_MODULESTORE_QUERIES']), requests whose modulestore and contentstore queries
+# take longer than this many seconds log the queries they made (None to disable)
+MODULESTORE_SLOW_REQUEST_SECONDS = 1.0
+
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    'monitoring.middleware.ModulestoreQueryMiddleware',
     'microsite_configuration.middleware.MicrositeMiddleware',
     'django_comment_client.middleware.AjaxExceptionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -1385,6 +1430,9 @@ REGISTRATION_EXTRA_FIELDS = {
 CERT_NAME_SHORT = "Certificate"
 CERT_NAME_LONG = "Certificate of Achievement"
 
+# Number of students each certificate generation subtask grades
+CERT_GENERATION_STUDENTS_PER_TASK = 100
+
 ###################### Grade Downloads ######################
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
@@ -0,0 +1,211 @@
+"""
+A cache of the rendered fragments of user independent XBlock views.
+
+Blocks whose view renders the same fragment for every learner (see `XModuleMixin.is_user_independent_view`)
+don't need to go through their templates and the runtime's url rewriting wrappers on every page view.
+Their fragments are cached by
+
+    (usage id, course content version, view, language)
+
+in a small per-process LRU backed by the 'xblock_fragments' cache (memcached in production). The course content
+version changes whenever the course is published, so publishing invalidates all of the course's fragments
+without anyone having to find and delete them.
+
+The cached fragment is the block's output after all of the runtime's wrappers, so blocks are never cached for
+course staff: their wrappers add staff markup which depends on the user (their username, their instructor access)
+and on the block's current release status and grades.
+"""
+import cPickle as pickle
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import get_cache, InvalidCacheBackendError
+from django.utils.translation import get_language
+from dogapi import dog_stats_api
+
+from request_cache.middleware import RequestCache
+from xmodule.modulestore.django import modulestore
+
+# the request cache holding the per-block hit and miss counts of the current request
+REQUEST_STATS_CACHE_NAME = 'lms.xblock.fragment_cache.stats'
+# the request cache holding the content version of each course rendered during the request
+COURSE_VERSIONS_CACHE_NAME = 'lms.xblock.fragment_cache.course_versions'
+
+FRAGMENT_CACHE_METRIC_NAME = 'lms.xblock.fragment_cache'
+
+
+def course_content_version(course):
+    """
+    Returns a string which changes whenever the course's content is published, or None if the course's
+    modulestore doesn't version its content (e.g., xml courses, whose fragments therefore aren't cached).
+    """
+    course_entry = getattr(course.runtime, 'course_entry', None)
+    if course_entry is not None:
+        # split mongo: every publish creates a new structure
+        return unicode(course_entry['structure']['_id'])
+    subtree_edited_on = getattr(course, 'subtree_edited_on', None)
+    if subtree_edited_on is not None:
+        # old mongo: every write (including publishing) updates the edit info of the course's subtree
+        return subtree_edited_on.isoformat()
+    return None
+
+
+class FragmentCache(object):
+    """
+    A per-process LRU of pickled fragments in front of a shared django cache.
+    """
+    def __init__(self, shared_cache, local_size, timeout):
+        self.shared_cache = shared_cache
+        self.local_size = local_size
+        self.timeout = timeout
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(usage_id, course_version, view_name, language):
+        """
+        Returns the cache key of the fragment (hashed so that it's always a valid memcached key)
+        """
+        key = u'|'.join([unicode(usage_id), course_version, view_name, language or u''])
+        return 'xblock_fragment.' + hashlib.md5(key.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the (fragment, render_time) stored under key, or None
+        """
+        with self._lock:
+            entry = self._local.pop(key, None)
+            if entry is not None:
+                self._local[key] = entry
+        if entry is None:
+            entry = self.shared_cache.get(key)
+            if entry is None:
+                return None
+            self._set_local(key, entry)
+        return pickle.loads(entry)
+
+    def set(self, key, fragment, render_time):
+        """
+        Store the fragment (and how long it took to render) under key
+        """
+        entry = pickle.dumps((fragment, render_time), pickle.HIGHEST_PROTOCOL)
+        self._set_local(key, entry)
+        self.shared_cache.set(key, entry, self.timeout)
+
+    def _set_local(self, key, entry):
+        """
+        Add the pickled entry to the local LRU, evicting the least recently used entry if it's full
+        """
+        with self._lock:
+            self._local.pop(key, None)
+            self._local[key] = entry
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def clear_local(self):
+        """
+        Drop everything from the local LRU
+        """
+        with self._lock:
+            self._local.clear()
+
+
+_FRAGMENT_CACHE = None
+
+
+def get_fragment_cache():
+    """
+    Returns the process's FragmentCache
+    """
+    global _FRAGMENT_CACHE  # pylint: disable=global-statement
+    if _FRAGMENT_CACHE is None:
+        try:
+            shared_cache = get_cache('xblock_fragments')
+        except InvalidCacheBackendError:
+            shared_cache = get_cache('default')
+        _FRAGMENT_CACHE = FragmentCache(
+            shared_cache,
+            settings.XBLOCK_FRAGMENT_CACHE_LOCAL_SIZE,
+            settings.XBLOCK_FRAGMENT_CACHE_TIMEOUT,
+        )
+    return _FRAGMENT_CACHE
+
+
+def get_request_fragment_cache_stats():
+    """
+    Returns {usage id: {'hits', 'misses', 'render_time', 'saved_time'}} for the blocks rendered during
+    the current request. render_time is the time spent rendering the misses, and saved_time the time it
+    originally took to render the hits.
+    """
+    return RequestCache.get_cache(REQUEST_STATS_CACHE_NAME)
+
+
+def _record(block, result, elapsed):
+    """
+    Count a hit or miss for the block in the request's stats and in statsd
+    """
+    stats = get_request_fragment_cache_stats().setdefault(
+        unicode(block.scope_ids.usage_id), {'hits': 0, 'misses': 0, 'render_time': 0.0, 'saved_time': 0.0}
+    )
+    if result == 'hit':
+        stats['hits'] += 1
+        stats['saved_time'] += elapsed
+    else:
+        stats['misses'] += 1
+        stats['render_time'] += elapsed
+
+    tags = [u'block_type:{}'.format(block.scope_ids.block_type), u'result:{}'.format(result)]
+    dog_stats_api.increment(FRAGMENT_CACHE_METRIC_NAME, tags=tags)
+    dog_stats_api.histogram(FRAGMENT_CACHE_METRIC_NAME + '.render_time', elapsed, tags=tags)
+
+
+def _course_version(runtime):
+    """
+    Returns the content version of the runtime's course, looked up once per request
+    """
+    if not RequestCache.is_request_active():
+        course = modulestore().get_course(runtime.course_id)
+        return course_content_version(course) if course is not None else None
+
+    course_versions = RequestCache.get_cache(COURSE_VERSIONS_CACHE_NAME)
+    if runtime.course_id not in course_versions:
+        course = modulestore().get_course(runtime.course_id)
+        course_versions[runtime.course_id] = course_content_version(course) if course is not None else None
+    return course_versions[runtime.course_id]
+
+
+def render_with_cache(runtime, block, view_name, render):
+    """
+    Returns the fragment of block's view_name view: from the fragment cache if the view is user independent
+    and its fragment has already been cached for the course's current content, otherwise from `render()`
+    (caching it if it's user independent). Views rendered for course staff are never cached, as the staff
+    wrappers add per-user markup.
+    """
+    if not settings.FEATURES.get('ENABLE_XBLOCK_FRAGMENT_CACHE'):
+        return render()
+    if getattr(runtime, 'user_is_staff', False):
+        return render()
+    is_user_independent = getattr(block, 'is_user_independent_view', None)
+    if is_user_independent is None or not is_user_independent(view_name):
+        return render()
+    course_version = _course_version(runtime)
+    if course_version is None:
+        return render()
+
+    fragment_cache = get_fragment_cache()
+    key = fragment_cache.make_key(block.scope_ids.usage_id, course_version, view_name, get_language())
+    cached = fragment_cache.get(key)
+    if cached is not None:
+        fragment, render_time = cached
+        _record(block, 'hit', render_time)
+        return fragment
+
+    start = time.time()
+    fragment = render()
+    render_time = time.time() - start
+    fragment_cache.set(key, fragment, render_time)
+    _record(block, 'miss', render_time)
+    return fragment
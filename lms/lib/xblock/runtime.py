@@ -6,6 +6,8 @@ import re
 
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from courseware import aggregate_counters
+from lms.lib.xblock.fragment_cache import render_with_cache
 from user_api import user_service
 from xmodule.modulestore.django import modulestore
 from xmodule.x_module import ModuleSystem
@@ -181,6 +183,30 @@ class UserTagsService(object):
                                            self.runtime.course_id, key, value)
 
 
+class AggregateCountersService(object):
+    """
+    A runtime service for counters aggregated over all the users of a block (see
+    xmodule.aggregate_counters), backed by the sharded counters of courseware.aggregate_counters.
+    """
+    def increment(self, block, counter_name, keys, delta=1):
+        """
+        Add delta to the block's counter of each of keys, and return their new counts
+        """
+        return aggregate_counters.increment(block.scope_ids.usage_id, counter_name, keys, delta)
+
+    def get_counts(self, block, counter_name, keys=None):
+        """
+        Return the counts of keys (all of the block's counted keys if keys is None)
+        """
+        return aggregate_counters.get_counts(block.scope_ids.usage_id, counter_name, keys)
+
+    def get_top(self, block, counter_name, size):
+        """
+        Return the block's size largest counters, and the sum of all of its counters
+        """
+        return aggregate_counters.get_top(block.scope_ids.usage_id, counter_name, size)
+
+
 class LmsModuleSystem(LmsHandlerUrls, ModuleSystem):  # pylint: disable=abstract-method
     """
     ModuleSystem specialized to the LMS
@@ -193,4 +219,14 @@ class LmsModuleSystem(LmsHandlerUrls, ModuleSystem):  # pylint: disable=abstract
             course_id=kwargs.get('course_id', None),
             track_function=kwargs.get('track_function', None),
         )
+        services['aggregate_counters'] = AggregateCountersService()
         super(LmsModuleSystem, self).__init__(**kwargs)
+
+    def render(self, block, view_name, context=None):
+        """
+        Render the block's view, reusing the cached fragment if the view is user independent
+        """
+        return render_with_cache(
+            self, block, view_name,
+            lambda: super(LmsModuleSystem, self).render(block, view_name, context=context)
+        )
@@ -0,0 +1,109 @@
+"""
+Tests of the cache of user independent xblock fragments
+"""
+from django.conf import settings
+from django.core.cache import get_cache
+from mock import Mock, patch
+from unittest import TestCase
+
+from lms.lib.xblock import fragment_cache
+from lms.lib.xblock.fragment_cache import FragmentCache, render_with_cache, get_request_fragment_cache_stats
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
+
+
+class TestFragmentCache(TestCase):
+    """Test the local LRU and the keys of the FragmentCache"""
+
+    def setUp(self):
+        self.shared_cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='test_fragments')
+        self.shared_cache.clear()
+        self.cache = FragmentCache(self.shared_cache, local_size=2, timeout=60)
+
+    def test_round_trip(self):
+        self.cache.set('a', {'content': u'<p>A</p>'}, 0.5)
+        self.assertEqual(self.cache.get('a'), ({'content': u'<p>A</p>'}, 0.5))
+        self.assertIsNone(self.cache.get('b'))
+
+    def test_lru_eviction(self):
+        self.cache.set('a', 'A', 0)
+        self.cache.set('b', 'B', 0)
+        # touch a, so that b is the least recently used
+        self.cache.get('a')
+        self.cache.set('c', 'C', 0)
+        self.assertEqual(self.cache._local.keys(), ['a', 'c'])  # pylint: disable=protected-access
+
+        # evicted entries are still found in the shared cache, and come back into the LRU
+        self.assertEqual(self.cache.get('b'), ('B', 0))
+        self.assertEqual(self.cache._local.keys(), ['c', 'b'])  # pylint: disable=protected-access
+
+    def test_key_variation(self):
+        usage_id = SlashSeparatedCourseKey('org', 'course', 'run').make_usage_key('html', 'intro')
+        key = FragmentCache.make_key(usage_id, u'v1', 'student_view', 'en')
+        self.assertNotEqual(key, FragmentCache.make_key(usage_id, u'v2', 'student_view', 'en'))
+        self.assertNotEqual(key, FragmentCache.make_key(usage_id, u'v1', 'author_view', 'en'))
+        self.assertNotEqual(key, FragmentCache.make_key(usage_id, u'v1', 'student_view', 'fr'))
+        self.assertEqual(key, FragmentCache.make_key(usage_id, u'v1', 'student_view', 'en'))
+
+
+@patch.dict(settings.FEATURES, {'ENABLE_XBLOCK_FRAGMENT_CACHE': True})
+class TestRenderWithCache(TestCase):
+    """Test that render_with_cache only renders user independent views once per course version"""
+
+    def setUp(self):
+        RequestCache().clear_request_cache()
+        self.course_key = SlashSeparatedCourseKey('org', 'course', 'run')
+        self.runtime = Mock(course_id=self.course_key, user_is_staff=False)
+        self.block = Mock()
+        self.block.scope_ids.usage_id = self.course_key.make_usage_key('html', 'intro')
+        self.block.scope_ids.block_type = 'html'
+        self.block.is_user_independent_view.side_effect = lambda view_name: view_name == 'student_view'
+        self.render = Mock(return_value='fragment')
+
+        shared_cache = get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='test_render_fragments')
+        shared_cache.clear()
+        patcher = patch.object(fragment_cache, '_FRAGMENT_CACHE', FragmentCache(shared_cache, 10, 60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(fragment_cache, '_course_version', Mock(return_value=u'v1'))
+        self.course_version = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hit_and_miss(self):
+        self.assertEqual(render_with_cache(self.runtime, self.block, 'student_view', self.render), 'fragment')
+        self.assertEqual(render_with_cache(self.runtime, self.block, 'student_view', self.render), 'fragment')
+        self.assertEqual(self.render.call_count, 1)
+
+        stats = get_request_fragment_cache_stats()[unicode(self.block.scope_ids.usage_id)]
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_publish_invalidates(self):
+        render_with_cache(self.runtime, self.block, 'student_view', self.render)
+        self.course_version.return_value = u'v2'
+        render_with_cache(self.runtime, self.block, 'student_view', self.render)
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_user_dependent_view(self):
+        render_with_cache(self.runtime, self.block, 'studio_view', self.render)
+        render_with_cache(self.runtime, self.block, 'studio_view', self.render)
+        self.assertEqual(self.render.call_count, 2)
+        self.assertEqual(get_request_fragment_cache_stats(), {})
+
+    def test_staff_not_cached(self):
+        self.runtime.user_is_staff = True
+        render_with_cache(self.runtime, self.block, 'student_view', self.render)
+        render_with_cache(self.runtime, self.block, 'student_view', self.render)
+        self.assertEqual(self.render.call_count, 2)
+        self.assertEqual(get_request_fragment_cache_stats(), {})
+
+    def test_unversioned_course(self):
+        self.course_version.return_value = None
+        render_with_cache(self.runtime, self.block, 'student_view', self.render)
+        render_with_cache(self.runtime, self.block, 'student_view', self.render)
+        self.assertEqual(self.render.call_count, 2)
+
+    @patch.dict(settings.FEATURES, {'ENABLE_XBLOCK_FRAGMENT_CACHE': False})
+    def test_disabled(self):
+        render_with_cache(self.runtime, self.block, 'student_view', self.render)
+        render_with_cache(self.runtime, self.block, 'student_view', self.render)
+        self.assertEqual(self.render.call_count, 2)
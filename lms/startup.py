@@ -31,6 +31,10 @@ def run():
     if settings.FEATURES.get('ENABLE_THIRD_PARTY_AUTH', False):
         enable_third_party_auth()
 
+    # after the theme and microsites added their template directories
+    if settings.FEATURES.get('PRECOMPILE_MAKO_TEMPLATES', False):
+        edxmako.paths.precompile_templates()
+
 
 def add_mimetypes():
     """